@@ -0,0 +1,385 @@
+import argparse
+import heapq
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from factory_id_registry import _fsync_dir, atomic_write_json
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+STATE_DIR = BASE_DIR / "data" / "state"
+
+store_dir = STATE_DIR / "activity-log"
+war_room_data_path = DATA_DIR / "fluorescence-map-data.json"
+
+# Records per segment before a new one is started
+SEGMENT_RECORDS = 4096
+# One sparse index entry per this many records
+INDEX_STRIDE = 64
+RETENTION_DAYS = 90
+# Same cap the dashboard applies in FluorescenceMapService.addActivityLog
+EMBED_LATEST = 40
+
+ENTITY_KEYS = ("parentGroupId", "subsidiaryId", "factoryId")
+
+
+def _epoch(timestamp):
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    try:
+        return datetime.fromisoformat(str(timestamp).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _entities(entry):
+    return {entry[key] for key in ENTITY_KEYS if entry.get(key)}
+
+
+class Segment:
+    """One JSON-lines segment file plus its sparse block index.
+
+    Every INDEX_STRIDE records the byte range, time range and entity ids of the
+    block just completed are appended to the ``.idx`` sidecar, after the block's
+    records are on disk. Records past the last indexed block (the tail) are
+    kept in memory, so the index never has to describe a partial block.
+    """
+
+    def __init__(self, path, stride=INDEX_STRIDE):
+        self.path = Path(path)
+        self.index_path = self.path.with_suffix(".idx")
+        self.stride = stride
+        self.blocks = []
+        self.tail = []           # [(offset, epoch, entities)] of unindexed records
+        self.size = 0
+        self._load()
+
+    @property
+    def number(self):
+        return int(self.path.stem.split("-")[1])
+
+    @property
+    def count(self):
+        return sum(b["count"] for b in self.blocks) + len(self.tail)
+
+    def time_range(self):
+        times = [b["minTime"] for b in self.blocks] + [b["maxTime"] for b in self.blocks]
+        times += [t for _, t, _ in self.tail]
+        return (min(times), max(times)) if times else (None, None)
+
+    def _load(self):
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.blocks = [json.loads(line) for line in f if line.strip()]
+        if not self.path.exists():
+            return
+        indexed = self.blocks[-1]["end"] if self.blocks else 0
+        with open(self.path, "rb") as f:
+            data = f.read()
+        if len(data) < indexed:
+            raise ValueError(f"{self.index_path} describes more data than {self.path} holds")
+        offset = indexed
+        for line in data[indexed:].splitlines(keepends=True):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line is what a crash mid-append leaves behind
+                if offset + len(line) < len(data):
+                    raise
+                print(f"Dropping incomplete trailing record in {self.path}", file=sys.stderr)
+                with open(self.path, "r+b") as f:
+                    f.truncate(offset)
+                break
+            self.tail.append((offset, _epoch(entry.get("timestamp")), _entities(entry)))
+            offset += len(line)
+        self.size = offset
+        # A crash between the data and index writes leaves whole blocks in the tail
+        self._seal_blocks()
+
+    def append(self, entries):
+        lines = [(json.dumps(e, ensure_ascii=False) + "\n").encode("utf-8") for e in entries]
+        with open(self.path, "ab") as f:
+            for entry, line in zip(entries, lines):
+                self.tail.append((self.size, _epoch(entry.get("timestamp")), _entities(entry)))
+                f.write(line)
+                self.size += len(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._seal_blocks()
+
+    def _seal_blocks(self):
+        new_blocks = []
+        while len(self.tail) >= self.stride:
+            block, self.tail = self.tail[:self.stride], self.tail[self.stride:]
+            end = self.tail[0][0] if self.tail else self.size
+            times = [t for _, t, _ in block]
+            new_blocks.append({
+                "offset": block[0][0], "end": end, "count": len(block),
+                "minTime": min(times), "maxTime": max(times),
+                "entities": sorted(set().union(*(e for _, _, e in block))),
+            })
+        if new_blocks:
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                for block in new_blocks:
+                    f.write(json.dumps(block) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.blocks.extend(new_blocks)
+
+    def ranges(self):
+        """(offset, end, minTime, maxTime, entities) per block, tail last."""
+        for b in self.blocks:
+            yield b["offset"], b["end"], b["minTime"], b["maxTime"], b["entities"]
+        if self.tail:
+            times = [t for _, t, _ in self.tail]
+            yield (self.tail[0][0], self.size, min(times), max(times),
+                   set().union(*(e for _, _, e in self.tail)))
+
+    def read(self, offset, end):
+        """[(byte offset, entry)] for the records in [offset, end)."""
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = f.read(end - offset)
+        out = []
+        for line in data.splitlines(keepends=True):
+            out.append((offset, json.loads(line)))
+            offset += len(line)
+        return out
+
+    def remove(self):
+        self.path.unlink(missing_ok=True)
+        self.index_path.unlink(missing_ok=True)
+
+
+class ActivityLogStore:
+    """Append-only war-room activity log split into numbered segments.
+
+    Pages are read newest first in append order. A cursor is
+    ``"<segment>:<byte offset>"`` of the last entry returned; the next page
+    continues strictly before it. Compaction rewrites segments, so cursors
+    taken before a compaction should be discarded.
+
+    ``store.json`` keeps the last segment number handed out, so numbering
+    carries on after every segment has expired, and the low-water mark of the
+    last compaction: nothing older than it is taken back in by
+    :func:`embed_latest`.
+    """
+
+    def __init__(self, root=store_dir, segment_records=SEGMENT_RECORDS, stride=INDEX_STRIDE):
+        self.root = Path(root)
+        self.state_path = self.root / "store.json"
+        self.segment_records = segment_records
+        self.stride = stride
+        self.segments = [Segment(p, stride) for p in sorted(self.root.glob("segment-*.jsonl"))]
+        state = {}
+        if self.state_path.exists():
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        self.last_segment = max([state.get("lastSegment", 0)] + [s.number for s in self.segments])
+        self.low_water = state.get("lowWater", float("-inf"))
+
+    def __len__(self):
+        return sum(s.count for s in self.segments)
+
+    def _save_state(self):
+        state = {"lastSegment": self.last_segment}
+        if self.low_water != float("-inf"):
+            state["lowWater"] = self.low_water
+        atomic_write_json(self.state_path, state)
+
+    def _new_segment(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.last_segment += 1
+        self._save_state()
+        segment = Segment(self.root / f"segment-{self.last_segment:08d}.jsonl", self.stride)
+        self.segments.append(segment)
+        return segment
+
+    def append(self, entries):
+        entries = list(entries)
+        pending = entries
+        while pending:
+            segment = self.segments[-1] if self.segments else None
+            if segment is None or segment.count >= self.segment_records:
+                segment = self._new_segment()
+            room = self.segment_records - segment.count
+            segment.append(pending[:room])
+            pending = pending[room:]
+        if entries:
+            _fsync_dir(self.root)
+        return len(entries)
+
+    def page(self, start=None, end=None, entity=None, limit=EMBED_LATEST, cursor=None):
+        """Entries newest first, filtered by time range and entity id; returns (entries, next_cursor)."""
+        lo = _epoch(start) if start is not None else float("-inf")
+        hi = _epoch(end) if end is not None else float("inf")
+        before = tuple(int(x) for x in cursor.split(":")) if cursor else None
+        results = []
+        for segment in reversed(self.segments):
+            if before and segment.number > before[0]:
+                continue
+            for offset, stop, min_t, max_t, entities in reversed(list(segment.ranges())):
+                if max_t < lo or min_t > hi or (entity and entity not in entities):
+                    continue
+                if before and segment.number == before[0] and offset >= before[1]:
+                    continue
+                for position, entry in reversed(segment.read(offset, stop)):
+                    if before and segment.number == before[0] and position >= before[1]:
+                        continue
+                    if not lo <= _epoch(entry.get("timestamp")) <= hi:
+                        continue
+                    if entity and entity not in _entities(entry):
+                        continue
+                    results.append(entry)
+                    if len(results) == limit:
+                        return results, f"{segment.number}:{position}"
+        return results, None
+
+    def latest(self, limit=EMBED_LATEST):
+        """The ``limit`` entries with the newest timestamps, newest first.
+
+        An entry imported late may be older than ones appended before it, so
+        this goes by timestamp rather than append order. Blocks are read
+        newest-first by their latest time until none left can beat the
+        entries already kept.
+        """
+        if limit <= 0:
+            return []
+        blocks = sorted(((max_t, segment, offset, stop) for segment in self.segments
+                         for offset, stop, _, max_t, _ in segment.ranges()), key=lambda b: b[0], reverse=True)
+        kept = []       # min-heap of (epoch, segment number, offset, entry)
+        for max_t, segment, offset, stop in blocks:
+            if len(kept) == limit and max_t < kept[0][0]:
+                break
+            for position, entry in segment.read(offset, stop):
+                item = (_epoch(entry.get("timestamp")), segment.number, position, entry)
+                if len(kept) < limit:
+                    heapq.heappush(kept, item)
+                elif item[:3] > kept[0][:3]:
+                    heapq.heapreplace(kept, item)
+        return [entry for *_, entry in sorted(kept, key=lambda item: item[:3], reverse=True)]
+
+    def compact(self, retention_days=RETENTION_DAYS, now=None):
+        """Drop entries older than the retention window; returns how many were removed."""
+        now = now if now is not None else datetime.now(timezone.utc)
+        cutoff = (now - timedelta(days=retention_days)).timestamp()
+        removed = 0
+        kept = []
+        for segment in self.segments:
+            first, last = segment.time_range()
+            if first is None or first >= cutoff:
+                kept.append(segment)
+                continue
+            if last < cutoff:
+                removed += segment.count
+                segment.remove()
+                continue
+            entries = [e for _, e in segment.read(0, segment.size)]
+            survivors = [e for e in entries if _epoch(e.get("timestamp")) >= cutoff]
+            removed += len(entries) - len(survivors)
+            # Rebuild under a temporary name, then swap data and index in
+            tmp_path = segment.path.with_name("compact-" + segment.path.name)
+            for stale in (tmp_path, tmp_path.with_suffix(".idx")):
+                stale.unlink(missing_ok=True)
+            tmp = Segment(tmp_path, self.stride)
+            tmp.append(survivors)
+            segment.index_path.unlink(missing_ok=True)
+            os.replace(tmp.path, segment.path)
+            if tmp.index_path.exists():
+                os.replace(tmp.index_path, segment.index_path)
+            kept.append(Segment(segment.path, self.stride))
+        self.segments = kept
+        if self.root.exists() and cutoff > self.low_water:
+            self.low_water = cutoff
+            self._save_state()
+        if removed:
+            _fsync_dir(self.root)
+        return removed
+
+
+def _entry_key(entry):
+    return entry.get("id") or json.dumps(entry, sort_keys=True, ensure_ascii=False)
+
+
+def embed_latest(war_room_data, store, limit=EMBED_LATEST):
+    """Replace the map document's activityLogs with the newest entries from the store.
+
+    Entries in the document that the store doesn't hold yet (the seed logs on
+    the first run, or entries added to the file by hand or by another tool)
+    are appended first, oldest first, so none are lost. Entries older than
+    the store's last compaction cutoff are dropped instead of brought back.
+    Only the part of the store at or after the oldest document entry is read
+    to check.
+    """
+    entries = [e for e in war_room_data.get("activityLogs") or [] if _epoch(e.get("timestamp")) >= store.low_water]
+    if entries:
+        oldest = min(_epoch(e.get("timestamp")) for e in entries)
+        known = {_entry_key(e) for e in store.page(start=oldest, limit=None)[0]} if len(store) else set()
+        missing = [e for e in entries if _entry_key(e) not in known]
+        if missing:
+            store.append(sorted(missing, key=lambda e: _epoch(e.get("timestamp"))))
+    war_room_data["activityLogs"] = store.latest(limit)
+    return war_room_data["activityLogs"]
+
+
+def _read_entries(path):
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Segmented append-only war-room activity log")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("append", help="append NDJSON ActivityLog entries")
+    p.add_argument("input", nargs="?", default="-")
+    p = sub.add_parser("page", help="print a page of entries, newest first")
+    p.add_argument("--since")
+    p.add_argument("--until")
+    p.add_argument("--entity", help="parent group, subsidiary or factory id")
+    p.add_argument("--limit", type=int, default=EMBED_LATEST)
+    p.add_argument("--cursor")
+    p = sub.add_parser("compact", help="drop entries outside the retention window")
+    p.add_argument("--retention-days", type=int, default=RETENTION_DAYS)
+    sub.add_parser("stats")
+    args = parser.parse_args(argv)
+
+    store = ActivityLogStore()
+    if args.command == "append":
+        print(f"Appended {store.append(_read_entries(args.input))} entries")
+    elif args.command == "page":
+        entries, cursor = store.page(args.since, args.until, args.entity, args.limit, args.cursor)
+        for entry in entries:
+            print(json.dumps(entry, ensure_ascii=False))
+        if cursor:
+            print(f"Next page: --cursor {cursor}", file=sys.stderr)
+    elif args.command == "compact":
+        removed = store.compact(args.retention_days)
+        print(f"Removed {removed} entries; {len(store)} left in {len(store.segments)} segments")
+        # Prune the copy embedded in the map document too
+        if war_room_data_path.exists():
+            with open(war_room_data_path, "r", encoding="utf-8") as f:
+                war_room_data = json.load(f)
+            embedded = war_room_data.get("activityLogs") or []
+            kept = [e for e in embedded if _epoch(e.get("timestamp")) >= store.low_water]
+            if len(kept) < len(embedded):
+                war_room_data["activityLogs"] = kept
+                atomic_write_json(war_room_data_path, war_room_data, indent=2, ensure_ascii=False)
+    else:
+        for segment in store.segments:
+            first, last = segment.time_range()
+            span = "empty" if first is None else (f"{datetime.fromtimestamp(first, timezone.utc):%Y-%m-%d} .. "
+                                                  f"{datetime.fromtimestamp(last, timezone.utc):%Y-%m-%d}")
+            print(f"{segment.path.name}: {segment.count} entries, {len(segment.blocks)} index blocks ({span})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+import json
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from factory_id_registry import atomic_write_json
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+
+boundaries_path = DATA_DIR / "boundaries" / "countries-110m.geojson"
+war_room_data_path = DATA_DIR / "fluorescence-map-data.json"
+clients_path = DATA_DIR / "clients.json"
+region_index_path = DATA_DIR / "region-index.json"
+
+# Grid cell size (degrees) for the candidate-polygon index
+CELL_DEGREES = 5.0
+# The 1:110m coastlines cut off harbour cities; snap points this close to a border into that country
+SNAP_KM = 60.0
+KM_PER_DEGREE = 111.32
+
+# Region names as used by the map's region filter (fluorescence-map.component.ts)
+CONTINENT_REGIONS = {
+    "North America": "LATAM",     # Central America and the Caribbean; see NORTH_AMERICA below
+    "South America": "LATAM",
+    "Europe": "Europe",
+    "Asia": "Asia Pacific",
+    "Oceania": "Asia Pacific",
+    "Africa": "Middle East & Africa",
+    "Antarctica": None,
+    "Seven seas (open ocean)": None,
+}
+NORTH_AMERICA = {"CAN", "USA", "MEX", "GRL"}
+# Countries whose sites the app files under a different region than their continent
+REGION_OVERRIDES = {"TUR": "Europe", "CYP": "Europe", "RUS": "Europe", "GEO": "Europe", "ARM": "Europe",
+                    "AZE": "Europe"}
+REGION_OVERRIDES.update(dict.fromkeys(
+    ["SAU", "ARE", "QAT", "KWT", "OMN", "YEM", "IRQ", "IRN", "ISR", "PSE", "JOR", "LBN", "SYR"],
+    "Middle East & Africa"))
+# Countries too small for the 1:110m boundaries, as name, continent and a lon/lat box.
+# The boxes are tested before the polygons; without them Singapore resolves to Malaysia.
+SMALL_COUNTRIES = {
+    "SGP": ("Singapore", "Asia", (103.59, 1.15, 104.10, 1.475)),
+}
+
+
+def region_for(country_code, continent):
+    if country_code in NORTH_AMERICA:
+        return "North America"
+    if country_code in REGION_OVERRIDES:
+        return REGION_OVERRIDES[country_code]
+    return CONTINENT_REGIONS.get(continent)
+
+
+class BoundaryIndex:
+    """Country polygons bucketed into a uniform lat/lon grid for point-in-polygon lookups.
+
+    Every polygon part (exterior ring plus its holes) is a unit; the grid maps each
+    cell to the parts whose bounding box overlaps it. Lookups gather candidate
+    (point, part) pairs from the grid and run the even-odd crossing test per part
+    over all of its candidate points at once.
+    """
+
+    def __init__(self, features, cell_degrees=CELL_DEGREES):
+        self.cell = cell_degrees
+        self.countries = []      # [(iso_a3, name, region)]
+        self.parts = []          # [(country index, [ring arrays (n, 2)])]
+        self.bboxes = []         # [(min_lon, min_lat, max_lon, max_lat)]
+        self.grid = defaultdict(list)
+        self.small = []          # [(country index, (min_lon, min_lat, max_lon, max_lat))]
+
+        for code, (name, continent, box) in SMALL_COUNTRIES.items():
+            self.small.append((len(self.countries), box))
+            self.countries.append((code, name, region_for(code, continent)))
+        for feature in features:
+            props = feature["properties"]
+            geom = feature["geometry"]
+            code = props["iso_a3"]
+            country = len(self.countries)
+            self.countries.append((code, props["name"], region_for(code, props.get("continent"))))
+            polygons = [geom["coordinates"]] if geom["type"] == "Polygon" else geom["coordinates"]
+            for polygon in polygons:
+                rings = [np.asarray(ring, dtype=np.float64) for ring in polygon]
+                exterior = rings[0]
+                bbox = (*exterior.min(axis=0), *exterior.max(axis=0))
+                part = len(self.parts)
+                self.parts.append((country, rings))
+                self.bboxes.append(bbox)
+                for key in self._cells(*bbox):
+                    self.grid[key].append(part)
+        self.bboxes = np.asarray(self.bboxes)
+
+    @classmethod
+    def load(cls, path=boundaries_path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f)["features"])
+
+    def _cells(self, min_lon, min_lat, max_lon, max_lat):
+        for cx in range(int(np.floor(min_lon / self.cell)), int(np.floor(max_lon / self.cell)) + 1):
+            for cy in range(int(np.floor(min_lat / self.cell)), int(np.floor(max_lat / self.cell)) + 1):
+                yield cx, cy
+
+    @staticmethod
+    def _inside(rings, lon, lat):
+        """Even-odd crossing test of many points against one polygon with holes."""
+        inside = np.zeros(lon.shape, dtype=bool)
+        for ring in rings:
+            x1, y1 = ring[:, 0], ring[:, 1]
+            x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+            # (points, edges) matrices; a ray to +x crosses edges that straddle the point's latitude
+            py = lat[:, None]
+            straddles = (y1 > py) != (y2 > py)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                x_cross = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+            crossings = np.count_nonzero(straddles & (lon[:, None] < x_cross), axis=1)
+            inside ^= (crossings % 2).astype(bool)
+        return inside
+
+    @staticmethod
+    def _edge_distance_km(rings, lon, lat):
+        """Shortest distance from each point to any edge, in a local equirectangular projection."""
+        best = np.full(lon.shape, np.inf)
+        scale = np.cos(np.radians(lat))[:, None]
+        for ring in rings:
+            x1, y1 = ring[:, 0], ring[:, 1]
+            x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+            ax = (x1 - lon[:, None]) * scale
+            ay = y1 - lat[:, None]
+            dx, dy = (x2 - x1) * scale, np.broadcast_to(y2 - y1, ax.shape)
+            length2 = dx * dx + dy * dy
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = np.clip(np.where(length2 > 0, -(ax * dx + ay * dy) / length2, 0.0), 0.0, 1.0)
+            cx, cy = ax + t * dx, ay + t * dy
+            best = np.minimum(best, np.sqrt(cx * cx + cy * cy).min(axis=1))
+        return best * KM_PER_DEGREE
+
+    def _candidate_pairs(self, lon, lat):
+        """(point, part) index pairs for every part registered in each point's grid cell."""
+        valid = np.flatnonzero(~np.isnan(lon) & ~np.isnan(lat))
+        cx = np.floor(lon[valid] / self.cell).astype(np.int64)
+        cy = np.floor(lat[valid] / self.cell).astype(np.int64)
+        cells, inverse = np.unique(np.stack([cx, cy], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        points, parts = [], []
+        for c, (x, y) in enumerate(cells):
+            members = self.grid.get((int(x), int(y)))
+            if members:
+                idx = valid[inverse == c]
+                points.append(np.repeat(idx, len(members)))
+                parts.append(np.tile(np.asarray(members, dtype=np.intp), len(idx)))
+        if not points:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        points, parts = np.concatenate(points), np.concatenate(parts)
+        # Cheap bbox rejection before the edge tests
+        b = self.bboxes[parts]
+        keep = ((lon[points] >= b[:, 0]) & (lon[points] <= b[:, 2])
+                & (lat[points] >= b[:, 1]) & (lat[points] <= b[:, 3]))
+        return points[keep], parts[keep]
+
+    def locate(self, lon, lat, snap_km=SNAP_KM):
+        """Country index per point (-1 where none), for arrays of longitudes/latitudes."""
+        lon = np.asarray(lon, dtype=np.float64)
+        lat = np.asarray(lat, dtype=np.float64)
+        result = np.full(lon.shape, -1, dtype=np.intp)
+        for country, (min_lon, min_lat, max_lon, max_lat) in self.small:
+            result[(lon >= min_lon) & (lon <= max_lon) & (lat >= min_lat) & (lat <= max_lat)] = country
+
+        points, parts = self._candidate_pairs(lon, lat)
+        order = np.argsort(parts, kind="stable")
+        points, parts = points[order], parts[order]
+        for part in np.unique(parts):
+            idx = points[parts == part]
+            idx = idx[result[idx] < 0]
+            if len(idx):
+                country, rings = self.parts[part]
+                result[idx[self._inside(rings, lon[idx], lat[idx])]] = country
+
+        missing = np.flatnonzero((result < 0) & ~np.isnan(lon) & ~np.isnan(lat))
+        if snap_km and len(missing):
+            pad = snap_km / KM_PER_DEGREE
+            best = np.full(len(missing), np.inf)
+            # Snapping can cross a cell boundary, so test every part whose padded bbox covers the point
+            m_lon, m_lat = lon[missing], lat[missing]
+            b = self.bboxes
+            near = ((m_lon[:, None] >= b[:, 0] - pad * 2) & (m_lon[:, None] <= b[:, 2] + pad * 2)
+                    & (m_lat[:, None] >= b[:, 1] - pad) & (m_lat[:, None] <= b[:, 3] + pad))
+            for part in np.flatnonzero(near.any(axis=0)):
+                rows = np.flatnonzero(near[:, part])
+                country, rings = self.parts[part]
+                dist = self._edge_distance_km(rings, m_lon[rows], m_lat[rows])
+                closer = dist < np.minimum(best[rows], snap_km)
+                best[rows[closer]] = dist[closer]
+                result[missing[rows[closer]]] = country
+        return result
+
+
+def _coords(item):
+    coords = item.get("coordinates") or item
+    lat, lon = coords.get("latitude"), coords.get("longitude")
+    return (float(lon), float(lat)) if lat is not None and lon is not None else (np.nan, np.nan)
+
+
+def assign_regions(war_room_data, clients, index):
+    """Tag factories and clients with region/countryCode and build per-region membership lists."""
+    factories = [(sub, f) for g in war_room_data["parentGroups"] for sub in g["subsidiaries"]
+                 for f in sub.get("factories", [])]
+    points = [_coords(f) for _, f in factories] + [_coords(c) for c in clients]
+    lon, lat = (np.asarray(a) for a in zip(*points)) if points else (np.empty(0), np.empty(0))
+    located = index.locate(lon, lat)
+
+    regions = defaultdict(lambda: {"factories": [], "hubs": [], "clients": []})
+    countries = defaultdict(lambda: {"factories": [], "hubs": [], "clients": []})
+    unassigned = []
+    sub_regions = defaultdict(Counter)
+
+    def record(kind, entity_id, country):
+        if country < 0:
+            unassigned.append({"type": kind, "id": entity_id})
+            return None, None
+        code, _, region = index.countries[country]
+        countries[code][kind].append(entity_id)
+        if region:
+            regions[region][kind].append(entity_id)
+        return region, code
+
+    for i, (sub, factory) in enumerate(factories):
+        region, code = record("factories", factory["id"], located[i])
+        factory["region"], factory["countryCode"] = region, code
+        if region:
+            sub_regions[sub["id"]][region] += 1
+
+    client_assignments = {}
+    for j, client in enumerate(clients):
+        region, code = record("clients", client["clientId"], located[len(factories) + j])
+        client["region"], client["countryCode"] = region, code
+        client_assignments[client["clientId"]] = {"region": region, "countryCode": code}
+
+    # Hubs carry no coordinates; they serve their company's plants, so take the subsidiary's main region
+    for group in war_room_data["parentGroups"]:
+        for sub in group["subsidiaries"]:
+            common = sub_regions[sub["id"]].most_common(1)
+            for hub in sub.get("hubs", []):
+                hub["region"] = common[0][0] if common else None
+                if hub["region"]:
+                    regions[hub["region"]]["hubs"].append(hub["id"])
+                else:
+                    unassigned.append({"type": "hubs", "id": hub["id"]})
+
+    return {
+        "source": boundaries_path.name,
+        "regions": {name: regions[name] for name in sorted(regions)},
+        "countries": {code: countries[code] for code in sorted(countries)},
+        "clients": client_assignments,
+        "unassigned": unassigned,
+    }
+
+
+def update_regions(war_room_data, index=None):
+    """Tag the document's factories and hubs and the clients in clients.json with their region.
+
+    Writes region-index.json, and clients.json when a client's tags changed.
+    """
+    clients_data = {"clients": []}
+    if clients_path.exists():
+        with open(clients_path, "r", encoding="utf-8") as f:
+            clients_data = json.load(f)
+    clients = clients_data["clients"]
+    before = [(c.get("region"), c.get("countryCode")) for c in clients]
+    region_index = assign_regions(war_room_data, clients, index or BoundaryIndex.load())
+    if [(c["region"], c["countryCode"]) for c in clients] != before:
+        atomic_write_json(clients_path, clients_data, indent=2, ensure_ascii=False)
+    atomic_write_json(region_index_path, region_index, indent=2)
+    return region_index
+
+
+def main(argv):
+    with open(war_room_data_path, "r", encoding="utf-8") as f:
+        war_room_data = json.load(f)
+
+    region_index = update_regions(war_room_data)
+    atomic_write_json(war_room_data_path, war_room_data, indent=2, ensure_ascii=False)
+
+    for name, members in region_index["regions"].items():
+        print(f"{name}: {len(members['factories'])} factories, {len(members['hubs'])} hubs, "
+              f"{len(members['clients'])} clients")
+    for item in region_index["unassigned"]:
+        print(f"No region for {item['type']} entry {item['id']}", file=sys.stderr)
+    print(f"Wrote {region_index_path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
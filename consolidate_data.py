@@ -1,19 +1,22 @@
 import json
 from pathlib import Path
 
+from facility_store import refresh_store
+from factory_id_registry import load_registry
+from validate_data import ValidationError, check
+
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "public" / "assets" / "data"
 
 factories_path = DATA_DIR / "factories.json"
 mf_path = DATA_DIR / "manufacturer-facilities.json"
 
-def consolidate():
-    with open(factories_path, 'r') as f:
-        factories_data = json.load(f)
-    
-    with open(mf_path, 'r') as f:
-        mf_list = json.load(f)
-    
+def consolidate_records(factories_data, mf_list, factory_ids=None):
+    """Enrich factories.json records from manufacturer-facilities.json.
+
+    Returns the consolidated document. `factory_ids` limits the work to those
+    records (watch mode); everything else is carried over untouched.
+    """
     # We want to keep the manufacturers from factories.json
     # but enrich the factories array with data from mf_list.
     
@@ -31,7 +34,7 @@ def consolidate():
         existing_f_ids.add(f_id)
         
         # Enrich if exists in mf_list
-        if f_id in mf_map:
+        if f_id in mf_map and (factory_ids is None or f_id in factory_ids):
             mf_item = mf_map[f_id]
             f['full_address'] = mf_item.get('Full Address')
             f['facility_type'] = mf_item.get('Facility Type')
@@ -40,7 +43,7 @@ def consolidate():
         
     # Add any from mf_list that weren't in factories.json
     for f_id, mf_item in mf_map.items():
-        if f_id not in existing_f_ids:
+        if f_id not in existing_f_ids and (factory_ids is None or f_id in factory_ids):
             # Construct a record that fits the app's expectations
             company_name = mf_item.get('Company')
             city = mf_item.get('City')
@@ -62,13 +65,29 @@ def consolidate():
     # Sort by factory_id for cleanliness
     new_factories.sort(key=lambda x: x['factory_id'])
     
-    consolidated = {
+    return {
         "manufacturers": factories_data['manufacturers'],
         "factories": new_factories
     }
+
+def consolidate():
+    with open(factories_path, 'r') as f:
+        factories_data = json.load(f)
+    
+    with open(mf_path, 'r') as f:
+        mf_list = json.load(f)
+
+    try:
+        check(factories_path.name, factories_data)
+        check(mf_path.name, mf_list)
+    except ValidationError as e:
+        exit(str(e))
+    
+    consolidated = consolidate_records(factories_data, mf_list)
     
     with open(factories_path, 'w') as f:
         json.dump(consolidated, f, indent=2)
+    refresh_store(consolidated, load_registry())
         
     print(f"Consolidated data into {factories_path}")
 
@@ -2,12 +2,16 @@ import pandas as pd
 import json
 import sys
 
-try:
-    file_path = r"c:\Users\Owner\Downloads\Complete_Bus_Manufacturer_Facilities_FULL.xlsx"
-    df = pd.read_excel(file_path)
+file_path = r"c:\Users\Owner\Downloads\Complete_Bus_Manufacturer_Facilities_FULL.xlsx"
+
+def read_workbook(path=file_path):
     # Convert dataframe to a list of dictionaries
-    data = df.to_dict(orient='records')
-    print(json.dumps(data, indent=2))
-except Exception as e:
-    print(f"Error: {e}", file=sys.stderr)
-    sys.exit(1)
+    return pd.read_excel(path).to_dict(orient='records')
+
+if __name__ == "__main__":
+    try:
+        data = read_workbook(sys.argv[1] if len(sys.argv) > 1 else file_path)
+        print(json.dumps(data, indent=2))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,231 @@
+import argparse
+import base64
+import json
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from factory_id_registry import atomic_write_json, load_registry
+from map_deltas import content_hash
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+
+war_room_data_path = DATA_DIR / "fluorescence-map-data.json"
+clients_path = DATA_DIR / "clients.json"
+projects_path = DATA_DIR / "projects.json"
+region_index_path = DATA_DIR / "region-index.json"
+facet_index_path = DATA_DIR / "facet-index.json"
+
+# Ordinal ranges are laid out level by level so a view mode is a single run
+LEVELS = ("parent", "subsidiary", "factory", "client")
+
+
+# -- bitsets -------------------------------------------------------------------
+#
+# Bitsets are Python ints while building (bit i = entity ordinal i). On disk each
+# one is whichever encoding is shorter:
+#   {"runs": [start, length, start, length, ...]}   runs of set bits
+#   {"words": "<base64>"}                              little-endian uint32 words
+# so sparse and clustered sets stay tiny and dense ones are 4 bytes per 32 entities.
+
+def encode(bits, size):
+    ones = bin(bits)[2:][::-1]
+    runs = []
+    for m in re.finditer("1+", ones):
+        runs += [m.start(), m.end() - m.start()]
+    words = base64.b64encode(bits.to_bytes((size + 31) // 32 * 4, "little")).decode("ascii")
+    encoded = {"runs": runs} if len(json.dumps(runs)) <= len(words) + 2 else {"words": words}
+    encoded["count"] = sum(runs[1::2])
+    return encoded
+
+
+def decode(encoded):
+    if "runs" in encoded:
+        bits = 0
+        runs = encoded["runs"]
+        for start, length in zip(runs[::2], runs[1::2]):
+            bits |= ((1 << length) - 1) << start
+        return bits
+    return int.from_bytes(base64.b64decode(encoded["words"]), "little")
+
+
+def ordinals(bits):
+    ones = bin(bits)[2:][::-1]
+    return [m.start() for m in re.finditer("1", ones)]
+
+
+# -- building ------------------------------------------------------------------
+
+def _is_active(status):
+    # Same rule as FluorescenceMapComponent.isActiveStatus
+    return str(status or "").strip().upper() in ("ACTIVE", "ONLINE")
+
+
+def _project_status(projects, registry):
+    """{factory slug: "active" | "inactive"}; a factory with any active project is active."""
+    status = {}
+    for project in projects:
+        slug = registry.slug_for(project["factory_id"]) if project.get("factory_id") is not None else None
+        if not slug:
+            continue
+        slug = registry.resolve(slug)
+        if str(project.get("status", "")).lower() == "active":
+            status[slug] = "active"
+        else:
+            status.setdefault(slug, "inactive")
+    return status
+
+
+def build_facet_index(war_room_data, clients=(), projects=(), registry=None, region_index=None):
+    """Entity ordinal table plus one bitset per facet value.
+
+    Facets follow the war-room filters: ``region`` (from assign_regions.py),
+    ``status`` (operational, ACTIVE/ONLINE count as active), ``projectStatus``
+    (any active project), ``company`` (a parent group or subsidiary id, matching
+    the entity itself, everything under it, and the parent above a selected
+    subsidiary) and ``level``. Parents and subsidiaries carry the union of
+    their factories' regions and project statuses.
+    """
+    region_index = region_index or {}
+    client_regions = {cid: a.get("region") for cid, a in region_index.get("clients", {}).items()}
+    factory_regions = {f: name for name, members in region_index.get("regions", {}).items()
+                       for f in members.get("factories", [])}
+    project_status = _project_status(projects, registry) if registry is not None else {}
+
+    entities = {level: [] for level in LEVELS}
+    for group in war_room_data["parentGroups"]:
+        entities["parent"].append(group)
+        for sub in group["subsidiaries"]:
+            entities["subsidiary"].append(sub)
+            entities["factory"].extend(sub.get("factories", []))
+    entities["client"] = list(clients)
+
+    table, ordinal = [], {}
+    facets = defaultdict(lambda: defaultdict(int))
+    for level in LEVELS:
+        start = len(table)
+        for entity in entities[level]:
+            key = (level, entity["clientId"] if level == "client" else entity["id"])
+            ordinal[key] = len(table)
+            table.append([level, key[1]])
+        if len(table) > start:
+            facets["level"][level] = ((1 << (len(table) - start)) - 1) << start
+
+    def add(facet, value, *keys):
+        if value:
+            for key in keys:
+                facets[facet][value] |= 1 << ordinal[key]
+
+    for group in war_room_data["parentGroups"]:
+        g_key = ("parent", group["id"])
+        add("status", "active" if _is_active(group.get("status")) else "inactive", g_key)
+        add("company", group["id"], g_key)
+        for sub in group["subsidiaries"]:
+            s_key = ("subsidiary", sub["id"])
+            add("status", "active" if _is_active(sub.get("status")) else "inactive", s_key)
+            add("company", group["id"], s_key)
+            add("company", sub["id"], s_key, g_key)
+            for factory in sub.get("factories", []):
+                f_key = ("factory", factory["id"])
+                add("status", "active" if _is_active(factory.get("status")) else "inactive", f_key)
+                add("company", group["id"], f_key)
+                add("company", sub["id"], f_key)
+                add("region", factory.get("region") or factory_regions.get(factory["id"]), f_key, s_key, g_key)
+                add("projectStatus", project_status.get(factory["id"]), f_key, s_key, g_key)
+    for client in clients:
+        add("region", client_regions.get(client["clientId"]), ("client", client["clientId"]))
+
+    size = len(table)
+    return {
+        "mapSha256": content_hash(war_room_data),
+        "size": size,
+        "entities": table,
+        "facets": {facet: {value: encode(bits, size) for value, bits in sorted(values.items())}
+                   for facet, values in sorted(facets.items())},
+    }
+
+
+def _load(path, key=None, default=None):
+    if not Path(path).exists():
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data[key] if key else data
+
+
+def write_facet_index(war_room_data, registry, path=facet_index_path):
+    index = build_facet_index(
+        war_room_data,
+        clients=_load(clients_path, "clients", []),
+        projects=_load(projects_path, "projects", []),
+        registry=registry,
+        region_index=_load(region_index_path, default={}),
+    )
+    atomic_write_json(path, index, separators=(",", ":"), ensure_ascii=False)
+    return index
+
+
+# -- querying ------------------------------------------------------------------
+
+class FacetIndex:
+    """Evaluate filter combinations against a loaded facet index.
+
+    Values within one facet are OR'ed and facets are AND'ed, the way the
+    war-room filter panel combines checkboxes; an empty selection for a facet
+    means "no constraint".
+    """
+
+    def __init__(self, data):
+        self.size = data["size"]
+        self.entities = data["entities"]
+        self.facets = {facet: {value: decode(encoded) for value, encoded in values.items()}
+                       for facet, values in data["facets"].items()}
+
+    @classmethod
+    def load(cls, path=facet_index_path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def select(self, **selections):
+        bits = (1 << self.size) - 1
+        for facet, values in selections.items():
+            if not values:
+                continue
+            known = self.facets.get(facet, {})
+            union = 0
+            for value in ([values] if isinstance(values, str) else values):
+                union |= known.get(value, 0)
+            bits &= union
+        return bits
+
+    def ids(self, bits):
+        return [tuple(self.entities[i]) for i in ordinals(bits)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Facet bitset index for the war-room filters")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="rebuild facet-index.json from the current map data")
+    p = sub.add_parser("query", help="list the entities matching a filter combination")
+    for facet in ("level", "region", "status", "projectStatus", "company"):
+        p.add_argument(f"--{facet}", action="append", default=[])
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        war_room_data = _load(war_room_data_path)
+        index = write_facet_index(war_room_data, load_registry())
+        sizes = ", ".join(f"{facet} {len(values)}" for facet, values in index["facets"].items())
+        print(f"Wrote {facet_index_path}: {index['size']} entities; values per facet: {sizes}")
+    else:
+        index = FacetIndex.load()
+        selections = {facet: getattr(args, facet) for facet in ("level", "region", "status", "projectStatus", "company")}
+        matches = index.ids(index.select(**selections))
+        for level, entity_id in matches:
+            print(f"{level}\t{entity_id}")
+        print(f"{len(matches)} of {index.size} entities", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
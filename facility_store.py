@@ -0,0 +1,341 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+from pathlib import Path
+
+from factory_id_registry import _fsync_dir, atomic_write_json, load_registry
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+STATE_DIR = BASE_DIR / "data" / "state"
+
+factories_path = DATA_DIR / "factories.json"
+store_dir = STATE_DIR / "facility-store"
+
+# factory_id, byte offset, byte length; sorted by factory_id
+_ID_ENTRY = struct.Struct("<qQI")
+# 64-bit slug hash, factory_id; sorted by hash
+_SLUG_ENTRY = struct.Struct("<Qq")
+# Rebuild once patches have orphaned more than this share of records.ndjson
+MAX_DEAD_RATIO = 0.5
+
+
+def slug_hash(slug):
+    return int.from_bytes(hashlib.blake2b(slug.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _line(record):
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _indent(text, spaces):
+    return text.replace("\n", "\n" + " " * spaces)
+
+
+def _write_file(path, chunks):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _bisect(view, entry, count, key):
+    """First entry whose leading field is >= ``key``; reads O(log n) entries."""
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if entry.unpack_from(view, mid * entry.size)[0] < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class FacilityStore:
+    """factories.json as one JSON record per line plus binary offset indexes.
+
+    ``records.ndjson`` holds the records in factory_id order. ``by-id.idx`` is
+    a sorted array of (factory_id, offset, length) and ``by-slug.idx`` a sorted
+    array of (slug hash, factory_id), so a lookup is a binary search over a
+    memory-mapped index followed by one read of the record's bytes.
+
+    A patched record that still fits is rewritten in place, padded with
+    spaces. One that grew is appended and its index entry is repointed; the
+    old bytes are blanked and counted as dead until the next rebuild. Adding
+    or removing factories needs a rebuild, since the indexes are sorted
+    arrays.
+    """
+
+    def __init__(self, root=store_dir):
+        self.root = Path(root)
+        self.records_path = self.root / "records.ndjson"
+        self.id_index_path = self.root / "by-id.idx"
+        self.slug_index_path = self.root / "by-slug.idx"
+        self.meta_path = self.root / "meta.json"
+        self.meta = None
+        if self.meta_path.exists():
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+
+    @property
+    def exists(self):
+        return self.meta is not None
+
+    def __len__(self):
+        return self.meta["count"] if self.meta else 0
+
+    # -- building ----------------------------------------------------------
+
+    def build(self, factories_data, registry=None):
+        """Write a fresh store for ``factories_data`` and swap it in for the old one.
+
+        Without a registry the current slug index is carried over unchanged.
+        """
+        if registry is None:
+            slug_entries = [self.slug_index_path.read_bytes()] if self.slug_index_path.exists() else []
+        records = sorted(factories_data["factories"], key=lambda r: r["factory_id"])
+        staging = self.root.with_name(self.root.name + ".new")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        lines = [_line(r) for r in records]
+        _write_file(staging / self.records_path.name, lines)
+        entries, offset = [], 0
+        for record, line in zip(records, lines):
+            entries.append(_ID_ENTRY.pack(record["factory_id"], offset, len(line)))
+            offset += len(line)
+        _write_file(staging / self.id_index_path.name, entries)
+        if registry is not None:
+            slug_entries = self._slug_entries((r["factory_id"] for r in records), registry)
+        _write_file(staging / self.slug_index_path.name, slug_entries)
+        atomic_write_json(staging / self.meta_path.name, {
+            "manufacturers": factories_data.get("manufacturers", []),
+            "count": len(records), "deadBytes": 0,
+        }, indent=2)
+
+        previous = self.root.with_name(self.root.name + ".old")
+        shutil.rmtree(previous, ignore_errors=True)
+        if self.root.exists():
+            os.replace(self.root, previous)
+        os.replace(staging, self.root)
+        _fsync_dir(self.root.parent)
+        shutil.rmtree(previous, ignore_errors=True)
+        self.__init__(self.root)
+
+    @staticmethod
+    def _slug_entries(factory_ids, registry):
+        keyed = sorted((slug_hash(registry.slug_for(fid)), fid) for fid in factory_ids if registry.slug_for(fid))
+        return [_SLUG_ENTRY.pack(h, fid) for h, fid in keyed]
+
+    def reindex_slugs(self, registry):
+        """Rebuild by-slug.idx from the registry; records are not touched."""
+        if not self.exists:
+            return 0
+        entries = self._slug_entries((factory_id for factory_id, _, _ in self._id_entries()), registry)
+        _write_file(self.slug_index_path, entries)
+        return len(entries)
+
+    # -- reading -----------------------------------------------------------
+
+    def _map(self, path, write=False):
+        with open(path, "r+b" if write else "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if write else mmap.ACCESS_READ)
+
+    def _id_entries(self):
+        index = self._map(self.id_index_path)
+        if index is None:
+            return
+        with index:
+            for i in range(len(index) // _ID_ENTRY.size):
+                yield _ID_ENTRY.unpack_from(index, i * _ID_ENTRY.size)
+
+    def _locate(self, factory_id):
+        """(entry number, offset, length) of ``factory_id`` in by-id.idx, or None."""
+        index = self._map(self.id_index_path)
+        if index is None:
+            return None
+        with index:
+            count = len(index) // _ID_ENTRY.size
+            i = _bisect(index, _ID_ENTRY, count, factory_id)
+            if i < count:
+                found, offset, length = _ID_ENTRY.unpack_from(index, i * _ID_ENTRY.size)
+                if found == factory_id:
+                    return i, offset, length
+        return None
+
+    def _read(self, offset, length):
+        records = self._map(self.records_path)
+        with records:
+            return json.loads(records[offset:offset + length])
+
+    def get(self, factory_id):
+        location = self._locate(int(factory_id)) if self.exists else None
+        return self._read(*location[1:]) if location else None
+
+    def get_by_slug(self, slug):
+        if not self.exists:
+            return None
+        index = self._map(self.slug_index_path)
+        if index is None:
+            return None
+        key = slug_hash(slug)
+        with index:
+            count = len(index) // _SLUG_ENTRY.size
+            i = _bisect(index, _SLUG_ENTRY, count, key)
+            found, factory_id = _SLUG_ENTRY.unpack_from(index, i * _SLUG_ENTRY.size) if i < count else (None, None)
+        return self.get(factory_id) if found == key else None
+
+    def __iter__(self):
+        """Records in factory_id order, read one at a time."""
+        if not self.exists:
+            return
+        records = self._map(self.records_path)
+        if records is None:
+            return
+        with records:
+            for _, offset, length in self._id_entries():
+                yield json.loads(records[offset:offset + length])
+
+    # -- patching ----------------------------------------------------------
+
+    def put(self, record):
+        """Replace the stored record with the same factory_id; returns "in place" or "appended"."""
+        location = self._locate(record["factory_id"])
+        if location is None:
+            raise KeyError(f"factory {record['factory_id']} is not in the store; rebuild it to add factories")
+        i, offset, length = location
+        line = _line(record)
+        if len(line) <= length:
+            records = self._map(self.records_path, write=True)
+            with records:
+                records[offset:offset + length] = line[:-1] + b" " * (length - len(line)) + b"\n"
+                records.flush()
+            return "in place"
+
+        with open(self.records_path, "ab") as f:
+            new_offset = f.tell()
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        index = self._map(self.id_index_path, write=True)
+        with index:
+            _ID_ENTRY.pack_into(index, i * _ID_ENTRY.size, record["factory_id"], new_offset, len(line))
+            index.flush()
+        records = self._map(self.records_path, write=True)
+        with records:
+            records[offset:offset + length] = b" " * (length - 1) + b"\n"
+            records.flush()
+        self.meta["deadBytes"] += length
+        atomic_write_json(self.meta_path, self.meta, indent=2)
+        if self.meta["deadBytes"] > self.records_path.stat().st_size * MAX_DEAD_RATIO:
+            self.compact()
+        return "appended"
+
+    def patch(self, factory_id, fields):
+        """Set ``fields`` on one record without reading the others."""
+        record = self.get(factory_id)
+        if record is None:
+            raise KeyError(f"factory {factory_id} is not in the store")
+        if "factory_id" in fields and fields["factory_id"] != record["factory_id"]:
+            raise ValueError("factory_id can't be patched; rebuild the store instead")
+        record.update(fields)
+        return self.put(record)
+
+    def compact(self):
+        """Rewrite the store without the space orphaned by patches."""
+        self.build({"manufacturers": self.meta["manufacturers"], "factories": list(self)})
+
+    # -- regeneration ------------------------------------------------------
+
+    def export(self, path=factories_path):
+        """Regenerate factories.json in one streaming pass, byte for byte what json.dump(indent=2) writes."""
+        def chunks():
+            yield ('{\n  "manufacturers": ' + _indent(json.dumps(self.meta["manufacturers"], indent=2), 2)
+                   + ',\n  "factories": ').encode("utf-8")
+            count = 0
+            for record in self:
+                yield (("[\n    " if not count else ",\n    ") + _indent(json.dumps(record, indent=2), 4)).encode("utf-8")
+                count += 1
+            yield b"\n  ]\n}" if count else b"[]\n}"
+        _write_file(Path(path), chunks())
+        _fsync_dir(Path(path).parent)
+
+
+def refresh_store(factories_data, registry, factory_ids=None, store=None):
+    """Bring the store in line with ``factories_data``.
+
+    With ``factory_ids`` only those records are patched; anything the patch
+    path can't express (no store yet, a factory added or removed, new
+    manufacturers) falls back to a full rebuild.
+    """
+    store = store or FacilityStore()
+    if factory_ids is None or not store.exists or store.meta["manufacturers"] != factories_data.get("manufacturers", []):
+        store.build(factories_data, registry)
+        return "rebuilt"
+    by_id = {r["factory_id"]: r for r in factories_data["factories"] if r["factory_id"] in factory_ids}
+    if len(factories_data["factories"]) != len(store) or any(
+            fid not in by_id or store._locate(fid) is None for fid in factory_ids):
+        store.build(factories_data, registry)
+        return "rebuilt"
+    for record in by_id.values():
+        store.put(record)
+    return f"patched {len(by_id)}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NDJSON facility store with binary offset indexes")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="rebuild the store from factories.json")
+    p = sub.add_parser("get", help="print one record by factory_id or war-room slug")
+    p.add_argument("factory")
+    p = sub.add_parser("patch", help="set fields on one record, e.g. city=Winnipeg")
+    p.add_argument("factory_id", type=int)
+    p.add_argument("fields", nargs="+", metavar="FIELD=JSON")
+    p = sub.add_parser("export", help="regenerate factories.json from the store")
+    p.add_argument("--output", default=str(factories_path))
+    sub.add_parser("stats")
+    args = parser.parse_args(argv)
+
+    store = FacilityStore()
+    if args.command == "build":
+        with open(factories_path, "r", encoding="utf-8") as f:
+            store.build(json.load(f), load_registry())
+        print(f"Built {store.root} with {len(store)} records")
+        return
+    if not store.exists:
+        sys.exit(f"No facility store yet; run: python {Path(__file__).name} build")
+    if args.command == "get":
+        record = store.get(args.factory) if args.factory.isdigit() else store.get_by_slug(
+            load_registry().resolve(args.factory))
+        if record is None:
+            sys.exit(f"No factory {args.factory!r}")
+        print(json.dumps(record, indent=2, ensure_ascii=False))
+    elif args.command == "patch":
+        fields = {}
+        for item in args.fields:
+            key, _, value = item.partition("=")
+            try:
+                fields[key] = json.loads(value)
+            except json.JSONDecodeError:
+                fields[key] = value
+        print(f"Factory {args.factory_id} rewritten {store.patch(args.factory_id, fields)}")
+    elif args.command == "export":
+        store.export(args.output)
+        print(f"Wrote {args.output}")
+    else:
+        size = store.records_path.stat().st_size
+        print(f"{len(store)} records, {size} bytes ({store.meta['deadBytes']} dead)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+# Pipeline state: kept out of public/ so the Angular build never ships it
+STATE_DIR = BASE_DIR / "data" / "state"
+
+registry_path = STATE_DIR / "factory-id-registry.jsonl"
+mapping_path = DATA_DIR / "factory-id-mapping.json"
+
+# Compact the log once it holds this many superseded records per live entry
+COMPACT_RATIO = 4
+
+
+def derive_slug(subsidiary_id, name):
+    # Same rule sync_war_room_data.py has always used for new war-room IDs
+    return f"{subsidiary_id}-{re.sub(r'[^a-zA-Z0-9]', '-', str(name).lower())}"
+
+
+def _fsync_dir(path):
+    if os.name != "nt":
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def atomic_write_json(path, data, **dump_kwargs):
+    # Write to a sibling temp file, fsync, then rename over the target so a
+    # crash never leaves a half-written document behind.
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **dump_kwargs)
+        f.write("\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(path.parent)
+
+
+class FactoryIdRegistry:
+    """Append-only registry of numeric factory_id <-> war-room slug.
+
+    Every change is appended to a JSON-lines log and replayed on load. Slugs
+    are never reused: renaming a factory keeps its old slug as an alias of the
+    new one, and alias chains are collapsed when written so every alias points
+    straight at a live slug.
+    """
+
+    def __init__(self, path=registry_path):
+        self.path = Path(path)
+        self.id_to_slug = {}
+        self.slug_to_id = {}
+        self.aliases = {}
+        self._alias_sources = {}
+        self._records = 0
+        if self.path.exists():
+            self._load()
+
+    # -- lookups -----------------------------------------------------------
+
+    def resolve(self, slug):
+        # Aliases are stored collapsed, so one hop is always enough
+        return self.aliases.get(slug, slug)
+
+    def slug_for(self, factory_id):
+        return self.id_to_slug.get(int(factory_id))
+
+    def id_for(self, slug):
+        return self.slug_to_id.get(self.resolve(slug))
+
+    def __contains__(self, factory_id):
+        return int(factory_id) in self.id_to_slug
+
+    def __len__(self):
+        return len(self.id_to_slug)
+
+    # -- mutations ---------------------------------------------------------
+
+    def assign(self, factory_id, slug):
+        factory_id = int(factory_id)
+        current = self.id_to_slug.get(factory_id)
+        if current == slug:
+            return slug
+        owner = self.slug_to_id.get(slug)
+        if owner is not None and owner != factory_id:
+            raise ValueError(f"Slug '{slug}' is already assigned to factory {owner}")
+        record = {"op": "assign", "factory_id": factory_id, "slug": slug}
+        self._append(record)
+        self._apply(record)
+        return slug
+
+    def release(self, factory_id):
+        """Forget a wrong factory_id -> slug assignment without aliasing the slug.
+
+        Unlike a rename, the slug stays live for whatever map entry it names;
+        the factory_id is free to be assigned again.
+        """
+        factory_id = int(factory_id)
+        if factory_id not in self.id_to_slug:
+            return
+        record = {"op": "release", "factory_id": factory_id}
+        self._append(record)
+        self._apply(record)
+
+    def add_alias(self, alias, slug):
+        target = self.resolve(slug)
+        if alias == target or self.aliases.get(alias) == target:
+            return
+        if alias in self.slug_to_id:
+            raise ValueError(f"Cannot alias live slug '{alias}'")
+        record = {"op": "alias", "alias": alias, "slug": target}
+        self._append(record)
+        self._apply(record)
+
+    def _apply(self, record):
+        op = record["op"]
+        if op == "assign":
+            factory_id, slug = record["factory_id"], record["slug"]
+            old_slug = self.id_to_slug.get(factory_id)
+            self.id_to_slug[factory_id] = slug
+            self.slug_to_id[slug] = factory_id
+            # The new slug may previously have been an alias of something else
+            self._unlink_alias(slug)
+            if old_slug is not None and old_slug != slug:
+                del self.slug_to_id[old_slug]
+                self._link_alias(old_slug, slug)
+        elif op == "release":
+            slug = self.id_to_slug.pop(record["factory_id"], None)
+            if slug is not None:
+                del self.slug_to_id[slug]
+        elif op == "alias":
+            self._link_alias(record["alias"], record["slug"])
+        self._records += 1
+
+    def _link_alias(self, alias, target):
+        self._unlink_alias(alias)
+        self.aliases[alias] = target
+        self._alias_sources.setdefault(target, set()).add(alias)
+        # Anything that pointed at the alias now points straight at the target
+        for source in self._alias_sources.pop(alias, ()):
+            self.aliases[source] = target
+            self._alias_sources[target].add(source)
+
+    def _unlink_alias(self, alias):
+        target = self.aliases.pop(alias, None)
+        if target is not None:
+            sources = self._alias_sources.get(target)
+            if sources:
+                sources.discard(alias)
+
+    # -- persistence -------------------------------------------------------
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        offset = 0
+        for line in data.splitlines(keepends=True):
+            if line.strip():
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line is what a crash mid-append leaves behind
+                    if offset + len(line) < len(data):
+                        raise
+                    print(f"Dropping incomplete trailing record in {self.path}", file=sys.stderr)
+                    with open(self.path, 'r+b') as f:
+                        f.truncate(offset)
+                    break
+                self._apply(record)
+            offset += len(line)
+
+    def _append(self, record):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def needs_compaction(self):
+        live = len(self.id_to_slug) + len(self.aliases)
+        return self._records > COMPACT_RATIO * max(live, 1)
+
+    def compact(self):
+        records = [{"op": "assign", "factory_id": f_id, "slug": slug}
+                   for f_id, slug in sorted(self.id_to_slug.items())]
+        records += [{"op": "alias", "alias": alias, "slug": slug}
+                    for alias, slug in sorted(self.aliases.items())]
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        _fsync_dir(self.path.parent)
+        self._records = len(records)
+
+    def to_mapping(self):
+        return {
+            "factoryIdToWarRoom": {str(f_id): slug for f_id, slug in sorted(self.id_to_slug.items())},
+            "aliases": dict(sorted(self.aliases.items())),
+        }
+
+    def write_mapping(self, path=mapping_path):
+        atomic_write_json(path, self.to_mapping(), indent=2, ensure_ascii=False)
+
+
+def load_registry(path=registry_path, seed_mapping_path=mapping_path):
+    # First run: seed from the hand-maintained mapping so existing IDs survive
+    registry = FactoryIdRegistry(path)
+    if not registry.path.exists() and Path(seed_mapping_path).exists():
+        with open(seed_mapping_path, 'r', encoding='utf-8') as f:
+            mapping = json.load(f)
+        for f_id, slug in mapping.get('factoryIdToWarRoom', {}).items():
+            registry.assign(f_id, slug)
+        for alias, slug in mapping.get('aliases', {}).items():
+            registry.add_alias(alias, slug)
+    return registry
+
+
+if __name__ == "__main__":
+    registry = load_registry()
+    command = sys.argv[1] if len(sys.argv) > 1 else "write-mapping"
+    if command == "compact":
+        registry.compact()
+        print(f"Compacted {registry.path} to {registry._records} records")
+    elif command == "lookup" and len(sys.argv) > 2:
+        key = sys.argv[2]
+        print(registry.slug_for(key) if key.isdigit() else registry.id_for(key))
+    elif command == "write-mapping":
+        registry.write_mapping()
+        print(f"Wrote {mapping_path} ({len(registry)} factories, {len(registry.aliases)} aliases)")
+    else:
+        sys.exit("Usage: factory_id_registry.py [write-mapping | compact | lookup <factory_id|slug>]")
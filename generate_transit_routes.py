@@ -0,0 +1,197 @@
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from factory_id_registry import atomic_write_json, load_registry
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+
+war_room_data_path = DATA_DIR / "fluorescence-map-data.json"
+clients_path = DATA_DIR / "clients.json"
+projects_path = DATA_DIR / "projects.json"
+
+ROUTE_ID_PREFIX = "route-project-"
+# Samples along each arc before simplification
+ARC_SAMPLES = 129
+# Douglas-Peucker tolerance (degrees) per map zoom band; roughly one screen pixel at the band's top zoom
+ZOOM_BANDS = {
+    "z0-3": 0.25,
+    "z4-6": 0.03,
+    "z7+": 0.004,
+}
+POLYLINE_PRECISION = 1e5
+
+
+def great_circle_arcs(starts, ends, samples=ARC_SAMPLES):
+    """Sample every start->end great circle at once.
+
+    starts/ends are (n, 2) arrays of (latitude, longitude) degrees; the result is
+    (n, samples, 2). Points are spherical interpolations of the endpoint unit
+    vectors, and longitudes are unwrapped so arcs crossing the antimeridian stay
+    continuous (MapLibre accepts longitudes beyond +/-180).
+    """
+    lat1, lon1 = np.radians(starts[:, 0]), np.radians(starts[:, 1])
+    lat2, lon2 = np.radians(ends[:, 0]), np.radians(ends[:, 1])
+    a = np.stack([np.cos(lat1) * np.cos(lon1), np.cos(lat1) * np.sin(lon1), np.sin(lat1)], axis=1)
+    b = np.stack([np.cos(lat2) * np.cos(lon2), np.cos(lat2) * np.sin(lon2), np.sin(lat2)], axis=1)
+    omega = np.arccos(np.clip(np.einsum("ij,ij->i", a, b), -1.0, 1.0))[:, None, None]
+    t = np.linspace(0.0, 1.0, samples)[None, :, None]
+    sin_omega = np.sin(omega)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wa = np.where(sin_omega > 1e-12, np.sin((1 - t) * omega) / sin_omega, 1 - t)
+        wb = np.where(sin_omega > 1e-12, np.sin(t * omega) / sin_omega, t)
+    points = wa * a[:, None, :] + wb * b[:, None, :]
+    lat = np.degrees(np.arctan2(points[..., 2], np.hypot(points[..., 0], points[..., 1])))
+    lon = np.degrees(np.unwrap(np.arctan2(points[..., 1], points[..., 0]), axis=1))
+    return np.stack([lat, lon], axis=2)
+
+
+def douglas_peucker(points, tolerance):
+    """Indices of the points kept by Douglas-Peucker on an (n, 2) polyline."""
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        inner = points[first + 1:last]
+        seg = end - start
+        length2 = seg @ seg
+        if length2 == 0:
+            dist = np.hypot(*(inner - start).T)
+        else:
+            t = np.clip((inner - start) @ seg / length2, 0.0, 1.0)
+            dist = np.hypot(*(inner - (start + t[:, None] * seg)).T)
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            split = first + 1 + i
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.flatnonzero(keep)
+
+
+def encode_polyline(points):
+    """Google encoded-polyline string (precision 5) for (latitude, longitude) pairs."""
+    ints = np.round(np.asarray(points) * POLYLINE_PRECISION).astype(np.int64)
+    deltas = np.diff(ints, axis=0, prepend=[[0, 0]]).ravel()
+    out = []
+    for value in deltas.tolist():
+        value = ~(value << 1) if value < 0 else value << 1
+        while value >= 0x20:
+            out.append(chr((0x20 | (value & 0x1f)) + 63))
+            value >>= 5
+        out.append(chr(value + 63))
+    return "".join(out)
+
+
+def _factory_index(war_room_data):
+    return {f["id"]: f for g in war_room_data["parentGroups"] for s in g["subsidiaries"]
+            for f in s.get("factories", [])}
+
+
+def _client_index(clients):
+    index = {}
+    for client in clients:
+        index[client["clientId"].lower()] = client
+        index[client["clientName"].lower()] = client
+    return index
+
+
+def project_endpoints(projects, war_room_data, clients, registry):
+    """Group active projects by (factory slug, client id) with both endpoints' coordinates."""
+    factories = _factory_index(war_room_data)
+    client_index = _client_index(clients)
+    pairs = defaultdict(list)
+    for project in projects:
+        if str(project.get("status", "")).lower() != "active":
+            continue
+        slug = registry.slug_for(project["factory_id"])
+        factory = factories.get(registry.resolve(slug)) if slug else None
+        client = client_index.get(str(project.get("client", "")).lower())
+        if factory is None:
+            print(f"Skipping project {project['project_id']}: factory {project['factory_id']} not on the map",
+                  file=sys.stderr)
+            continue
+        if client is None:
+            print(f"Skipping project {project['project_id']}: unknown client {project.get('client')!r}",
+                  file=sys.stderr)
+            continue
+        coords = factory.get("coordinates") or {}
+        if not coords.get("latitude") and not coords.get("longitude"):
+            continue
+        pairs[(factory["id"], client["clientId"])].append(project["project_id"])
+
+    endpoints = []
+    for (factory_id, client_id), project_ids in sorted(pairs.items()):
+        coords = factories[factory_id]["coordinates"]
+        client = client_index[client_id.lower()]
+        endpoints.append({
+            "factory": factory_id,
+            "client": client_id,
+            "projectIds": sorted(project_ids),
+            "from": (coords["latitude"], coords["longitude"]),
+            "to": (client["latitude"], client["longitude"]),
+        })
+    return endpoints
+
+
+def build_routes(endpoints, samples=ARC_SAMPLES, bands=ZOOM_BANDS):
+    if not endpoints:
+        return []
+    starts = np.array([e["from"] for e in endpoints], dtype=np.float64)
+    ends = np.array([e["to"] for e in endpoints], dtype=np.float64)
+    arcs = great_circle_arcs(starts, ends, samples)
+
+    routes = []
+    for endpoint, arc in zip(endpoints, arcs):
+        # Simplify in a plane where a degree of longitude is as long as a degree of latitude
+        mid_lat = np.radians(arc[:, 0].mean())
+        planar = arc * np.array([1.0, np.cos(mid_lat)])
+        polylines = {band: encode_polyline(arc[douglas_peucker(planar, tol)]) for band, tol in bands.items()}
+        routes.append({
+            "id": f"{ROUTE_ID_PREFIX}{endpoint['factory']}--{endpoint['client']}",
+            "from": endpoint["factory"],
+            "to": endpoint["client"],
+            "fromCoordinates": {"latitude": endpoint["from"][0], "longitude": endpoint["from"][1]},
+            "toCoordinates": {"latitude": endpoint["to"][0], "longitude": endpoint["to"][1]},
+            "animated": True,
+            "projectIds": endpoint["projectIds"],
+            "polylines": polylines,
+        })
+    return routes
+
+
+def merge_routes(existing, generated):
+    # Routes added by hand in the app are kept; previously generated ones are replaced
+    manual = [r for r in existing if not str(r.get("id", "")).startswith(ROUTE_ID_PREFIX)]
+    return manual + generated
+
+
+def main():
+    with open(war_room_data_path, "r", encoding="utf-8") as f:
+        war_room_data = json.load(f)
+    with open(clients_path, "r", encoding="utf-8") as f:
+        clients = json.load(f)["clients"]
+    with open(projects_path, "r", encoding="utf-8") as f:
+        projects = json.load(f)["projects"]
+
+    endpoints = project_endpoints(projects, war_room_data, clients, load_registry())
+    routes = build_routes(endpoints)
+    war_room_data["transitRoutes"] = merge_routes(war_room_data.get("transitRoutes", []), routes)
+    atomic_write_json(war_room_data_path, war_room_data, indent=2, ensure_ascii=False)
+
+    for route in routes:
+        sizes = ", ".join(f"{band} {len(p)}B" for band, p in route["polylines"].items())
+        print(f"{route['from']} -> {route['to']} ({len(route['projectIds'])} projects): {sizes}")
+    print(f"Wrote {len(routes)} routes to {war_room_data_path}")
+
+
+if __name__ == "__main__":
+    main()
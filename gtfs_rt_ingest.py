@@ -0,0 +1,351 @@
+import argparse
+import asyncio
+import hashlib
+import random
+import sys
+import time
+from email.utils import formatdate
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+from google.protobuf.message import DecodeError
+from google.transit import gtfs_realtime_pb2
+
+from factory_id_registry import atomic_write_json
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+OUTPUT_DIR = DATA_DIR / "gtfs-realtime"
+
+# Same upstream the dev server proxies under /yrt (proxy.conf.json)
+FEEDS = {
+    "yrt-vehicles": "http://rtu.york.ca/gtfsrealtime/VehiclePositions",
+    "yrt-trips": "http://rtu.york.ca/gtfsrealtime/TripUpdates",
+}
+
+POLL_INTERVAL = 15
+MAX_BACKOFF = 300
+MAX_CONNECTIONS = 8
+REQUEST_TIMEOUT = 20
+
+# Failures that cost one feed a poll (and a backoff step) but never stop the others
+POLL_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ValueError, DecodeError)
+
+VEHICLE_STATUS = {0: "INCOMING_AT", 1: "STOPPED_AT", 2: "IN_TRANSIT_TO"}
+
+
+def decode_vehicle(entity):
+    v = entity.vehicle
+    out = {"id": entity.id}
+    if v.HasField('trip'):
+        out["tripId"] = v.trip.trip_id or None
+        out["routeId"] = v.trip.route_id or None
+    if v.HasField('vehicle'):
+        out["vehicleId"] = v.vehicle.id or None
+        out["label"] = v.vehicle.label or None
+    if v.HasField('position'):
+        # ~10 cm precision is plenty for markers and keeps the payload small
+        out["lat"] = round(v.position.latitude, 6)
+        out["lon"] = round(v.position.longitude, 6)
+        if v.position.HasField('bearing'):
+            out["bearing"] = round(v.position.bearing, 1)
+        if v.position.HasField('speed'):
+            out["speed"] = round(v.position.speed, 1)
+    if v.HasField('current_status'):
+        out["status"] = VEHICLE_STATUS.get(v.current_status)
+    if v.HasField('timestamp'):
+        out["timestamp"] = v.timestamp
+    return out
+
+
+def decode_trip_update(entity):
+    tu = entity.trip_update
+    out = {
+        "id": entity.id,
+        "tripId": tu.trip.trip_id or None,
+        "routeId": tu.trip.route_id or None,
+    }
+    if tu.HasField('vehicle'):
+        out["vehicleId"] = tu.vehicle.id or None
+    if tu.HasField('timestamp'):
+        out["timestamp"] = tu.timestamp
+    if tu.HasField('delay'):
+        out["delay"] = tu.delay
+    # [stopSequence, stopId, arrivalDelay, arrivalTime, departureTime]
+    stops = []
+    for stu in tu.stop_time_update:
+        arrival = stu.arrival if stu.HasField('arrival') else None
+        departure = stu.departure if stu.HasField('departure') else None
+        stops.append([
+            stu.stop_sequence if stu.HasField('stop_sequence') else None,
+            stu.stop_id or None,
+            arrival.delay if arrival is not None and arrival.HasField('delay') else None,
+            arrival.time if arrival is not None and arrival.HasField('time') else None,
+            departure.time if departure is not None and departure.HasField('time') else None,
+        ])
+    out["stops"] = stops
+    return out
+
+
+def decode_feed(payload):
+    message = gtfs_realtime_pb2.FeedMessage()
+    message.ParseFromString(payload)
+    vehicles = {}
+    trip_updates = {}
+    for entity in message.entity:
+        if entity.is_deleted:
+            continue
+        if entity.HasField('vehicle'):
+            vehicles[entity.id] = decode_vehicle(entity)
+        if entity.HasField('trip_update'):
+            trip_updates[entity.id] = decode_trip_update(entity)
+    return message.header.timestamp, vehicles, trip_updates
+
+
+def diff_entities(previous, current):
+    upserts = [entity for key, entity in current.items() if previous.get(key) != entity]
+    removed = [key for key in previous if key not in current]
+    return upserts, removed
+
+
+class FeedState:
+    def __init__(self, name, url):
+        self.name = name
+        self.url = url
+        self.etag = None
+        self.last_modified = None
+        self.version = 0
+        self.feed_timestamp = None
+        self.vehicles = {}
+        self.trip_updates = {}
+        self.failures = 0
+        # Latest delta not yet written out (the publisher failed); retried every poll
+        self.unpublished = None
+
+    def apply(self, feed_timestamp, vehicles, trip_updates):
+        vehicle_upserts, vehicle_removed = diff_entities(self.vehicles, vehicles)
+        trip_upserts, trip_removed = diff_entities(self.trip_updates, trip_updates)
+        if not (vehicle_upserts or vehicle_removed or trip_upserts or trip_removed):
+            return None
+        delta = {
+            "feed": self.name,
+            "baseVersion": self.version,
+            "version": self.version + 1,
+            "feedTimestamp": feed_timestamp,
+            "vehicles": {"upserts": vehicle_upserts, "removed": vehicle_removed},
+            "tripUpdates": {"upserts": trip_upserts, "removed": trip_removed},
+        }
+        self.version += 1
+        self.feed_timestamp = feed_timestamp
+        self.vehicles = vehicles
+        self.trip_updates = trip_updates
+        return delta
+
+    def snapshot(self):
+        return {
+            "feed": self.name,
+            "version": self.version,
+            "feedTimestamp": self.feed_timestamp,
+            "vehicles": list(self.vehicles.values()),
+            "tripUpdates": list(self.trip_updates.values()),
+        }
+
+
+class SnapshotPublisher:
+    """Writes <feed>.json (full snapshot) and <feed>.delta.json (latest change)."""
+
+    def __init__(self, out_dir=OUTPUT_DIR):
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+
+    def publish(self, state, delta):
+        compact = {"separators": (',', ':'), "ensure_ascii": False}
+        # Delta first so a reader that sees the new snapshot can always find it
+        atomic_write_json(self.out_dir / f"{state.name}.delta.json", delta, **compact)
+        atomic_write_json(self.out_dir / f"{state.name}.json", state.snapshot(), **compact)
+
+
+async def poll_once(session, state):
+    """Fetch one feed with a conditional GET; returns the delta or None if unchanged."""
+    headers = {}
+    if state.etag:
+        headers['If-None-Match'] = state.etag
+    if state.last_modified:
+        headers['If-Modified-Since'] = state.last_modified
+    async with session.get(state.url, headers=headers) as resp:
+        if resp.status == 304:
+            return None
+        resp.raise_for_status()
+        payload = await resp.read()
+        etag, last_modified = resp.headers.get('ETag'), resp.headers.get('Last-Modified')
+    # Protobuf decoding is CPU-bound; keep it off the event loop
+    loop = asyncio.get_running_loop()
+    feed_timestamp, vehicles, trip_updates = await loop.run_in_executor(None, decode_feed, payload)
+    # Only a version we could decode may be skipped with a 304 next time
+    state.etag, state.last_modified = etag, last_modified
+    return state.apply(feed_timestamp, vehicles, trip_updates)
+
+
+def publish_pending(state, publisher, delta):
+    """Write ``delta`` (or a delta left over from a failed write); returns what was written."""
+    if delta is not None:
+        state.unpublished = delta
+    delta, state.unpublished = state.unpublished, None
+    if delta is not None:
+        try:
+            publisher.publish(state, delta)
+        except OSError:
+            state.unpublished = delta
+            raise
+    return delta
+
+
+async def poll_forever(session, state, publisher, interval, stop):
+    # Spread feeds out so they don't all hit the pool at the same instant
+    await asyncio.sleep(random.uniform(0, min(interval, 2)))
+    while not stop.is_set():
+        started = time.monotonic()
+        try:
+            delta = publish_pending(state, publisher, await poll_once(session, state))
+            state.failures = 0
+            if delta is not None:
+                print(f"[{state.name}] v{state.version}: "
+                      f"{len(delta['vehicles']['upserts'])}+/{len(delta['vehicles']['removed'])}- vehicles, "
+                      f"{len(delta['tripUpdates']['upserts'])}+/{len(delta['tripUpdates']['removed'])}- trips")
+        except POLL_ERRORS as e:
+            state.failures += 1
+            print(f"[{state.name}] poll failed ({state.failures}): {e}", file=sys.stderr)
+        except OSError as e:
+            # Disk full or the like: keep polling, and write the latest state once it can be written
+            state.failures += 1
+            print(f"[{state.name}] publish failed ({state.failures}): {e}", file=sys.stderr)
+        wait = interval if not state.failures else min(interval * 2 ** state.failures, MAX_BACKOFF)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=max(0, wait - (time.monotonic() - started)))
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run(feeds, interval=POLL_INTERVAL, out_dir=OUTPUT_DIR, stop=None, iterations=None):
+    """Poll every feed over one pooled session until `stop` is set."""
+    stop = stop or asyncio.Event()
+    publisher = SnapshotPublisher(out_dir)
+    states = [FeedState(name, url) for name, url in feeds.items()]
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, limit_per_host=4, keepalive_timeout=max(60, interval * 2))
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers={'Accept': 'application/x-protobuf'}) as session:
+        if iterations is not None:
+            for _ in range(iterations):
+                results = await asyncio.gather(*(poll_once(session, s) for s in states), return_exceptions=True)
+                for state, delta in zip(states, results):
+                    if isinstance(delta, POLL_ERRORS):
+                        state.failures += 1
+                        print(f"[{state.name}] poll failed: {delta}", file=sys.stderr)
+                    elif isinstance(delta, BaseException):
+                        raise delta
+                    else:
+                        try:
+                            publish_pending(state, publisher, delta)
+                        except OSError as e:
+                            state.failures += 1
+                            print(f"[{state.name}] publish failed: {e}", file=sys.stderr)
+            return states
+        await asyncio.gather(*(poll_forever(session, s, publisher, interval, stop) for s in states))
+    return states
+
+
+# -- local stand-in feed server ----------------------------------------------
+
+def build_feed(vehicles, timestamp=None):
+    """Serialize a VehiclePositions FeedMessage from (id, lat, lon, route_id) tuples."""
+    message = gtfs_realtime_pb2.FeedMessage()
+    message.header.gtfs_realtime_version = "2.0"
+    message.header.timestamp = int(timestamp or time.time())
+    for vehicle_id, lat, lon, route_id in vehicles:
+        entity = message.entity.add()
+        entity.id = str(vehicle_id)
+        entity.vehicle.vehicle.id = str(vehicle_id)
+        entity.vehicle.trip.route_id = str(route_id)
+        entity.vehicle.position.latitude = lat
+        entity.vehicle.position.longitude = lon
+        entity.vehicle.timestamp = message.header.timestamp
+    return message.SerializeToString()
+
+
+class StandInFeed:
+    """Serves protobuf payloads with ETag / Last-Modified like a real GTFS-RT endpoint."""
+
+    def __init__(self):
+        self.payloads = {}
+        self.requests = 0
+        self.not_modified = 0
+
+    def set_payload(self, path, payload):
+        etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+        self.payloads[path] = (payload, etag, formatdate(usegmt=True))
+
+    async def handle(self, request):
+        self.requests += 1
+        entry = self.payloads.get(request.path)
+        if entry is None:
+            raise web.HTTPNotFound()
+        payload, etag, last_modified = entry
+        if request.headers.get('If-None-Match') == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(body=payload, content_type='application/x-protobuf',
+                            headers={'ETag': etag, 'Last-Modified': last_modified})
+
+    async def start(self, host='127.0.0.1', port=0):
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', self.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        bound_port = runner.addresses[0][1]
+        return runner, f"http://{host}:{bound_port}"
+
+
+async def _serve_stand_in(paths, port):
+    feed = StandInFeed()
+    for route, file_path in paths.items():
+        feed.set_payload(route, Path(file_path).read_bytes())
+    runner, base_url = await feed.start(port=port)
+    print(f"Stand-in GTFS-RT feed on {base_url} serving {', '.join(paths)}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GTFS-realtime ingestion")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    poll = sub.add_parser('poll', help="poll feeds and publish snapshots")
+    poll.add_argument('--feed', action='append', metavar='NAME=URL',
+                      help="override the default YRT feeds (repeatable)")
+    poll.add_argument('--interval', type=float, default=POLL_INTERVAL)
+    poll.add_argument('--out', default=str(OUTPUT_DIR))
+    poll.add_argument('--once', action='store_true', help="poll each feed once and exit")
+
+    stand_in = sub.add_parser('stand-in', help="serve local .pb files as a feed")
+    stand_in.add_argument('route', nargs='+', metavar='PATH=FILE', help="e.g. /VehiclePositions=feed.pb")
+    stand_in.add_argument('--port', type=int, default=8090)
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == 'stand-in':
+            asyncio.run(_serve_stand_in(dict(r.split('=', 1) for r in args.route), args.port))
+        else:
+            feeds = dict(f.split('=', 1) for f in args.feed) if args.feed else FEEDS
+            asyncio.run(run(feeds, args.interval, args.out, iterations=1 if args.once else None))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from factory_id_registry import _fsync_dir, atomic_write_json, load_registry
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+STATE_DIR = BASE_DIR / "data" / "state"
+
+war_room_data_path = DATA_DIR / "fluorescence-map-data.json"
+projects_path = DATA_DIR / "projects.json"
+density_path = DATA_DIR / "heatmap-density.json"
+state_path = STATE_DIR / "heatmap" / "density-state.npz"
+
+LAYERS = ("factories", "projects", "incidents")
+# (name, min zoom, max zoom, cell size in degrees); one grid per band
+ZOOM_BANDS = (
+    ("world", 0, 2, 20.0),
+    ("continent", 3, 4, 5.0),
+    ("country", 5, 7, 1.0),
+    ("city", 8, None, 0.25),
+)
+# Shape of the legacy geopoliticalHeatmap grid when the document has none
+DEFAULT_ROWS, DEFAULT_COLS = 3, 4
+
+
+def grid_shape(degrees):
+    return int(np.ceil(180 / degrees)), int(np.ceil(360 / degrees))
+
+
+def cell_ids(coords, degrees):
+    """Row-major cell number of each (latitude, longitude); row 0 starts at the south pole."""
+    rows, cols = grid_shape(degrees)
+    row = np.clip(((coords[:, 0] + 90) // degrees).astype(np.int64), 0, rows - 1)
+    col = np.clip(((coords[:, 1] + 180) // degrees).astype(np.int64), 0, cols - 1)
+    return row * cols + col
+
+
+def _accumulate(cells, weights):
+    """Sum weight rows per cell; returns sorted cell ids and their totals with empty cells dropped."""
+    unique, inverse = np.unique(cells, return_inverse=True)
+    totals = np.zeros((len(unique), len(LAYERS)), dtype=np.int64)
+    np.add.at(totals, inverse, weights)
+    keep = totals.any(axis=1)
+    return unique[keep], totals[keep]
+
+
+def _apply(cells, totals, delta_cells, delta_weights):
+    """Add per-site weight deltas to sorted sparse cells without re-binning the rest."""
+    delta_cells, delta_totals = _accumulate(delta_cells, delta_weights)
+    position = np.searchsorted(cells, delta_cells)
+    hit = position < len(cells)
+    hit[hit] = cells[position[hit]] == delta_cells[hit]
+    totals = totals.copy()
+    totals[position[hit]] += delta_totals[hit]
+    cells = np.insert(cells, position[~hit], delta_cells[~hit])
+    totals = np.insert(totals, position[~hit], delta_totals[~hit], axis=0)
+    keep = totals.any(axis=1)
+    return cells[keep], totals[keep]
+
+
+def collect_sites(war_room_data, projects=(), registry=None):
+    """(ids, [[lat, lon]], [[factories, projects, incidents]]) for every factory with coordinates."""
+    project_counts = Counter()
+    for project in projects:
+        if registry is not None and project.get("factory_id") is not None:
+            slug = registry.slug_for(project["factory_id"])
+            if slug:
+                project_counts[registry.resolve(slug)] += 1
+    ids, coords, weights = [], [], []
+    for group in war_room_data["parentGroups"]:
+        for sub in group["subsidiaries"]:
+            for factory in sub.get("factories", []):
+                position = factory.get("coordinates") or {}
+                if position.get("latitude") is None or position.get("longitude") is None:
+                    continue
+                ids.append(factory["id"])
+                coords.append([position["latitude"], position["longitude"]])
+                weights.append([1, project_counts[factory["id"]], int(factory.get("incidents") or 0)])
+    return (np.array(ids, dtype=str), np.array(coords, dtype=np.float64).reshape(-1, 2),
+            np.array(weights, dtype=np.int64).reshape(-1, len(LAYERS)))
+
+
+class HeatmapDensity:
+    """Sparse per-zoom-band cell totals plus the site table they were built from.
+
+    The site table (id, coordinates, layer weights) is kept in the state file so
+    an update can diff the current sites against it and re-bin only the ones
+    that were added, removed, moved or re-weighted: their old contribution is
+    subtracted and the new one added, cell by cell.
+    """
+
+    def __init__(self, path=state_path, bands=ZOOM_BANDS):
+        self.path = Path(path) if path is not None else None
+        self.bands = bands
+        self.ids = np.array([], dtype=str)
+        self.coords = np.zeros((0, 2))
+        self.weights = np.zeros((0, len(LAYERS)), dtype=np.int64)
+        self.cells = {name: (np.zeros(0, dtype=np.int64), np.zeros((0, len(LAYERS)), dtype=np.int64))
+                      for name, *_ in bands}
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def _load(self):
+        with np.load(self.path) as state:
+            if list(state["degrees"]) != [degrees for *_, degrees in self.bands]:
+                return      # band layout changed: start empty so the next update rebuilds
+            self.ids, self.coords, self.weights = state["ids"], state["coords"], state["weights"]
+            self.cells = {name: (state[f"{name}_cells"], state[f"{name}_totals"]) for name, *_ in self.bands}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        arrays = {"degrees": np.array([degrees for *_, degrees in self.bands]),
+                  "ids": self.ids, "coords": self.coords, "weights": self.weights}
+        for name, (cells, totals) in self.cells.items():
+            arrays[f"{name}_cells"], arrays[f"{name}_totals"] = cells, totals
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        _fsync_dir(self.path.parent)
+
+    def rebuild(self, ids, coords, weights):
+        for name, _, _, degrees in self.bands:
+            self.cells[name] = _accumulate(cell_ids(coords, degrees), weights)
+        self.ids, self.coords, self.weights = ids, coords, weights
+        return len(ids)
+
+    def update(self, ids, coords, weights):
+        """Bring the cells in line with the given sites; returns how many sites were re-binned."""
+        if np.array_equal(self.ids, ids):
+            # Same sites in the same order, the usual case between two syncs
+            match = np.arange(len(ids))
+        else:
+            match = np.full(len(ids), -1)
+            if len(self.ids):
+                order = np.argsort(self.ids)
+                candidate = order[np.minimum(np.searchsorted(self.ids, ids, sorter=order), len(order) - 1)]
+                found = self.ids[candidate] == ids
+                match[found] = candidate[found]
+        known = match >= 0
+        changed = ~known
+        changed[known] = ((self.coords[match[known]] != coords[known]).any(axis=1)
+                          | (self.weights[match[known]] != weights[known]).any(axis=1))
+        stale = np.ones(len(self.ids), dtype=bool)
+        stale[match[known & ~changed]] = False
+        if not changed.any() and not stale.any():
+            return 0
+
+        delta_coords = np.concatenate([self.coords[stale], coords[changed]])
+        delta_weights = np.concatenate([-self.weights[stale], weights[changed]])
+        for name, _, _, degrees in self.bands:
+            cells, totals = self.cells[name]
+            self.cells[name] = _apply(cells, totals, cell_ids(delta_coords, degrees), delta_weights)
+        self.ids, self.coords, self.weights = ids, coords, weights
+        return int(changed.sum() + stale.sum() - (known & changed).sum())
+
+    def document(self):
+        """JSON payload: one sparse, column-oriented cell table per zoom band."""
+        bands = []
+        for name, min_zoom, max_zoom, degrees in self.bands:
+            cells, totals = self.cells[name]
+            rows, cols = grid_shape(degrees)
+            columns = {"row": (cells // cols).tolist(), "col": (cells % cols).tolist()}
+            columns.update({layer: totals[:, i].tolist() for i, layer in enumerate(LAYERS)})
+            bands.append({"name": name, "minZoom": min_zoom, "maxZoom": max_zoom, "cellDegrees": degrees,
+                          "rows": rows, "cols": cols, "max": totals.max(axis=0, initial=0).tolist(),
+                          "cells": columns})
+        return {"layers": list(LAYERS), "origin": {"latitude": -90, "longitude": -180},
+                "sites": len(self.ids), "bands": bands}
+
+    def legacy_grid(self, rows=DEFAULT_ROWS, cols=DEFAULT_COLS):
+        """geopoliticalHeatmap values (0-100, north row first): each layer scaled to its busiest cell, averaged."""
+        grid = np.zeros((rows, cols, len(LAYERS)))
+        if len(self.ids):
+            row = np.clip(((90 - self.coords[:, 0]) * rows // 180).astype(np.int64), 0, rows - 1)
+            col = np.clip(((self.coords[:, 1] + 180) * cols // 360).astype(np.int64), 0, cols - 1)
+            np.add.at(grid, (row, col), self.weights)
+        peak = grid.max(axis=(0, 1))
+        scaled = np.divide(grid, peak, out=np.zeros_like(grid), where=peak > 0)
+        return np.rint(scaled.mean(axis=2) * 100).astype(int).tolist()
+
+
+def _load_projects():
+    if not projects_path.exists():
+        return []
+    with open(projects_path, "r", encoding="utf-8") as f:
+        return json.load(f)["projects"]
+
+
+def update_heatmap(war_room_data, registry, density=None, rebuild=False):
+    """Re-bin changed sites, write heatmap-density.json and refresh the document's geopoliticalHeatmap."""
+    density = density or HeatmapDensity()
+    sites = collect_sites(war_room_data, _load_projects(), registry)
+    changed = density.rebuild(*sites) if rebuild else density.update(*sites)
+    if changed or rebuild or not density_path.exists():
+        density.save()
+        atomic_write_json(density_path, density.document(), separators=(",", ":"))
+    current = war_room_data.get("geopoliticalHeatmap") or {}
+    rows, cols = current.get("rows") or DEFAULT_ROWS, current.get("cols") or DEFAULT_COLS
+    war_room_data["geopoliticalHeatmap"] = {"grid": density.legacy_grid(rows, cols), "rows": rows, "cols": cols}
+    return changed
+
+
+def _bench(count, moved):
+    rng = np.random.default_rng(7)
+    ids = np.array([f"site-{i}" for i in range(count)])
+    coords = np.column_stack([rng.uniform(-60, 70, count), rng.uniform(-180, 180, count)])
+    weights = rng.integers(0, 20, (count, len(LAYERS)))
+    density = HeatmapDensity(path=None)
+
+    started = time.perf_counter()
+    density.rebuild(ids, coords, weights)
+    print(f"Rebuilt {count} sites in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    coords = coords.copy()
+    picked = rng.choice(count, moved, replace=False)
+    coords[picked] += rng.normal(0, 2, (moved, 2))
+    started = time.perf_counter()
+    changed = density.update(ids, coords, weights)
+    print(f"Updated {changed} moved sites in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    fresh = HeatmapDensity(path=None)
+    fresh.rebuild(ids, coords, weights)
+    for name in density.cells:
+        assert all(np.array_equal(a, b) for a, b in zip(density.cells[name], fresh.cells[name])), name
+    print("Incremental cells match a full rebuild")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-resolution density grids for the war-room heatmap")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="re-bin every site from scratch")
+    sub.add_parser("update", help="re-bin only the sites that changed since the last run")
+    p = sub.add_parser("bench", help="time a rebuild and an incremental update on random sites")
+    p.add_argument("count", type=int)
+    p.add_argument("--moved", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        _bench(args.count, args.moved)
+        return
+    with open(war_room_data_path, "r", encoding="utf-8") as f:
+        war_room_data = json.load(f)
+    # The document's own geopoliticalHeatmap is refreshed by the next sync
+    changed = update_heatmap(war_room_data, load_registry(), rebuild=args.command == "build")
+    print(f"Re-binned {changed} sites; wrote {density_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import json
+import re
+import sys
+import zipfile
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from xml.etree.ElementTree import iterparse
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+
+sample_workbook_path = BASE_DIR / "public" / "assets" / "images" / "vehicles" / "VehicleStationTrackerReport_1_15_2026 (1).xlsx"
+output_path = DATA_DIR / "vehicle-station-tracker.json"
+
+NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+EXCEL_EPOCH = date(1899, 12, 30)
+
+# Header labels as written by the tracker export (vehicle-station-tracker.component.ts)
+FLEET_HEADER = "fleet number"
+VIN_HEADER = "vin"
+FRAME_HEADER = "frame #"
+INSPECTOR_HEADER = "inspector"
+STATION_LABEL = re.compile(r'^\s*(\d{1,2})\s*-\s*')
+
+
+def column_index(cell_ref):
+    # "AG12" -> 32 (zero-based)
+    index = 0
+    for ch in cell_ref:
+        if not ch.isalpha():
+            break
+        index = index * 26 + (ord(ch.upper()) - 64)
+    return index - 1
+
+
+def _first_sheet_path(zf):
+    sheet_rid = None
+    with zf.open('xl/workbook.xml') as f:
+        for _, elem in iterparse(f):
+            if elem.tag == NS + 'sheet':
+                sheet_rid = elem.get(REL_NS + 'id')
+                break
+    with zf.open('xl/_rels/workbook.xml.rels') as f:
+        for _, elem in iterparse(f):
+            if elem.tag.endswith('Relationship') and elem.get('Id') == sheet_rid:
+                target = elem.get('Target').lstrip('/')
+                return target if target.startswith('xl/') else f"xl/{target}"
+    return 'xl/worksheets/sheet1.xml'
+
+
+def _shared_strings(zf):
+    if 'xl/sharedStrings.xml' not in zf.namelist():
+        return []
+    strings = []
+    with zf.open('xl/sharedStrings.xml') as f:
+        for _, elem in iterparse(f):
+            if elem.tag == NS + 'si':
+                strings.append(''.join(t.text or '' for t in elem.iter(NS + 't')))
+                elem.clear()
+    return strings
+
+
+def iter_sheet_rows(workbook_path):
+    """Yield (row_number, [cell values]) from the first sheet without loading it whole."""
+    with zipfile.ZipFile(workbook_path) as zf:
+        strings = _shared_strings(zf)
+        with zf.open(_first_sheet_path(zf)) as f:
+            for _, elem in iterparse(f):
+                if elem.tag != NS + 'row':
+                    continue
+                values = []
+                for cell in elem.iter(NS + 'c'):
+                    col = column_index(cell.get('r', '')) if cell.get('r') else len(values)
+                    while len(values) < col:
+                        values.append(None)
+                    kind = cell.get('t')
+                    v = cell.find(NS + 'v')
+                    if kind == 's' and v is not None:
+                        value = strings[int(v.text)]
+                    elif kind == 'inlineStr':
+                        value = ''.join(t.text or '' for t in cell.iter(NS + 't'))
+                    elif v is not None and kind in (None, 'n'):
+                        value = float(v.text)
+                    else:
+                        value = v.text if v is not None else None
+                    values.append(value)
+                yield int(elem.get('r', 0)), values
+                elem.clear()
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value):
+    # Sign-offs come through as "m/d/yyyy" strings or Excel serial numbers
+    if value is None or value == '':
+        return None
+    if isinstance(value, float):
+        return (EXCEL_EPOCH + timedelta(days=int(value))).isoformat()
+    text = str(value).strip()
+    for fmt in ('%m/%d/%Y', '%Y-%m-%d', '%m/%d/%y'):
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def aggregate_workbook(workbook_path):
+    meta = {"source": Path(workbook_path).name}
+    columns = None
+    stations = []
+    fleets = {}
+    station_stats = {}
+    inspector_stats = {}
+
+    for _, values in iter_sheet_rows(workbook_path):
+        texts = [_text(v) for v in values]
+        if columns is None:
+            lowered = [t.lower() for t in texts]
+            if FLEET_HEADER in lowered:
+                columns = {
+                    "fleet": lowered.index(FLEET_HEADER),
+                    "vin": lowered.index(VIN_HEADER) if VIN_HEADER in lowered else None,
+                    "frame": lowered.index(FRAME_HEADER) if FRAME_HEADER in lowered else None,
+                    "inspector": lowered.index(INSPECTOR_HEADER) if INSPECTOR_HEADER in lowered else None,
+                }
+                for idx, label in enumerate(texts):
+                    m = STATION_LABEL.match(label)
+                    if m:
+                        key = f"station{int(m.group(1)):02d}"
+                        stations.append((idx, key, label))
+                        station_stats[key] = {"key": key, "label": label, "vehicles": 0, "signoffs": 0,
+                                              "firstDate": None, "lastDate": None}
+                continue
+            # Title block above the header: "Date: ...", "Client: ...", "Project: ..."
+            first = next((t for t in texts if t), '')
+            if ':' in first:
+                name, _, val = first.partition(':')
+                meta[name.strip().lower()] = val.strip()
+            elif first:
+                meta["title"] = first
+            continue
+
+        def cell(key):
+            idx = columns[key]
+            return texts[idx] if idx is not None and idx < len(texts) else ''
+
+        fleet_number = cell("fleet")
+        if not fleet_number:
+            continue
+        inspector = cell("inspector")
+
+        fleet = fleets.get(fleet_number)
+        if fleet is None:
+            fleet = fleets[fleet_number] = {
+                "vin": cell("vin"), "frame": cell("frame"),
+                "inspectors": [], "stations": {},
+            }
+        if inspector and inspector not in fleet["inspectors"]:
+            fleet["inspectors"].append(inspector)
+
+        signoffs = 0
+        last_date = None
+        for idx, key, _ in stations:
+            signed = parse_date(values[idx]) if idx < len(values) else None
+            if not signed:
+                continue
+            signoffs += 1
+            last_date = max(last_date or signed, signed)
+            previous = fleet["stations"].get(key)
+            if previous is None:
+                station_stats[key]["vehicles"] += 1
+            # Keep the latest sign-off per station when several inspectors signed it
+            if previous is None or signed > previous:
+                fleet["stations"][key] = signed
+            stat = station_stats[key]
+            stat["signoffs"] += 1
+            stat["firstDate"] = min(stat["firstDate"] or signed, signed)
+            stat["lastDate"] = max(stat["lastDate"] or signed, signed)
+
+        if inspector:
+            insp = inspector_stats.setdefault(inspector, {"name": inspector, "vehicles": 0, "signoffs": 0,
+                                                          "lastDate": None})
+            insp["vehicles"] += 1
+            insp["signoffs"] += signoffs
+            if last_date:
+                insp["lastDate"] = max(insp["lastDate"] or last_date, last_date)
+
+    if columns is None:
+        raise ValueError(f"No 'Fleet Number' header row found in {workbook_path}")
+
+    station_count = len(stations)
+    station_keys = [key for _, key, _ in stations]
+    # Columnar fleet table: one array per field, indexed by fleet ordinal
+    fleet_table = {
+        "fleetNumber": [], "vin": [], "frameNumber": [], "inspectors": [],
+        "completedStations": [], "completionPercentage": [], "lastStation": [], "lastDate": [],
+        "stationDates": [],
+    }
+    for fleet_number, fleet in fleets.items():
+        signed = fleet["stations"]
+        last_key = max((k for k in station_keys if k in signed), default=None)
+        fleet_table["fleetNumber"].append(fleet_number)
+        fleet_table["vin"].append(fleet["vin"])
+        fleet_table["frameNumber"].append(fleet["frame"])
+        fleet_table["inspectors"].append(fleet["inspectors"])
+        fleet_table["completedStations"].append(len(signed))
+        fleet_table["completionPercentage"].append(round(len(signed) / station_count * 100) if station_count else 0)
+        fleet_table["lastStation"].append(last_key)
+        fleet_table["lastDate"].append(max(signed.values()) if signed else None)
+        # Dates in station order; null where the station has not been signed off
+        fleet_table["stationDates"].append([signed.get(k) for k in station_keys])
+
+    return {
+        "meta": {**meta, "vehicleCount": len(fleets), "stationCount": station_count},
+        "stations": [station_stats[k] for k in station_keys],
+        "inspectors": sorted(inspector_stats.values(), key=lambda i: i["name"].lower()),
+        "fleets": fleet_table,
+    }
+
+
+def ingest(workbook_paths, out_path=output_path):
+    reports = [aggregate_workbook(p) for p in workbook_paths]
+    artifact = {
+        "generatedAt": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "reports": reports,
+    }
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, separators=(',', ':'), ensure_ascii=False)
+    for report in reports:
+        meta = report["meta"]
+        print(f"{meta['source']}: {meta['vehicleCount']} vehicles, {meta['stationCount']} stations, "
+              f"{len(report['inspectors'])} inspectors")
+    print(f"Wrote {out_path}")
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:] or [sample_workbook_path]
+    ingest(paths)
@@ -20,10 +20,8 @@ SYNONYMS = {
     "enc": "enc (eldorado national)"
 }
 
-def process_data():
-    # Load Excel
-    df = pd.read_excel(excel_path)
-    
+def integrate(df):
+    """Build (factories.json document, manufacturer-facilities records) from the workbook rows."""
     # Load existing factories.json (ORIGINAL version before my first failed-ish run)
     # Actually, I'll just manually define the base manufacturers to be safe and clean.
     initial_manufacturers = [
@@ -116,7 +114,9 @@ def process_data():
         "manufacturers": manufacturers,
         "factories": factories
     }
-    
+    return updated_factories_data, consolidated_data
+
+def write_results(updated_factories_data, consolidated_data):
     # Write updated factories.json
     with open(factories_json_path, 'w') as f:
         json.dump(updated_factories_data, f, indent=2)
@@ -124,8 +124,14 @@ def process_data():
     # Write new consolidated json
     with open(output_new_json_path, 'w') as f:
         json.dump(consolidated_data, f, indent=2)
+
+def process_data(path=excel_path):
+    # Load Excel
+    df = pd.read_excel(path)
+    updated_factories_data, consolidated_data = integrate(df)
+    write_results(updated_factories_data, consolidated_data)
         
-    print(f"Successfully processed {len(factories)} total factories.")
+    print(f"Successfully processed {len(updated_factories_data['factories'])} total factories.")
     print(f"Updated {factories_json_path}")
     print(f"Created {output_new_json_path}")
 
@@ -0,0 +1,261 @@
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from aiohttp import web
+
+try:
+    import brotli
+except ImportError:  # optional: gzip alone still covers every browser
+    brotli = None
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+
+# Served under the same path the Angular app already fetches from
+URL_PREFIX = "/assets/data/"
+POLL_INTERVAL = 1.0
+HEARTBEAT_INTERVAL = 15
+
+
+def entity_key(item):
+    for field in ('id', 'factory_id', 'manufacturer_id', 'clientId', 'projectId'):
+        if isinstance(item, dict) and item.get(field) is not None:
+            return f"{field}:{item[field]}"
+    return None
+
+
+def index_entities(doc):
+    """Flatten a data document into {entity key: value} for change detection.
+
+    The war-room document is split down to individual parent groups,
+    subsidiaries, factories and hubs so a moved marker pushes one factory
+    rather than the whole tree. Other documents are split per list item when
+    items carry an id, otherwise per top-level key.
+    """
+    entities = {}
+    if isinstance(doc, dict) and 'parentGroups' in doc:
+        for key, value in doc.items():
+            if key != 'parentGroups':
+                entities[f"section:{key}"] = value
+        for group in doc['parentGroups']:
+            entities[f"parentGroup:{group['id']}"] = {k: v for k, v in group.items() if k != 'subsidiaries'}
+            for sub in group.get('subsidiaries', []):
+                entities[f"subsidiary:{sub['id']}"] = {k: v for k, v in sub.items() if k not in ('factories', 'hubs')}
+                for factory in sub.get('factories', []):
+                    entities[f"factory:{factory['id']}"] = factory
+                for hub in sub.get('hubs', []):
+                    entities[f"hub:{hub['id']}"] = hub
+        return entities
+
+    sections = doc.items() if isinstance(doc, dict) else [('items', doc)]
+    for name, value in sections:
+        keys = [entity_key(item) for item in value] if isinstance(value, list) else [None]
+        if isinstance(value, list) and all(keys):
+            for key, item in zip(keys, value):
+                entities[f"{name}:{key}"] = item
+        else:
+            entities[f"section:{name}"] = value
+    return entities
+
+
+def diff_entities(previous, current):
+    changed = {key: value for key, value in current.items() if previous.get(key) != value}
+    removed = [key for key in previous if key not in current]
+    return changed, removed
+
+
+class Artifact:
+    """One data file with its precomputed representations and strong ETags."""
+
+    def __init__(self, path):
+        self.path = path
+        self.stat_key = None
+        self.version = 0
+        self.entities = {}
+        self.bodies = {}
+
+    def reload(self):
+        """Re-read the file if it changed on disk; returns (changed, removed) or None."""
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if stat_key == self.stat_key:
+            return None
+        raw = self.path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()[:32]
+        if self.bodies and self.bodies['identity'][1] == f'"{digest}"':
+            # Touched but byte-identical: nothing to push
+            self.stat_key = stat_key
+            return None
+        try:
+            doc = json.loads(raw)
+        except json.JSONDecodeError:
+            # Caught mid-write by a non-atomic writer; pick it up on the next poll
+            return None
+
+        # Each encoding is its own representation and so gets its own ETag
+        bodies = {'identity': (raw, f'"{digest}"')}
+        bodies['gzip'] = (gzip.compress(raw, compresslevel=9, mtime=0), f'"{digest}-gz"')
+        if brotli is not None:
+            bodies['br'] = (brotli.compress(raw, quality=11), f'"{digest}-br"')
+
+        entities = index_entities(doc)
+        changes = diff_entities(self.entities, entities)
+        self.entities = entities
+        self.bodies = bodies
+        self.stat_key = stat_key
+        self.version += 1
+        return changes
+
+    def etags(self):
+        return {tag for _, tag in self.bodies.values()}
+
+    def select(self, accept_encoding):
+        accepted = {part.split(';')[0].strip().lower() for part in (accept_encoding or '').split(',')}
+        for encoding in ('br', 'gzip'):
+            if encoding in accepted and encoding in self.bodies:
+                return encoding, *self.bodies[encoding]
+        return 'identity', *self.bodies['identity']
+
+
+class LiveDataServer:
+    def __init__(self, data_dir=DATA_DIR, poll_interval=POLL_INTERVAL):
+        self.data_dir = Path(data_dir)
+        self.poll_interval = poll_interval
+        self.artifacts = {}
+        self.subscribers = set()
+        self.event_id = 0
+        self._watch_task = None
+
+    def scan(self):
+        """Load new or changed *.json files and return the change events to push."""
+        events = []
+        for path in sorted(self.data_dir.glob('*.json')):
+            artifact = self.artifacts.get(path.name)
+            if artifact is None:
+                artifact = self.artifacts[path.name] = Artifact(path)
+            changes = artifact.reload()
+            if changes is None or artifact.version == 1:
+                continue
+            changed, removed = changes
+            if changed or removed:
+                events.append({
+                    "file": path.name,
+                    "etag": artifact.bodies['identity'][1],
+                    "version": artifact.version,
+                    "changed": changed,
+                    "removed": removed,
+                })
+        return events
+
+    def disconnect(self, queue):
+        """Drop a subscriber; its stream ends once it reads the None put here."""
+        self.subscribers.discard(queue)
+        # Drain first so the sentinel always fits, however far behind the client is
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    def publish(self, event):
+        self.event_id += 1
+        message = f"id: {self.event_id}\nevent: patch\ndata: {json.dumps(event, separators=(',', ':'))}\n\n".encode()
+        for queue in list(self.subscribers):
+            if queue.full():
+                # A client that stopped reading gets dropped rather than buffered forever
+                self.disconnect(queue)
+            else:
+                queue.put_nowait(message)
+
+    async def watch(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                for event in await asyncio.to_thread(self.scan):
+                    self.publish(event)
+            except OSError as e:
+                print(f"Data scan failed: {e}", file=sys.stderr)
+
+    async def handle_file(self, request):
+        artifact = self.artifacts.get(request.match_info['name'])
+        if artifact is None or not artifact.bodies:
+            raise web.HTTPNotFound()
+        encoding, body, etag = artifact.select(request.headers.get('Accept-Encoding'))
+        headers = {
+            'ETag': etag,
+            'Cache-Control': 'no-cache',
+            'Vary': 'Accept-Encoding',
+        }
+        if_none_match = request.headers.get('If-None-Match', '')
+        candidates = {tag.strip() for tag in if_none_match.split(',')}
+        if '*' in candidates or candidates & artifact.etags():
+            return web.Response(status=304, headers=headers)
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return web.Response(body=body if request.method != 'HEAD' else None, headers=headers,
+                            content_type='application/json', charset='utf-8')
+
+    async def handle_events(self, request):
+        response = web.StreamResponse(headers={
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        })
+        await response.prepare(request)
+        queue = asyncio.Queue(maxsize=256)
+        self.subscribers.add(queue)
+        try:
+            hello = {name: a.bodies['identity'][1] for name, a in self.artifacts.items() if a.bodies}
+            await response.write(f"event: hello\ndata: {json.dumps(hello)}\n\n".encode())
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    message = b": keepalive\n\n"
+                if message is None:
+                    break
+                await response.write(message)
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            self.subscribers.discard(queue)
+        return response
+
+    async def _on_startup(self, app):
+        await asyncio.to_thread(self.scan)
+        self._watch_task = asyncio.create_task(self.watch())
+
+    async def _on_cleanup(self, app):
+        if self._watch_task:
+            self._watch_task.cancel()
+        for queue in list(self.subscribers):
+            self.disconnect(queue)
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_get(URL_PREFIX + 'events', self.handle_events)
+        app.router.add_get(URL_PREFIX + '{name:[^/]+\\.json}', self.handle_file)
+        app.on_startup.append(self._on_startup)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve map data with ETags, 304s and change push")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--data-dir', default=str(DATA_DIR))
+    parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL)
+    args = parser.parse_args(argv)
+    server = LiveDataServer(args.data_dir, args.poll_interval)
+    web.run_app(server.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+import argparse
+import hashlib
+import io
+import json
+import math
+import os
+import sys
+from pathlib import Path
+
+from factory_id_registry import _fsync_dir, atomic_write_json
+
+try:
+    from PIL import Image, features
+except ImportError:  # optional: without Pillow the atlas can't be rebuilt, but an existing one is still referenced
+    Image = None
+
+BASE_DIR = Path(__file__).resolve().parent
+PUBLIC_DIR = BASE_DIR / "public"
+DATA_DIR = PUBLIC_DIR / "assets" / "data"
+
+war_room_data_path = DATA_DIR / "fluorescence-map-data.json"
+atlas_dir = PUBLIC_DIR / "assets" / "images" / "atlas"
+manifest_path = DATA_DIR / "logo-atlas.json"
+
+# Marker logos are drawn in a MARKER_SIZE square; each scale gets its own atlas with the same layout
+MARKER_SIZE = 48
+SCALES = (1, 2)
+# Transparent gutter around each sprite so neighbours don't bleed in when the browser filters
+PADDING = 2
+# (extension, Pillow format, save options); a format is skipped when Pillow was built without it
+ENCODINGS = (
+    ("webp", "WEBP", {"quality": 90, "method": 6}),
+    ("avif", "AVIF", {"quality": 70}),
+)
+RASTER_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp"}
+
+
+def logo_urls(war_room_data):
+    """Every logo referenced by a parent group, subsidiary or factory."""
+    urls = set()
+    for group in war_room_data["parentGroups"]:
+        urls.add(group.get("logo"))
+        for sub in group["subsidiaries"]:
+            urls.add(sub.get("logo"))
+            urls.update(f.get("logo") for f in sub.get("factories", []))
+    return sorted(u for u in urls if u)
+
+
+def _source(url):
+    """(path, reason) for a logo URL; path is None when the logo can't go in the atlas."""
+    if not url.startswith("/assets/"):
+        return None, "not a local asset"
+    path = PUBLIC_DIR / url.lstrip("/")
+    if not path.is_file():
+        return None, "file not found"
+    if path.suffix.lower() not in RASTER_SUFFIXES:
+        # SVGs stay vector: they are small and scale cleanly at any marker size
+        return None, f"{path.suffix} is not a raster format"
+    return path, None
+
+
+def _fit(image, size):
+    """``image`` scaled to fit a size x size square and centred on a transparent one."""
+    image = image.convert("RGBA")
+    scale = min(size / image.width, size / image.height)
+    resized = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+                           Image.Resampling.LANCZOS)
+    square = Image.new("RGBA", (size, size))
+    square.paste(resized, ((size - resized.width) // 2, (size - resized.height) // 2))
+    return square
+
+
+def _encodings():
+    return [(ext, fmt, options) for ext, fmt, options in ENCODINGS if features.check(fmt.lower())]
+
+
+def _write_bytes(path, data):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_manifest(path=manifest_path):
+    if not Path(path).exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _manifest_files(manifest):
+    return {Path(url).name for images in (manifest or {}).get("images", {}).values() for url in images.values()}
+
+
+def _sources(urls):
+    """([(url, path)] of the atlas's logos, {url: reason} for the rest, hash of the logo bytes)."""
+    sources, skipped = [], {}
+    digest = hashlib.sha256(f"{MARKER_SIZE}:{PADDING}:{SCALES}".encode())
+    for url in urls:
+        path, reason = _source(url)
+        if path is None:
+            skipped[url] = reason
+            continue
+        sources.append((url, path))
+        digest.update(url.encode("utf-8") + b"\0" + path.read_bytes())
+    return sources, skipped, digest.hexdigest()
+
+
+def build_atlas(urls, force=False):
+    """Pack the raster logos among ``urls`` into one sprite atlas per scale and write the manifest.
+
+    Atlas file names carry a hash of their encoded bytes, so they can be served
+    with a long cache lifetime. Nothing is re-encoded when the logo files are
+    unchanged since the last build. Returns (manifest, rebuilt).
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is not installed; the logo atlas can't be rebuilt")
+    sources, skipped, source_hash = _sources(urls)
+
+    previous = load_manifest()
+    if (not force and previous and previous.get("sourceSha256") == source_hash
+            and all((atlas_dir / name).exists() for name in _manifest_files(previous))):
+        return previous, False
+
+    encodings = _encodings()
+    if not encodings:
+        raise RuntimeError("Pillow was built without WebP or AVIF support; the logo atlas can't be encoded")
+
+    # Decode every logo up front so an unreadable one is skipped, not fatal
+    fitted = {}
+    for url, path in list(sources):
+        try:
+            with Image.open(path) as image:
+                fitted[url] = {scale: _fit(image, MARKER_SIZE * scale) for scale in SCALES}
+        except (OSError, Image.DecompressionBombError) as e:
+            skipped[url] = f"unreadable image: {e}"
+            sources.remove((url, path))
+
+    cell = MARKER_SIZE + 2 * PADDING
+    cols = max(1, math.ceil(math.sqrt(len(sources))))
+    rows = max(1, math.ceil(len(sources) / cols))
+    sprites = {url: [(i % cols) * cell + PADDING, (i // cols) * cell + PADDING, MARKER_SIZE, MARKER_SIZE]
+               for i, (url, _) in enumerate(sources)}
+
+    atlases = {scale: Image.new("RGBA", (cols * cell * scale, rows * cell * scale)) for scale in SCALES}
+    for url, path in sources:
+        x, y = sprites[url][:2]
+        for scale, atlas in atlases.items():
+            atlas.paste(fitted[url][scale], (x * scale, y * scale))
+
+    atlas_dir.mkdir(parents=True, exist_ok=True)
+    images = {}
+    for scale, atlas in atlases.items():
+        images[f"{scale}x"] = {}
+        for ext, fmt, options in encodings:
+            buffer = io.BytesIO()
+            atlas.save(buffer, fmt, **options)
+            data = buffer.getvalue()
+            name = f"markers@{scale}x.{hashlib.sha256(data).hexdigest()[:12]}.{ext}"
+            if not (atlas_dir / name).exists():
+                _write_bytes(atlas_dir / name, data)
+            images[f"{scale}x"][ext] = f"/assets/images/atlas/{name}"
+    _fsync_dir(atlas_dir)
+
+    manifest = {
+        "sourceSha256": source_hash,
+        "width": cols * cell,
+        "height": rows * cell,
+        "images": images,
+        "sprites": sprites,
+        "skipped": skipped,
+    }
+    atomic_write_json(manifest_path, manifest, indent=2)
+    # Keep the previous generation too, for pages that loaded the old map data
+    keep = _manifest_files(manifest) | _manifest_files(previous)
+    for stale in atlas_dir.glob("markers@*"):
+        if stale.name not in keep:
+            stale.unlink()
+    return manifest, True
+
+
+def attach_atlas_refs(war_room_data, manifest):
+    """Point the document at the atlas: ``logoAtlas`` at the top, ``logoSprite`` [x, y, w, h] per entity.
+
+    Sprite coordinates are in 1x pixels; the 2x atlas has the same layout at
+    twice the size, so it is drawn with ``background-size`` set to the 1x
+    width and height. ``logo`` is left in place for tooltips and for logos the
+    atlas doesn't hold.
+    """
+    sprites = manifest["sprites"] if manifest else {}
+    if manifest:
+        war_room_data["logoAtlas"] = {key: manifest[key] for key in ("width", "height", "images")}
+    else:
+        war_room_data.pop("logoAtlas", None)
+    entities = []
+    for group in war_room_data["parentGroups"]:
+        entities.append(group)
+        for sub in group["subsidiaries"]:
+            entities.append(sub)
+            entities.extend(sub.get("factories", []))
+    attached = 0
+    for entity in entities:
+        sprite = sprites.get(entity.get("logo"))
+        if sprite:
+            entity["logoSprite"] = sprite
+            attached += 1
+        else:
+            entity.pop("logoSprite", None)
+    return attached
+
+
+def update_logo_atlas(war_room_data):
+    """Rebuild the atlas if the logos changed (when Pillow is available) and attach its references.
+
+    When it can't be rebuilt, the existing atlas is only reused if it was
+    built from the same logo files; otherwise markers fall back to ``logo``.
+    """
+    urls = logo_urls(war_room_data)
+    manifest = None
+    if Image is not None:
+        try:
+            manifest = build_atlas(urls)[0]
+        except RuntimeError as e:
+            print(f"Logo atlas not rebuilt: {e}", file=sys.stderr)
+    if manifest is None:
+        manifest = load_manifest()
+        if manifest and manifest.get("sourceSha256") != _sources(urls)[2]:
+            print("Logo atlas is out of date with the logo files; markers use their own logos", file=sys.stderr)
+            manifest = None
+    return attach_atlas_refs(war_room_data, manifest)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Marker logo sprite atlas for the war-room map")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build", help="pack the logos referenced by the map data into the atlas")
+    p.add_argument("--force", action="store_true", help="re-encode even if no logo changed")
+    sub.add_parser("show", help="print the current manifest")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        with open(war_room_data_path, "r", encoding="utf-8") as f:
+            war_room_data = json.load(f)
+        try:
+            manifest, rebuilt = build_atlas(logo_urls(war_room_data), force=args.force)
+        except RuntimeError as e:
+            sys.exit(str(e))
+        print(f"{'Built' if rebuilt else 'Unchanged:'} {len(manifest['sprites'])} sprites in a "
+              f"{manifest['width']}x{manifest['height']} atlas ({', '.join(manifest['images']['1x'])})")
+        for url, reason in manifest["skipped"].items():
+            print(f"  skipped {url}: {reason}")
+    else:
+        manifest = load_manifest()
+        if manifest is None:
+            sys.exit(f"No atlas yet; run: python {Path(__file__).name} build")
+        print(json.dumps(manifest, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+import argparse
+import copy
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from factory_id_registry import atomic_write_json
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+
+war_room_data_path = DATA_DIR / "fluorescence-map-data.json"
+deltas_dir = DATA_DIR / "deltas"
+
+# Deltas kept in the chain; clients further behind than this refetch the full document
+MAX_DELTAS = 50
+
+# Same identity fields live_data_server.entity_key recognises, in the same order
+ID_FIELDS = ("id", "factory_id", "manufacturer_id", "clientId", "projectId")
+
+
+def content_hash(doc):
+    # Formatting-independent, so a re-indented file is still the same version
+    canonical = json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _pointer(path, token):
+    return f"{path}/{str(token).replace('~', '~0').replace('/', '~1')}"
+
+
+def _item_keys(items):
+    """One identity per list item, or None when the list isn't uniquely keyed."""
+    keys = []
+    for item in items:
+        if not isinstance(item, dict):
+            return None
+        field = next((f for f in ID_FIELDS if item.get(f) is not None), None)
+        if field is None:
+            return None
+        keys.append((field, json.dumps(item[field])))
+    return keys if len(set(keys)) == len(keys) else None
+
+
+def _diff_list(old, new, path, ops):
+    old_keys, new_keys = _item_keys(old), _item_keys(new)
+    if old_keys is None or new_keys is None:
+        if len(old) == len(new):
+            for i, (a, b) in enumerate(zip(old, new)):
+                _diff(a, b, _pointer(path, i), ops)
+        else:
+            ops.append({"op": "replace", "path": path, "value": new})
+        return
+
+    # Match items by id: drop the ones that are gone, then walk the target order
+    # left to right. Once position i is settled no later op touches indexes <= i,
+    # so nested diffs for the item at i can be emitted straight away.
+    current = list(old_keys)
+    by_key = dict(zip(old_keys, old))
+    wanted = set(new_keys)
+    for i in range(len(current) - 1, -1, -1):
+        if current[i] not in wanted:
+            ops.append({"op": "remove", "path": _pointer(path, i)})
+            del current[i]
+    for i, (key, item) in enumerate(zip(new_keys, new)):
+        if key not in by_key:
+            ops.append({"op": "add", "path": _pointer(path, i), "value": item})
+            current.insert(i, key)
+            continue
+        j = current.index(key, i)
+        if j != i:
+            ops.append({"op": "move", "from": _pointer(path, j), "path": _pointer(path, i)})
+            current.insert(i, current.pop(j))
+        _diff(by_key[key], item, _pointer(path, i), ops)
+
+
+def _diff(old, new, path, ops):
+    if type(old) is not type(new):
+        # 1 == 1.0 and True == 1 in Python but not in JSON
+        ops.append({"op": "replace", "path": path, "value": new})
+    elif isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path, key)})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": value})
+            else:
+                _diff(old[key], value, _pointer(path, key), ops)
+    elif isinstance(new, list):
+        _diff_list(old, new, path, ops)
+    elif old != new:
+        ops.append({"op": "replace", "path": path, "value": new})
+
+
+def diff(old, new):
+    """RFC 6902 operations turning ``old`` into ``new``.
+
+    Lists whose items all carry a unique id (see ID_FIELDS) are matched by id,
+    so inserting a factory yields one ``add`` and a field edit one ``replace``
+    instead of rewriting every later position.
+    """
+    ops = []
+    _diff(old, new, "", ops)
+    return ops
+
+
+def _resolve(doc, pointer):
+    """(container, token) for the last segment of a JSON pointer."""
+    tokens = [t.replace("~1", "/").replace("~0", "~") for t in pointer.split("/")[1:]]
+    parent = doc
+    for token in tokens[:-1]:
+        parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+    last = tokens[-1]
+    if isinstance(parent, list):
+        last = len(parent) if last == "-" else int(last)
+    return parent, last
+
+
+def apply_patch(doc, ops):
+    """Apply RFC 6902 operations to a deep copy of ``doc`` and return it."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        if op["path"] == "":
+            if op["op"] in ("add", "replace"):
+                doc = copy.deepcopy(op["value"])
+                continue
+            if op["op"] == "test":
+                if doc != op["value"]:
+                    raise ValueError("test failed at the document root")
+                continue
+            raise ValueError(f"Unsupported root operation {op['op']!r}")
+        parent, key = _resolve(doc, op["path"])
+        kind = op["op"]
+        if kind == "add":
+            if isinstance(parent, list):
+                parent.insert(key, copy.deepcopy(op["value"]))
+            else:
+                parent[key] = copy.deepcopy(op["value"])
+        elif kind == "remove":
+            del parent[key]
+        elif kind == "replace":
+            parent[key] = copy.deepcopy(op["value"])
+        elif kind in ("move", "copy"):
+            src_parent, src_key = _resolve(doc, op["from"])
+            value = src_parent[src_key]
+            if kind == "move":
+                del src_parent[src_key]
+            else:
+                value = copy.deepcopy(value)
+            if isinstance(parent, list):
+                parent.insert(key, value)
+            else:
+                parent[key] = value
+        elif kind == "test":
+            if parent[key] != op["value"]:
+                raise ValueError(f"test failed at {op['path']}")
+        else:
+            raise ValueError(f"Unknown JSON Patch operation {kind!r}")
+    return doc
+
+
+class DeltaFeed:
+    """Versioned JSON Patch chain for one data document.
+
+    ``manifest.json`` names the current version and its content hash and lists
+    the retained deltas; ``v<N>.patch.json`` turns version N-1 into N. The last
+    published document is kept as ``base.json`` so the next sync diffs against
+    exactly what clients were told about, whatever else rewrote the file since.
+    """
+
+    def __init__(self, root=deltas_dir, source=war_room_data_path, max_deltas=MAX_DELTAS):
+        self.root = Path(root)
+        self.source = Path(source)
+        self.max_deltas = max_deltas
+        self.manifest_path = self.root / "manifest.json"
+        self.base_path = self.root / "base.json"
+
+    def manifest(self):
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {"file": self.source.name, "version": 0, "sha256": None, "deltas": []}
+
+    def _base(self):
+        if self.base_path.exists():
+            with open(self.base_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return None
+
+    def publish(self, doc):
+        """Record ``doc`` as the next version; returns the new delta entry, or None when no delta was written."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest = self.manifest()
+        digest = content_hash(doc)
+        if digest == manifest["sha256"]:
+            return None
+        base = self._base()
+        version = manifest["version"] + 1
+        entry = None
+        if base is not None and content_hash(base) == manifest["sha256"]:
+            ops = diff(base, doc)
+            if content_hash(apply_patch(base, ops)) != digest:
+                raise RuntimeError(f"Delta for version {version} does not reproduce the document")
+            name = f"v{version:06d}.patch.json"
+            atomic_write_json(self.root / name, {
+                "version": version, "baseVersion": manifest["version"],
+                "baseSha256": manifest["sha256"], "sha256": digest, "patch": ops,
+            }, separators=(",", ":"), ensure_ascii=False)
+            entry = {"version": version, "baseVersion": manifest["version"], "path": name,
+                     "ops": len(ops), "bytes": (self.root / name).stat().st_size}
+            manifest["deltas"].append(entry)
+        else:
+            # No usable base (first publish, or base.json lost): start a fresh chain
+            manifest["deltas"] = []
+
+        for stale in manifest["deltas"][:-self.max_deltas]:
+            (self.root / stale["path"]).unlink(missing_ok=True)
+        manifest["deltas"] = manifest["deltas"][-self.max_deltas:]
+        manifest.update(version=version, sha256=digest,
+                        oldestVersion=manifest["deltas"][0]["baseVersion"] if manifest["deltas"] else version)
+
+        # If a crash leaves base.json and the manifest disagreeing, the next publish starts a fresh chain
+        atomic_write_json(self.base_path, doc, separators=(",", ":"), ensure_ascii=False)
+        atomic_write_json(self.manifest_path, manifest, indent=2)
+        return entry
+
+    def chain(self, from_version):
+        """Delta entries that bring a client at ``from_version`` up to date, or None if it must refetch."""
+        manifest = self.manifest()
+        if from_version == manifest["version"]:
+            return []
+        deltas = [d for d in manifest["deltas"] if d["version"] > from_version]
+        if not deltas or deltas[0]["baseVersion"] != from_version:
+            return None
+        return deltas
+
+    def replay(self, doc, from_version):
+        """Bring ``doc`` (at ``from_version``) up to the current version using the chain."""
+        deltas = self.chain(from_version)
+        if deltas is None:
+            raise ValueError(f"Version {from_version} is no longer in the delta chain")
+        for entry in deltas:
+            with open(self.root / entry["path"], "r", encoding="utf-8") as f:
+                delta = json.load(f)
+            if content_hash(doc) != delta["baseSha256"]:
+                raise ValueError(f"Document does not match the base of version {delta['version']}")
+            doc = apply_patch(doc, delta["patch"])
+        return doc
+
+
+def publish_current(feed=None):
+    feed = feed or DeltaFeed()
+    with open(feed.source, "r", encoding="utf-8") as f:
+        return feed.publish(json.load(f))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JSON Patch delta feed for the war-room map document")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("publish", help="publish the current document as the next version")
+    p = sub.add_parser("diff", help="print the patch between two JSON files")
+    p.add_argument("old")
+    p.add_argument("new")
+    sub.add_parser("status")
+    args = parser.parse_args(argv)
+
+    if args.command == "publish":
+        feed = DeltaFeed()
+        previous = feed.manifest()["version"]
+        entry = publish_current(feed)
+        version = feed.manifest()["version"]
+        if version == previous:
+            print(f"Unchanged at version {version}")
+        elif entry is None:
+            print(f"Started a new delta chain at version {version}")
+        else:
+            print(f"Published version {version}: {entry['ops']} ops, {entry['bytes']} bytes")
+    elif args.command == "diff":
+        with open(args.old, "r", encoding="utf-8") as f:
+            old = json.load(f)
+        with open(args.new, "r", encoding="utf-8") as f:
+            new = json.load(f)
+        json.dump(diff(old, new), sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        manifest = DeltaFeed().manifest()
+        print(f"{manifest['file']} version {manifest['version']} ({manifest['sha256']})")
+        for entry in manifest["deltas"]:
+            print(f"  v{entry['baseVersion']} -> v{entry['version']}: {entry['ops']} ops, {entry['bytes']} bytes")
+
+
+if __name__ == "__main__":
+    main()
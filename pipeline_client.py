@@ -0,0 +1,69 @@
+import json
+import os
+import socket
+import sys
+import time
+
+# Deliberately light imports: the point of the daemon is that this process starts fast.
+# Keep the default in step with pipeline_daemon.socket_path.
+SOCKET_PATH = os.environ.get("PIPELINE_SOCKET",
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), ".pipeline.sock"))
+
+USAGE = """Usage: pipeline_client.py [--time] <command> [args]
+
+  ping                          daemon status
+  ingest [workbook.xlsx]        rebuild factories.json / manufacturer-facilities.json from the workbook
+  extract [workbook.xlsx]       print the workbook rows as JSON
+  consolidate [factory_id ...]  enrich factories.json from manufacturer-facilities.json
+  sync [factory_id ...]         merge factories into fluorescence-map-data.json
+  query <factory_id|slug>       show a factory's source record and map entry
+  shutdown                      stop the daemon"""
+
+
+def request(command, args=None, path=SOCKET_PATH):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(json.dumps({"command": command, "args": args or {}}).encode("utf-8") + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks))
+
+
+def _args(command, rest):
+    if command in ("ingest", "extract"):
+        # The daemon resolves paths against its own working directory, not ours
+        return {"path": os.path.abspath(rest[0])} if rest else {}
+    if command in ("consolidate", "sync"):
+        return {"factory_ids": [int(x) for x in rest]} if rest else {}
+    if command == "query":
+        if len(rest) != 1:
+            sys.exit(USAGE)
+        return {"factory": rest[0]}
+    return {}
+
+
+def main(argv):
+    timed = "--time" in argv
+    argv = [a for a in argv if a != "--time"]
+    if not argv or argv[0] in ("-h", "--help"):
+        sys.exit(USAGE)
+    started = time.perf_counter()
+    try:
+        response = request(argv[0], _args(argv[0], argv[1:]))
+    except (FileNotFoundError, ConnectionRefusedError):
+        sys.exit(f"No pipeline daemon on {SOCKET_PATH}; start it with: python pipeline_daemon.py")
+    elapsed = (time.perf_counter() - started) * 1000
+    if not response["ok"]:
+        sys.exit(response["error"])
+    print(json.dumps(response["result"], indent=2, ensure_ascii=False))
+    if timed:
+        print(f"round trip {elapsed:.2f} ms (daemon {response['elapsedMs']:.2f} ms)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
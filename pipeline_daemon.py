@@ -0,0 +1,207 @@
+import json
+import math
+import os
+import signal
+import socket
+import socketserver
+import sys
+import time
+from pathlib import Path
+
+from watch_data import DATA_DIR, WATCHED, PollingWatcher, WarmPipeline
+
+try:
+    # Imported once here so workbook commands don't pay for pandas on every run
+    import pandas as pd
+    from integrate_data import excel_path, integrate, write_results
+except ImportError:  # optional: everything except the workbook commands works without pandas
+    pd = None
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# Keep in step with pipeline_client.py
+socket_path = Path(os.environ.get("PIPELINE_SOCKET", BASE_DIR / ".pipeline.sock"))
+# Largest request line accepted
+MAX_REQUEST_BYTES = 1 << 20
+# Seconds a connection may sit idle before it is dropped; requests are served
+# one at a time, so an idle client would otherwise block everyone else
+IDLE_TIMEOUT = 30
+
+
+def _json_safe(value):
+    # Workbook cells come back as NaN for blanks, which JSON can't carry
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_json_safe(v) for v in value]
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+class PipelineService:
+    """Command handlers over one resident WarmPipeline.
+
+    Inputs stay parsed between requests; before each command the watched
+    files are stat'ed and anything changed on disk since the last request is
+    re-read, so edits made outside the daemon are never served stale.
+    Workbooks are cached by (path, mtime, size).
+    """
+
+    def __init__(self):
+        self.pipeline = WarmPipeline()
+        self.watcher = PollingWatcher(DATA_DIR, WATCHED)
+        self._workbooks = {}
+        self.started = time.time()
+        self.requests = 0
+
+    def refresh(self):
+        changed = self.watcher.wait(0)
+        if changed:
+            self.pipeline.reload(changed)
+        return changed
+
+    def _workbook(self, path):
+        if pd is None:
+            raise RuntimeError("pandas is not installed; workbook commands are unavailable")
+        path = Path(path or excel_path)
+        st = path.stat()
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        if key not in self._workbooks:
+            self._workbooks = {key: pd.read_excel(path)}
+        return self._workbooks[key]
+
+    # -- commands ----------------------------------------------------------
+
+    def cmd_ping(self):
+        return {"pid": os.getpid(), "uptime": round(time.time() - self.started, 1), "requests": self.requests,
+                "workbooks": pd is not None}
+
+    def cmd_extract(self, path=None):
+        # Same rows extract_excel_data.py prints, minus the import and parse
+        return _json_safe(self._workbook(path).to_dict(orient="records"))
+
+    def cmd_ingest(self, path=None):
+        df = self._workbook(path)
+        factories_data, facilities = integrate(df)
+        write_results(factories_data, facilities)
+        self.refresh()
+        return {"factories": len(factories_data["factories"]), "facilities": len(facilities)}
+
+    def cmd_consolidate(self, factory_ids=None):
+        changed = self.pipeline.consolidate(set(factory_ids) if factory_ids else None)
+        return {"changed": sorted(changed)}
+
+    def cmd_sync(self, factory_ids=None):
+        self.pipeline.sync(set(factory_ids) if factory_ids else None)
+        return {"factories": sum(len(s["factories"]) for g in self.pipeline.war_room_data["parentGroups"]
+                                 for s in g["subsidiaries"])}
+
+    def cmd_query(self, factory):
+        """Look a factory up by numeric factory_id or war-room slug (aliases resolve)."""
+        registry = self.pipeline.registry
+        if str(factory).isdigit():
+            factory_id, slug = int(factory), registry.slug_for(factory)
+        else:
+            slug = registry.resolve(factory)
+            factory_id = registry.id_for(slug)
+        record = next((f for f in self.pipeline.factories_data["factories"] if f["factory_id"] == factory_id), None)
+        map_entry = next((f for g in self.pipeline.war_room_data["parentGroups"] for s in g["subsidiaries"]
+                          for f in s["factories"] if f["id"] == slug), None)
+        if record is None and map_entry is None:
+            raise KeyError(f"No factory {factory!r}")
+        return {"factoryId": factory_id, "slug": slug, "record": record, "map": map_entry}
+
+    def handle(self, request):
+        self.requests += 1
+        command = request.get("command")
+        handler = getattr(self, f"cmd_{command}", None) if isinstance(command, str) else None
+        if handler is None:
+            raise ValueError(f"Unknown command {command!r}")
+        self.refresh()
+        return handler(**(request.get("args") or {}))
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    timeout = IDLE_TIMEOUT
+
+    def handle(self):
+        try:
+            self._serve_lines()
+        except TimeoutError:
+            pass
+
+    def _serve_lines(self):
+        # One JSON request per line; the connection may carry several
+        for line in iter(lambda: self.rfile.readline(MAX_REQUEST_BYTES), b""):
+            started = time.perf_counter()
+            try:
+                request = json.loads(line)
+                if request.get("command") == "shutdown":
+                    response = {"ok": True, "result": "shutting down"}
+                    self.server.shutdown_requested = True
+                else:
+                    response = {"ok": True, "result": self.server.service.handle(request)}
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            response["elapsedMs"] = round((time.perf_counter() - started) * 1000, 3)
+            self.wfile.write(json.dumps(response, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if self.server.shutdown_requested:
+                return
+
+
+class PipelineServer(socketserver.UnixStreamServer):
+    # Requests are handled one at a time: every command reads or writes the same resident documents
+
+    def __init__(self, path, service):
+        self.service = service
+        self.shutdown_requested = False
+        # Create the socket owner-only from the start rather than chmod it after bind
+        umask = os.umask(0o077)
+        try:
+            super().__init__(str(path), _Handler)
+        finally:
+            os.umask(umask)
+
+
+def _remove_stale_socket(path):
+    if not path.exists():
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except (ConnectionRefusedError, FileNotFoundError):
+        path.unlink()
+    else:
+        probe.close()
+        sys.exit(f"A pipeline daemon is already listening on {path}")
+
+
+def _stop(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(path=socket_path):
+    path = Path(path)
+    _remove_stale_socket(path)
+    started = time.perf_counter()
+    service = PipelineService()
+    server = PipelineServer(path, service)
+    signal.signal(signal.SIGTERM, _stop)
+    print(f"Pipeline ready on {path} in {(time.perf_counter() - started) * 1000:.0f} ms"
+          f"{'' if pd is not None else ' (no pandas: workbook commands disabled)'}")
+    try:
+        while not server.shutdown_requested:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1] if len(sys.argv) > 1 else socket_path)
@@ -0,0 +1,352 @@
+import argparse
+import bisect
+import heapq
+import json
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import accumulate, islice
+from pathlib import Path
+
+from factory_id_registry import atomic_write_json, load_registry
+from map_deltas import content_hash
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+
+war_room_data_path = DATA_DIR / "fluorescence-map-data.json"
+clients_path = DATA_DIR / "clients.json"
+projects_path = DATA_DIR / "projects.json"
+search_index_path = DATA_DIR / "search-index.json"
+
+# Static rank per kind; ties broken by activity, then by label
+KIND_RANK = {"parent": 5, "subsidiary": 4, "factory": 3, "client": 3, "project": 2}
+# Prefixes up to this length get their best documents precomputed
+TOP_PREFIX_LENGTH = 2
+TOP_RESULTS = 20
+# Share of a query token's trigrams a term must contain to count as a fuzzy match
+TRIGRAM_MATCH = 0.6
+
+
+def fold(text):
+    """Lowercase, strip accents and split off punctuation: "Nilüfer/Bursa" -> "nilufer bursa"."""
+    decomposed = unicodedata.normalize("NFKD", str(text or ""))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    # Turkish dotless ı has no decomposition; "Işık" should fold to "isik", not split
+    return " ".join(re.findall(r"[a-z0-9]+", stripped.casefold().replace("ı", "i")))
+
+
+def tokens(text):
+    return fold(text).split()
+
+
+def trigrams(term):
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+# -- documents -----------------------------------------------------------------
+
+def _is_active(status):
+    return str(status or "").strip().upper() in ("ACTIVE", "ONLINE")
+
+
+def _document(kind, entity_id, label, detail, names, texts, active):
+    """``names`` are the fields a match ranks first on (label, name, id); ``texts`` the rest."""
+    return {"kind": kind, "id": entity_id, "label": label, "detail": detail,
+            "names": [t for t in names if t], "texts": [t for t in texts if t],
+            "rank": KIND_RANK[kind] * 2 + (1 if active else 0)}
+
+
+def collect_documents(war_room_data, clients=(), projects=(), registry=None):
+    """One searchable document per parent group, subsidiary, factory, client and project."""
+    documents = []
+    factory_names = {}
+    for group in war_room_data["parentGroups"]:
+        documents.append(_document("parent", group["id"], group.get("name", group["id"]), "",
+                                   [group.get("name"), group["id"]], [], _is_active(group.get("status"))))
+        for sub in group["subsidiaries"]:
+            documents.append(_document("subsidiary", sub["id"], sub.get("name", sub["id"]), sub.get("location", ""),
+                                       [sub.get("name"), sub["id"]], [sub.get("location"), group.get("name")],
+                                       _is_active(sub.get("status"))))
+            for factory in sub.get("factories", []):
+                factory_names[factory["id"]] = factory.get("name", factory["id"])
+                place = ", ".join(p for p in (factory.get("city"), factory.get("country")) if p)
+                documents.append(_document(
+                    "factory", factory["id"], factory.get("name", factory["id"]),
+                    " · ".join(p for p in (sub.get("name"), place) if p),
+                    [factory.get("name")],
+                    [factory.get("city"), factory.get("country"), sub.get("name"),
+                     factory.get("fullAddress"), factory.get("facilityType")],
+                    _is_active(factory.get("status"))))
+    for client in clients:
+        documents.append(_document(
+            "client", client["clientId"], client.get("clientName", client["clientId"]), "",
+            [client.get("clientName"), client["clientId"]],
+            [loc.get("address") for loc in client.get("locations", [])],
+            True))
+    for project in projects:
+        slug = registry.slug_for(project["factory_id"]) if registry is not None and project.get("factory_id") is not None else None
+        factory = factory_names.get(registry.resolve(slug)) if slug else None
+        documents.append(_document(
+            "project", project["project_id"], project.get("project_name", str(project["project_id"])),
+            " · ".join(p for p in (project.get("client"), factory) if p),
+            [project.get("project_name")],
+            [project.get("client"), factory, project.get("assessment_type")],
+            str(project.get("status", "")).lower() == "active"))
+    return documents
+
+
+# -- building ------------------------------------------------------------------
+
+def _deltas(values):
+    return [b - a for a, b in zip([0] + values, values)]
+
+
+def _unique(ordered):
+    last = None
+    for value in ordered:
+        if value != last:
+            yield value
+            last = value
+
+
+def build_search_index(documents, source_hash=None):
+    """Serializable index: ranked documents, sorted term dictionary, postings and trigrams.
+
+    Documents are numbered best-first (``rank`` descending, then label), so
+    every postings list is already in rank order and the first hits of a
+    merge are the best ones. Each term has two postings lists: every
+    document containing it, and the documents that have it in a name field;
+    name matches rank ahead of matches elsewhere (an address, a city). The
+    term list is sorted, which makes a prefix a contiguous range found by
+    binary search: the flattened form of a prefix trie. Trigrams map to term
+    numbers and catch infix and misspelt tokens. Integer lists are
+    delta-encoded.
+    """
+    documents = sorted(documents, key=lambda d: (-d["rank"], fold(d["label"]), d["kind"], str(d["id"])))
+    postings, name_postings = defaultdict(set), defaultdict(set)
+    for ordinal, document in enumerate(documents):
+        for text in document["names"]:
+            for term in tokens(text):
+                name_postings[term].add(ordinal)
+                postings[term].add(ordinal)
+        for text in document["texts"]:
+            for term in tokens(text):
+                postings[term].add(ordinal)
+    terms = sorted(postings)
+    postings = [sorted(postings[t]) for t in terms]
+    name_postings = [sorted(name_postings.get(t, ())) for t in terms]
+
+    by_trigram = defaultdict(list)
+    for term_id, term in enumerate(terms):
+        for gram in sorted(trigrams(term)):
+            by_trigram[gram].append(term_id)
+
+    top = {}
+    for length in range(1, TOP_PREFIX_LENGTH + 1):
+        for prefix in sorted({t[:length] for t in terms if len(t) >= length}):
+            lo = bisect.bisect_left(terms, prefix)
+            hi = bisect.bisect_left(terms, prefix + "\uffff", lo)
+            best = list(islice(_unique(heapq.merge(*name_postings[lo:hi])), TOP_RESULTS))
+            seen = set(best)
+            rest = (i for i in _unique(heapq.merge(*postings[lo:hi])) if i not in seen)
+            top[prefix] = _deltas(best + list(islice(rest, TOP_RESULTS - len(best))))
+
+    return {
+        "sourceSha256": source_hash,
+        "documents": [[d["kind"], d["id"], d["label"], d["detail"]] for d in documents],
+        "terms": terms,
+        "postings": [_deltas(p) for p in postings],
+        "namePostings": [_deltas(p) for p in name_postings],
+        "trigrams": {gram: _deltas(ids) for gram, ids in sorted(by_trigram.items())},
+        "top": top,
+    }
+
+
+def _load(path, key=None, default=None):
+    if not Path(path).exists():
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data[key] if key else data
+
+
+def write_search_index(war_room_data, registry, path=search_index_path):
+    documents = collect_documents(
+        war_room_data,
+        clients=_load(clients_path, "clients", []),
+        projects=_load(projects_path, "projects", []),
+        registry=registry,
+    )
+    index = build_search_index(documents, content_hash(war_room_data))
+    atomic_write_json(path, index, separators=(",", ":"), ensure_ascii=False)
+    return index
+
+
+# -- querying ------------------------------------------------------------------
+
+class SearchIndex:
+    """Type-ahead lookups against a loaded search index.
+
+    Every query token must match (AND). Each token matches the terms it is a
+    prefix of; a token of three or more characters that prefixes nothing
+    falls back to terms sharing most of its trigrams. Documents whose name
+    fields match every token come first, then the rest, each in rank order.
+    Fuzzy results are ordered by how many trigrams the matched terms share
+    with the query before rank.
+    """
+
+    def __init__(self, data):
+        self.documents = data["documents"]
+        self.terms = data["terms"]
+        self.postings = [list(accumulate(p)) for p in data["postings"]]
+        self.name_postings = [list(accumulate(p)) for p in data["namePostings"]]
+        self.trigrams = {gram: list(accumulate(ids)) for gram, ids in data["trigrams"].items()}
+        self.top = {prefix: list(accumulate(ids)) for prefix, ids in data["top"].items()}
+        self._forward = {}
+
+    @classmethod
+    def load(cls, path=search_index_path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _postings(self, names):
+        return self.name_postings if names else self.postings
+
+    def _doc_terms(self, names=False):
+        # Forward index (of all fields, or of name fields only), built on the first query that needs it
+        if names not in self._forward:
+            forward = [[] for _ in self.documents]
+            for term_id, ordinals in enumerate(self._postings(names)):
+                for i in ordinals:
+                    forward[i].append(term_id)
+            self._forward[names] = forward
+        return self._forward[names]
+
+    def _prefix_terms(self, token):
+        lo = bisect.bisect_left(self.terms, token)
+        hi = bisect.bisect_left(self.terms, token + "\uffff", lo)
+        return range(lo, hi)
+
+    def _fuzzy_terms(self, token):
+        """{term id: shared trigram count} for terms sharing most of ``token``'s trigrams."""
+        grams = trigrams(token)
+        hits = Counter(term_id for gram in grams for term_id in self.trigrams.get(gram, ()))
+        needed = max(1, round(len(grams) * TRIGRAM_MATCH))
+        return {term_id: count for term_id, count in hits.items() if count >= needed}
+
+    def _hits(self, matches, limit, names=False):
+        """Ordinals of the first ``limit`` documents matching every token (in name fields if ``names``), in rank order."""
+        postings = self._postings(names)
+        if len(matches) == 1:
+            return list(islice(_unique(heapq.merge(*(postings[t] for t in matches[0]))), limit))
+
+        matches = sorted(matches, key=lambda term_ids: sum(len(postings[t]) for t in term_ids))
+        costs = [sum(len(postings[t]) for t in term_ids) for term_ids in matches]
+        if sum(costs[1:]) <= 8 * costs[0]:
+            # Comparable sizes: intersect the postings as sets
+            hits = set().union(*(postings[t] for t in matches[0]))
+            for term_ids in matches[1:]:
+                hits.intersection_update(set().union(*(postings[t] for t in term_ids)))
+            return heapq.nsmallest(limit, hits)
+        # One rare token: walk its hits in rank order and check the other
+        # tokens against each hit's own terms
+        others = [m if isinstance(m, range) else set(m) for m in matches[1:]]
+        doc_terms = self._doc_terms(names)
+        hits = (i for i in _unique(heapq.merge(*(postings[t] for t in matches[0])))
+                if all(any(t in m for t in doc_terms[i]) for m in others))
+        return list(islice(hits, limit))
+
+    def _fuzzy_search(self, matches, similarity, limit):
+        """Documents matching every token, ordered by name match, shared trigrams, then rank."""
+        hits = set().union(*(self.postings[t] for t in matches[0]))
+        for term_ids in matches[1:]:
+            hits.intersection_update(set().union(*(self.postings[t] for t in term_ids)))
+        all_terms, name_terms = self._doc_terms(), self._doc_terms(names=True)
+        token_sets = [set(m) for m in matches]
+
+        def key(i):
+            in_names = all(any(t in m for t in name_terms[i]) for m in token_sets)
+            shared = sum(max(scores.get(t, 0) for t in all_terms[i]) for scores in similarity if scores)
+            return (not in_names, -shared, i)
+
+        return heapq.nsmallest(limit, hits, key=key)
+
+    def search(self, query, limit=10):
+        words = tokens(query)
+        if not words:
+            return []
+        if len(words) == 1 and words[0] in self.top and limit <= TOP_RESULTS:
+            return [self.documents[i] for i in self.top[words[0]][:limit]]
+
+        matches, similarity = [], []
+        for word in words:
+            term_ids, scores = self._prefix_terms(word), None
+            if not term_ids and len(word) >= 3:
+                scores = self._fuzzy_terms(word)
+                term_ids = sorted(scores)
+            if not term_ids:
+                return []
+            matches.append(term_ids)
+            similarity.append(scores)
+        if any(similarity):
+            return [self.documents[i] for i in self._fuzzy_search(matches, similarity, limit)]
+
+        best = self._hits(matches, limit, names=True)
+        seen = set(best)
+        rest = [i for i in self._hits(matches, limit + len(best)) if i not in seen]
+        return [self.documents[i] for i in best + rest[:limit - len(best)]]
+
+
+def _synthetic(documents, count):
+    """``count`` documents cycled from ``documents``, each with a distinct id and name suffix."""
+    grown = []
+    for i in range(count):
+        base = documents[i % len(documents)]
+        grown.append(dict(base, id=f"{base['id']}-{i}", label=f"{base['label']} {i}",
+                          names=base["names"] + [f"unit{i}"]))
+    return grown
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prefix/trigram search index over factories, clients and projects")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="rebuild search-index.json from the current data files")
+    p = sub.add_parser("query", help="print the best matches for a type-ahead query")
+    p.add_argument("text")
+    p.add_argument("--limit", type=int, default=10)
+    p = sub.add_parser("bench", help="time queries against an in-memory index of N synthetic documents")
+    p.add_argument("count", type=int)
+    p.add_argument("queries", nargs="*", default=["n", "win", "winipeg", "nova 40ft", "karsan bursa", "unit123"])
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = write_search_index(_load(war_room_data_path), load_registry())
+        print(f"Wrote {search_index_path}: {len(index['documents'])} documents, {len(index['terms'])} terms, "
+              f"{search_index_path.stat().st_size} bytes")
+    elif args.command == "query":
+        for kind, entity_id, label, detail in SearchIndex.load().search(args.text, args.limit):
+            print(f"{kind}\t{entity_id}\t{label}" + (f"\t{detail}" if detail else ""))
+    else:
+        registry = load_registry()
+        documents = collect_documents(_load(war_room_data_path), _load(clients_path, "clients", []),
+                                      _load(projects_path, "projects", []), registry)
+        started = time.perf_counter()
+        data = build_search_index(_synthetic(documents, args.count))
+        size = len(json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+        index = SearchIndex(data)
+        print(f"Built {args.count} documents in {time.perf_counter() - started:.2f} s "
+              f"({len(index.terms)} terms, {size / 1e6:.1f} MB serialized)")
+        for query in args.queries:
+            rounds = 1000
+            index.search(query)
+            started = time.perf_counter()
+            for _ in range(rounds):
+                results = index.search(query)
+            elapsed = (time.perf_counter() - started) / rounds
+            print(f"  {query!r}: {len(results)} results in {elapsed * 1e6:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+import argparse
+import heapq
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from factory_id_registry import atomic_write_json
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+
+war_room_data_path = DATA_DIR / "fluorescence-map-data.json"
+clients_path = DATA_DIR / "clients.json"
+nearest_plants_path = DATA_DIR / "nearest-plants.json"
+
+EARTH_RADIUS_KM = 6371.0088
+LEAF_SIZE = 48
+
+
+def to_unit_vectors(lat, lon):
+    lat, lon = np.radians(np.asarray(lat, dtype=np.float64)), np.radians(np.asarray(lon, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def chord_to_km(chord):
+    # Straight-line distance between unit vectors -> great-circle (haversine) distance
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2.0, 0.0, 1.0))
+
+
+def km_to_chord(km):
+    return 2.0 * np.sin(min(km / EARTH_RADIUS_KM, np.pi) / 2.0)
+
+
+class SphereIndex:
+    """Static k-d tree over unit-sphere vectors for haversine k-NN and radius queries.
+
+    Chord length between unit vectors is monotonic in great-circle distance, so
+    ordinary Euclidean pruning on bounding boxes is exact. Nodes live in flat
+    arrays; each leaf owns a contiguous slice of the permuted point array, so a
+    leaf visit is a single vectorized distance computation.
+    """
+
+    def __init__(self, lat, lon, leaf_size=LEAF_SIZE):
+        vectors = to_unit_vectors(lat, lon).reshape(-1, 3)
+        self.size = len(vectors)
+        self.perm = np.arange(self.size)
+        starts, ends, lefts, rights, lows, highs = [], [], [], [], [], []
+
+        def new_node(start, end):
+            block = vectors[self.perm[start:end]]
+            starts.append(start)
+            ends.append(end)
+            lefts.append(-1)
+            rights.append(-1)
+            lows.append(block.min(axis=0) if end > start else np.zeros(3))
+            highs.append(block.max(axis=0) if end > start else np.zeros(3))
+            return len(starts) - 1
+
+        stack = [new_node(0, self.size)] if self.size else []
+        while stack:
+            node = stack.pop()
+            start, end = starts[node], ends[node]
+            if end - start <= leaf_size:
+                continue
+            dim = int(np.argmax(highs[node] - lows[node]))
+            mid = (start + end) // 2
+            segment = self.perm[start:end]
+            order = np.argpartition(vectors[segment, dim], mid - start)
+            self.perm[start:end] = segment[order]
+            lefts[node] = new_node(start, mid)
+            rights[node] = new_node(mid, end)
+            stack.extend((lefts[node], rights[node]))
+
+        self.points = vectors[self.perm]
+        self.starts, self.ends = starts, ends
+        self.lefts, self.rights = lefts, rights
+        self.lows, self.highs = np.asarray(lows), np.asarray(highs)
+
+    def _box_distance2(self, node, q):
+        gap = np.maximum(np.maximum(self.lows[node] - q, q - self.highs[node]), 0.0)
+        return float(gap @ gap)
+
+    def query(self, lat, lon, k=1):
+        """k nearest points to (lat, lon): list of (point index, distance km), closest first."""
+        if not self.size or k <= 0:
+            return []
+        q = to_unit_vectors(lat, lon)
+        k = min(k, self.size)
+        best = []                      # max-heap of (-d2, index)
+        frontier = [(0.0, 0)]          # min-heap of (box d2, node)
+        while frontier:
+            box_d2, node = heapq.heappop(frontier)
+            if len(best) == k and box_d2 > -best[0][0]:
+                break
+            left = self.lefts[node]
+            if left < 0:
+                start, end = self.starts[node], self.ends[node]
+                diff = self.points[start:end] - q
+                d2 = np.einsum("ij,ij->i", diff, diff)
+                if len(best) == k:
+                    candidates = np.flatnonzero(d2 < -best[0][0])
+                else:
+                    candidates = np.arange(len(d2))
+                if len(candidates) > k:
+                    candidates = candidates[np.argpartition(d2[candidates], k - 1)[:k]]
+                for i in candidates.tolist():
+                    item = (-float(d2[i]), start + i)
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+                continue
+            for child in (left, self.rights[node]):
+                child_d2 = self._box_distance2(child, q)
+                if len(best) < k or child_d2 <= -best[0][0]:
+                    heapq.heappush(frontier, (child_d2, child))
+        ranked = sorted((-neg, pos) for neg, pos in best)
+        return [(int(self.perm[pos]), float(chord_to_km(np.sqrt(d2)))) for d2, pos in ranked]
+
+    def query_radius(self, lat, lon, radius_km):
+        """All points within radius_km of (lat, lon): list of (point index, distance km), closest first."""
+        if not self.size:
+            return []
+        q = to_unit_vectors(lat, lon)
+        r2 = km_to_chord(radius_km) ** 2
+        hits_pos, hits_d2 = [], []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._box_distance2(node, q) > r2:
+                continue
+            left = self.lefts[node]
+            if left >= 0:
+                stack.extend((left, self.rights[node]))
+                continue
+            start, end = self.starts[node], self.ends[node]
+            diff = self.points[start:end] - q
+            d2 = np.einsum("ij,ij->i", diff, diff)
+            inside = np.flatnonzero(d2 <= r2)
+            hits_pos.append(start + inside)
+            hits_d2.append(d2[inside])
+        if not hits_pos:
+            return []
+        pos, d2 = np.concatenate(hits_pos), np.concatenate(hits_d2)
+        order = np.argsort(d2, kind="stable")
+        km = chord_to_km(np.sqrt(d2[order]))
+        return list(zip(self.perm[pos[order]].tolist(), km.tolist()))
+
+
+def load_entities():
+    """Factories from the map document and clients from clients.json as flat records."""
+    entities = []
+    with open(war_room_data_path, "r", encoding="utf-8") as f:
+        war_room_data = json.load(f)
+    for group in war_room_data["parentGroups"]:
+        for sub in group["subsidiaries"]:
+            for factory in sub.get("factories", []):
+                coords = factory.get("coordinates") or {}
+                lat, lon = coords.get("latitude"), coords.get("longitude")
+                # (0, 0) is the sync's placeholder for factories it could not geocode
+                if lat is None or lon is None or (lat == 0 and lon == 0):
+                    continue
+                entities.append({"kind": "factory", "id": factory["id"], "name": factory["name"],
+                                 "company": sub["name"], "city": factory.get("city"),
+                                 "latitude": lat, "longitude": lon})
+    with open(clients_path, "r", encoding="utf-8") as f:
+        for client in json.load(f)["clients"]:
+            if client.get("latitude") is None or client.get("longitude") is None:
+                continue
+            entities.append({"kind": "client", "id": client["clientId"], "name": client["clientName"],
+                             "latitude": client["latitude"], "longitude": client["longitude"]})
+    return entities
+
+
+class EntityIndex:
+    """SphereIndex per entity kind, returning entity records instead of point indices."""
+
+    def __init__(self, entities):
+        self.entities = entities
+        self.by_kind = {}
+        for kind in sorted({e["kind"] for e in entities}):
+            members = [e for e in entities if e["kind"] == kind]
+            index = SphereIndex([e["latitude"] for e in members], [e["longitude"] for e in members])
+            self.by_kind[kind] = (members, index)
+
+    def _kinds(self, kind):
+        return [kind] if kind else list(self.by_kind)
+
+    def nearest(self, lat, lon, k=5, kind=None, exclude=None):
+        results = []
+        for name in self._kinds(kind):
+            members, index = self.by_kind.get(name, ([], None))
+            if index is None:
+                continue
+            for i, km in index.query(lat, lon, k + (1 if exclude else 0)):
+                if members[i]["id"] != exclude:
+                    results.append((members[i], km))
+        return sorted(results, key=lambda r: r[1])[:k]
+
+    def within(self, lat, lon, radius_km, kind=None, exclude=None):
+        results = []
+        for name in self._kinds(kind):
+            members, index = self.by_kind.get(name, ([], None))
+            if index is None:
+                continue
+            results.extend((members[i], km) for i, km in index.query_radius(lat, lon, radius_km)
+                           if members[i]["id"] != exclude)
+        return sorted(results, key=lambda r: r[1])
+
+    def find(self, text):
+        text = text.lower()
+        for e in self.entities:
+            if e["id"].lower() == text:
+                return e
+        return next((e for e in self.entities
+                     if text in e["name"].lower() or text == (e.get("city") or "").lower()), None)
+
+
+def nearest_plant_table(entity_index, k=3):
+    """For every client, its k nearest factories with distances."""
+    table = {}
+    for client in (e for e in entity_index.entities if e["kind"] == "client"):
+        table[client["id"]] = [
+            {"factoryId": f["id"], "name": f["name"], "company": f["company"], "distanceKm": round(km, 1)}
+            for f, km in entity_index.nearest(client["latitude"], client["longitude"], k, kind="factory")
+        ]
+    return table
+
+
+def _print_results(results):
+    for entity, km in results:
+        label = f"{entity['name']} ({entity['company']})" if entity["kind"] == "factory" else entity["name"]
+        print(f"{km:9.1f} km  {entity['kind']:<7} {entity['id']:<40} {label}")
+
+
+def _origin(args, entity_index):
+    if args.of:
+        entity = entity_index.find(args.of)
+        if entity is None:
+            sys.exit(f"No factory or client matches {args.of!r}")
+        return entity["latitude"], entity["longitude"], entity["id"]
+    if args.lat is None or args.lon is None:
+        sys.exit("Give --of <id|name|city> or both --lat and --lon")
+    return args.lat, args.lon, None
+
+
+def _bench(points, queries, k):
+    rng = np.random.default_rng(1)
+    # Uniform on the sphere
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, points)))
+    lon = rng.uniform(-180, 180, points)
+    started = time.perf_counter()
+    index = SphereIndex(lat, lon)
+    print(f"Built index over {points:,} points in {time.perf_counter() - started:.2f}s")
+    q_lat = np.degrees(np.arcsin(rng.uniform(-1, 1, queries)))
+    q_lon = rng.uniform(-180, 180, queries)
+    started = time.perf_counter()
+    for a, b in zip(q_lat, q_lon):
+        index.query(a, b, k)
+    knn_us = (time.perf_counter() - started) / queries * 1e6
+    started = time.perf_counter()
+    for a, b in zip(q_lat, q_lon):
+        index.query_radius(a, b, 50)
+    radius_us = (time.perf_counter() - started) / queries * 1e6
+    print(f"k={k} nearest: {knn_us:.0f} us/query; 50 km radius: {radius_us:.0f} us/query")
+
+
+def _positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nearest-neighbour and radius queries over factories and clients")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("nearest", "within"):
+        p = sub.add_parser(name)
+        p.add_argument("--of", help="factory/client id, name or city to search around")
+        p.add_argument("--lat", type=float)
+        p.add_argument("--lon", type=float)
+        p.add_argument("--kind", choices=["factory", "client"])
+        if name == "nearest":
+            p.add_argument("-k", type=_positive_int, default=5)
+        else:
+            p.add_argument("--km", type=float, required=True)
+    p = sub.add_parser("nearest-plants", help="write the nearest-plant table for every client")
+    p.add_argument("-k", type=_positive_int, default=3)
+    p.add_argument("-o", "--output", default=str(nearest_plants_path))
+    p = sub.add_parser("bench", help="time queries over synthetic points")
+    p.add_argument("--points", type=int, default=1_000_000)
+    p.add_argument("--queries", type=int, default=2000)
+    p.add_argument("-k", type=_positive_int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        _bench(args.points, args.queries, args.k)
+        return
+
+    entity_index = EntityIndex(load_entities())
+    if args.command == "nearest":
+        lat, lon, exclude = _origin(args, entity_index)
+        _print_results(entity_index.nearest(lat, lon, args.k, args.kind, exclude))
+    elif args.command == "within":
+        lat, lon, exclude = _origin(args, entity_index)
+        _print_results(entity_index.within(lat, lon, args.km, args.kind, exclude))
+    else:
+        table = nearest_plant_table(entity_index, args.k)
+        atomic_write_json(args.output, table, indent=2, ensure_ascii=False)
+        print(f"Wrote nearest {args.k} plants for {len(table)} clients to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -119,12 +119,19 @@ export class WarRoomMapComponent implements AfterViewInit, OnDestroy {
   private readonly CLUSTER_MARKER_ANCHOR: MarkerVm['anchor'] = { width: 48, height: 48, centerX: 24, centerY: 24 };
   /** Pixel offset between parallel project routes sharing same client-factory pair */
   private readonly PARALLEL_ROUTE_OFFSET_PIXELS = 8;
+  /** Zoom bands of the pre-simplified route polylines (generate_transit_routes.py), lowest first */
+  private readonly ROUTE_POLYLINE_BANDS: { band: string; maxZoom: number }[] = [
+    { band: 'z0-3', maxZoom: 4 },
+    { band: 'z4-6', maxZoom: 7 },
+    { band: 'z7+', maxZoom: Infinity },
+  ];
   // --------------------------------------------------------------------------
 
   // Caches
   private geocodeCache = new Map<string, { latitude: number; longitude: number }>();
   private geocodeInFlight = new Map<string, Promise<{ latitude: number; longitude: number }>>();
   private logoFailureCache = new Map<string, Set<string>>();
+  private decodedPolylineCache = new Map<string, [number, number][]>();
 
   // Signals
   readonly fullscreenState = signal<boolean>(false);
@@ -351,6 +358,17 @@ export class WarRoomMapComponent implements AfterViewInit, OnDestroy {
     return this.getSelectedNode()?.city || '';
   }
 
+  /** The node's logo cut from the shared atlas (one image for every marker), unless the atlas failed to load. */
+  private getLogoSprite(node: WarRoomNode, failures?: Set<string>): MarkerVm['logoSprite'] {
+    const atlas = this.warRoomService.logoAtlas();
+    if (!atlas || !node.logoSprite) return null;
+    const images = (window.devicePixelRatio > 1 && atlas.images['2x']) || atlas.images['1x'];
+    const href = images?.['webp'] ?? Object.values(images ?? {})[0];
+    if (!href || failures?.has(href)) return null;
+    const [x, y, width, height] = node.logoSprite;
+    return { href, viewBox: `${x} ${y} ${width} ${height}`, atlasWidth: atlas.width, atlasHeight: atlas.height };
+  }
+
   private getCompanyLogoSource(node: WarRoomNode): string | null {
     const customLogo = typeof node.logo === 'string' ? node.logo.trim() : '';
     if (customLogo) {
@@ -686,12 +704,25 @@ export class WarRoomMapComponent implements AfterViewInit, OnDestroy {
       this.scheduleZoomStableEmit();
     });
 
+    // Map lifecycle mirrored onto the container so e2e tests can wait on events instead of sleeping
+    container.setAttribute('data-map-state', 'loading');
+    container.setAttribute('data-map-moves', '0');
+    let moveCount = 0;
+
+    this.mapInstance.on('movestart', () => {
+      container.setAttribute('data-map-state', 'moving');
+    });
+
     this.mapInstance.on('moveend', () => {
+      moveCount++;
+      container.setAttribute('data-map-moves', String(moveCount));
+      container.setAttribute('data-zoom', this.mapInstance!.getZoom().toFixed(2));
       if (!this.mapLoaded) return;
       this.scheduleOverlayUpdate(false);
     });
 
     this.mapInstance.on('idle', () => {
+      container.setAttribute('data-map-state', 'idle');
       if (!this.mapLoaded) return;
       this.scheduleOverlayUpdate(false);
     });
@@ -801,7 +832,7 @@ export class WarRoomMapComponent implements AfterViewInit, OnDestroy {
       markers.push(vm);
     });
 
-    const featureCollection = this.buildRouteFeatures(nodes);
+    const featureCollection = this.buildRouteFeatures(nodes, zoom);
     const routes: RouteVm[] = [];
 
     const projectRouteGroups = new Map<string, number[]>();
@@ -859,7 +890,14 @@ export class WarRoomMapComponent implements AfterViewInit, OnDestroy {
           index
         );
       }
-      const path = this.createRoutePath(startPoint, endPoint, groupIndex, groupSize);
+      // Pre-simplified arcs are projected point by point, with the ends pinned to the markers
+      const path = coords.length > 2
+        ? this.mathService.createPolylinePath([
+          startPoint,
+          ...coords.slice(1, -1).map((coord) => this.mapInstance!.project(coord)),
+          endPoint,
+        ])
+        : this.createRoutePath(startPoint, endPoint, groupIndex, groupSize);
       if (!path) return;
       const routeId = feature.properties.routeId || `route-${index}`;
       routes.push({
@@ -912,6 +950,7 @@ export class WarRoomMapComponent implements AfterViewInit, OnDestroy {
       : '';
     const fallbackLogoPath = this.assetsService.getLogoFallbackPath();
     const hasLogo = !!logoPath && logoPath !== fallbackLogoPath;
+    const logoSprite = logoSource ? this.getLogoSprite(node, failures) : null;
 
     const nodeLevel = node.level ?? 'factory';
     const isHQ = node.id === 'fleetzero' || node.name?.toLowerCase().includes('fleetzero');
@@ -957,6 +996,7 @@ export class WarRoomMapComponent implements AfterViewInit, OnDestroy {
       initials,
       hasLogo,
       logoPath,
+      logoSprite,
       isSelected,
       isHovered,
       isHub: this.isHub(node),
@@ -1534,7 +1574,21 @@ export class WarRoomMapComponent implements AfterViewInit, OnDestroy {
     return `M ${sx} ${sy} Q ${cx} ${cy} ${ex} ${ey}`;
   }
 
-  private buildRouteFeatures(nodes: WarRoomNode[]): RouteFeatureCollection {
+  /** Decoded arc for the zoom band, or null when the route carries no pre-simplified polylines. */
+  private getRoutePolyline(route: TransitRoute, zoom: number): [number, number][] | null {
+    if (!route.polylines) return null;
+    const band = this.ROUTE_POLYLINE_BANDS.find((item) => zoom < item.maxZoom)?.band;
+    const encoded = band ? route.polylines[band] : undefined;
+    if (!encoded) return null;
+    let decoded = this.decodedPolylineCache.get(encoded);
+    if (!decoded) {
+      decoded = this.mathService.decodePolyline(encoded);
+      this.decodedPolylineCache.set(encoded, decoded);
+    }
+    return decoded.length >= 2 ? decoded : null;
+  }
+
+  private buildRouteFeatures(nodes: WarRoomNode[], zoom = this.currentZoomLevel()): RouteFeatureCollection {
     const transitRoutes = this.transitRoutes();
     const rawProjectRoutes = this.projectRoutes();
     const selected = this.selectedEntity();
@@ -1675,7 +1729,7 @@ export class WarRoomMapComponent implements AfterViewInit, OnDestroy {
         type: 'Feature',
         geometry: {
           type: 'LineString',
-          coordinates: [
+          coordinates: this.getRoutePolyline(route, zoom) ?? [
             [fromCoords.longitude, fromCoords.latitude],
             [toCoords.longitude, toCoords.latitude]
           ]
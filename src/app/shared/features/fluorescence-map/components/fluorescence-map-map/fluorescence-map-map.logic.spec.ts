@@ -16,6 +16,7 @@ describe('WarRoomMapComponent logic helpers', () => {
       panToEntity: signal(null),
       hoveredEntity: signal(null),
       factories: signal([]),
+      logoAtlas: signal(null),
       setHoveredEntity: jasmine.createSpy('setHoveredEntity'),
     };
 
@@ -154,6 +155,41 @@ describe('WarRoomMapComponent logic helpers', () => {
     expect(features.features[0].properties.highlighted).toBeTrue();
   });
 
+  it('buildRouteFeatures uses the pre-simplified polyline for the zoom band', () => {
+    const nodeA = {
+      id: 'factory-1',
+      name: 'Factory One',
+      coordinates: { latitude: 38.5, longitude: -120.2 },
+      type: 'Factory',
+      status: 'ACTIVE',
+      level: 'factory',
+    } as any;
+    const nodeB = {
+      id: 'factory-2',
+      name: 'Factory Two',
+      coordinates: { latitude: 43.252, longitude: -126.453 },
+      type: 'Factory',
+      status: 'ACTIVE',
+      level: 'factory',
+    } as any;
+
+    (component as any).selectedEntity = signal(null);
+    (component as any).transitRoutes = signal([{
+      id: 'route-project-1',
+      from: 'factory-1',
+      to: 'factory-2',
+      fromCoordinates: nodeA.coordinates,
+      toCoordinates: nodeB.coordinates,
+      polylines: { 'z0-3': '_p~iF~ps|U_ulLnnqC_mqNvxq`@' },
+    }]);
+
+    const coordinates = (component as any).buildRouteFeatures([nodeA, nodeB], 2).features[0].geometry.coordinates;
+    expect(coordinates).toEqual([[-120.2, 38.5], [-120.95, 40.7], [-126.453, 43.252]]);
+    // No polyline for the band: fall back to the straight endpoints
+    const fallback = (component as any).buildRouteFeatures([nodeA, nodeB], 8).features[0].geometry.coordinates;
+    expect(fallback).toEqual([[-120.2, 38.5], [-126.453, 43.252]]);
+  });
+
   it('getEffectiveCoordinates prefers exact project-route endpoint coordinates over node/transit coordinates', () => {
     const node = {
       id: 'factory-1',
@@ -13,6 +13,8 @@ export interface MarkerVm {
     initials: string;
     hasLogo: boolean;
     logoPath: string;
+    /** Logo drawn from the shared marker atlas; logoPath is the fallback if the atlas fails to load. */
+    logoSprite: { href: string; viewBox: string; atlasWidth: number; atlasHeight: number } | null;
     isSelected: boolean;
     isHovered: boolean;
     isHub: boolean;
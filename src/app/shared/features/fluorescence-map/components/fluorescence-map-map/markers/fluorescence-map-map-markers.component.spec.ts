@@ -28,6 +28,7 @@ describe('WarRoomMapMarkersComponent', () => {
     initials: 'NO',
     hasLogo: true,
     logoPath: '/assets/images/svgs/user.svg',
+    logoSprite: null,
     isSelected: false,
     isHovered: false,
     isHub: false,
@@ -76,6 +77,20 @@ describe('WarRoomMapMarkersComponent', () => {
     expect(fallback).toBeTruthy();
   });
 
+  it('draws the logo from the shared atlas when the marker has a sprite', () => {
+    const pixelMap = new Map<string, { x: number; y: number }>();
+    pixelMap.set('node-1', { x: 100, y: 200 });
+    const logoSprite = { href: '/assets/images/atlas/markers@1x.abc.webp', viewBox: '54 2 48 48', atlasWidth: 156, atlasHeight: 52 };
+    fixture.componentRef.setInput('markers', [buildMarker({ logoSprite })]);
+    fixture.componentRef.setInput('pixelCoordinates', pixelMap);
+    fixture.detectChanges();
+
+    const viewport = fixture.nativeElement.querySelector('svg.marker-logo-image') as SVGSVGElement | null;
+    expect(viewport?.getAttribute('viewBox')).toBe('54 2 48 48');
+    expect(viewport?.querySelector('image')?.getAttribute('href')).toBe(logoSprite.href);
+    expect(fixture.nativeElement.querySelector('image[href="/assets/images/svgs/user.svg"]')).toBeNull();
+  });
+
   it('adds pinned class when marker is pinned', () => {
     const pixelMap = new Map<string, { x: number; y: number }>();
     pixelMap.set('node-1', { x: 100, y: 200 });
@@ -95,6 +95,42 @@ export class WarRoomMapMathService {
     return `M ${this.toPathNumber(start.x)} ${this.toPathNumber(start.y)} Q ${this.toPathNumber(midX)} ${this.toPathNumber(midY)} ${this.toPathNumber(end.x)} ${this.toPathNumber(end.y)}`;
   }
 
+  /** SVG path through already-projected points, e.g. a pre-simplified great-circle arc. */
+  createPolylinePath(points: { x: number; y: number }[]): string {
+    if (points.length < 2) return '';
+    return points
+      .map((point, i) => `${i === 0 ? 'M' : 'L'} ${this.toPathNumber(point.x)} ${this.toPathNumber(point.y)}`)
+      .join(' ');
+  }
+
+  /**
+   * Decode a Google encoded polyline (precision 5) into [longitude, latitude] pairs,
+   * the order GeoJSON and the map projection expect.
+   */
+  decodePolyline(encoded: string): [number, number][] {
+    const points: [number, number][] = [];
+    let index = 0;
+    let lat = 0;
+    let lng = 0;
+    const next = (): number => {
+      let result = 0;
+      let shift = 0;
+      let byte: number;
+      do {
+        byte = encoded.charCodeAt(index++) - 63;
+        result |= (byte & 0x1f) << shift;
+        shift += 5;
+      } while (byte >= 0x20 && index < encoded.length);
+      return result & 1 ? ~(result >> 1) : result >> 1;
+    };
+    while (index < encoded.length) {
+      lat += next();
+      lng += next();
+      points.push([lng / 1e5, lat / 1e5]);
+    }
+    return points;
+  }
+
   svgPointToContainerPixels(
     svgEl: SVGSVGElement | null,
     svgX: number,
@@ -272,7 +272,7 @@ export class WarRoomComponent implements OnInit, OnDestroy {
       }
     });
 
-    const preferredOrder = ['North America', 'Europe', 'Asia Pacific', 'LATAM'];
+    const preferredOrder = ['North America', 'Europe', 'Asia Pacific', 'LATAM', 'Middle East & Africa'];
     return preferredOrder.filter((region) => regionSet.has(region));
   });
 
@@ -1792,7 +1792,7 @@ export class WarRoomComponent implements OnInit, OnDestroy {
   }
 
   private getRegionForFactory(factory: FactoryLocation): string | null {
-    return this.getRegionForCountry(factory.country || factory.city);
+    return factory.region || this.getRegionForCountry(factory.country || factory.city);
   }
 
   private getRegionForCountry(value?: string): string | null {
@@ -1841,6 +1841,13 @@ export class WarRoomComponent implements OnInit, OnDestroy {
     ];
     if (matchesToken(normalized, latam)) return 'LATAM';
 
+    const middleEastAfrica = [
+      'saudi arabia', 'united arab emirates', 'uae', 'qatar', 'kuwait', 'oman', 'israel', 'jordan', 'egypt',
+      'morocco', 'algeria', 'tunisia', 'nigeria', 'kenya', 'ethiopia', 'ghana', 'south africa',
+      'riyadh', 'dubai', 'abu dhabi', 'doha', 'cairo', 'casablanca', 'lagos', 'nairobi', 'johannesburg'
+    ];
+    if (matchesToken(normalized, middleEastAfrica)) return 'Middle East & Africa';
+
     return null;
   }
 
@@ -24,6 +24,19 @@ export type ActivityStatus = 'ACTIVE' | 'INFO' | 'WARNING' | 'ERROR';
 export type SatelliteType = 'GEO' | 'LEO' | 'MEO';
 export type SatelliteConnectionStatus = 'LOCKED' | 'ACQUIRING' | 'OFFLINE';
 
+/** [x, y, width, height] in 1x atlas pixels */
+export type LogoSprite = [number, number, number, number];
+
+/**
+ * Marker logo sprite atlas written by logo_atlas.py. The 2x image has the
+ * same layout at twice the size; images are keyed by scale, then format.
+ */
+export interface LogoAtlas {
+  width: number;
+  height: number;
+  images: Record<string, Record<string, string>>; // e.g. { '1x': { webp: '/assets/images/atlas/markers@1x.<hash>.webp' } }
+}
+
 /**
  * Fleet Metrics - Aggregated counts and stability values
  */
@@ -44,6 +57,8 @@ export interface ParentGroup {
   subsidiaries: SubsidiaryCompany[];
   description?: string;
   logo?: string | ArrayBuffer;
+  /** [x, y, width, height] of the logo in the marker atlas (logoAtlas), in 1x pixels */
+  logoSprite?: LogoSprite;
 }
 
 /**
@@ -61,6 +76,8 @@ export interface SubsidiaryCompany {
   description?: string;
   location?: string;
   logo?: string | ArrayBuffer;
+  /** [x, y, width, height] of the logo in the marker atlas (logoAtlas), in 1x pixels */
+  logoSprite?: LogoSprite;
 }
 
 /**
@@ -83,9 +100,14 @@ export interface FactoryLocation {
   incidents: number;
   description?: string;
   logo?: string | ArrayBuffer;
+  /** [x, y, width, height] of the logo in the marker atlas (logoAtlas), in 1x pixels */
+  logoSprite?: LogoSprite;
   fullAddress?: string;
   facilityType?: string;
   notes?: string;
+  /** Set by assign_regions.py from the site's coordinates */
+  region?: string;
+  countryCode?: string;
 }
 
 /**
@@ -99,6 +121,8 @@ export interface Node {
   city: string;
   description?: string;
   logo?: string | ArrayBuffer;
+  /** [x, y, width, height] of the logo in the marker atlas (logoAtlas), in 1x pixels */
+  logoSprite?: LogoSprite;
   country?: string;
   coordinates: {
     latitude: number;
@@ -254,6 +278,8 @@ export interface TransitRoute {
   strokeColor?: string; // Line color
   strokeWidth?: number;
   dashArray?: string; // SVG dash array pattern (e.g., '5,5')
+  projectIds?: number[]; // Active projects served by this factory -> client route
+  polylines?: Record<string, string>; // Pre-simplified great-circle arc per zoom band ('z0-3', 'z4-6', 'z7+'), encoded polyline
 }
 
 /**
@@ -270,6 +296,7 @@ export interface WarRoomState {
   parentGroups: ParentGroup[];
   mapViewMode: MapViewMode;
   selectedEntity: FleetSelection | null;
+  logoAtlas?: LogoAtlas;
   /** @deprecated Legacy field retained for backward compatibility. */
   selectedCompanyId?: string;
   /** @deprecated Legacy field retained for backward compatibility. */
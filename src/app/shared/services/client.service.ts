@@ -10,6 +10,9 @@ export interface ApiClient {
   clientName: string;
   latitude?: number;
   longitude?: number;
+  /** Set by assign_regions.py */
+  region?: string | null;
+  countryCode?: string | null;
   locations?: { locationName: string; address: string; type: string }[];
 }
 
@@ -12,11 +12,16 @@ import {
   SubsidiaryCompany,
   FactoryLocation,
   FleetSelection,
+  LogoAtlas,
   MapViewMode,
   TransitRoute,
   WarRoomState,
 } from '../models/fluorescence-map.interface';
 
+const WAR_ROOM_DATA_URL = '/assets/data/fluorescence-map-data.json';
+// Change stream served by live_data_server.py
+const WAR_ROOM_EVENTS_URL = '/assets/data/events';
+
 @Injectable({
   providedIn: 'root',
 })
@@ -29,6 +34,7 @@ export class WarRoomService {
   private _networkThroughput = signal<NetworkThroughput | null>(null);
   private _geopoliticalHeatmap = signal<GeopoliticalHeatmap | null>(null);
   private _satelliteStatuses = signal<SatelliteStatus[]>([]);
+  private _logoAtlas = signal<LogoAtlas | null>(null);
   private _mapViewMode = signal<MapViewMode>('project');
   private _selectedEntity = signal<FleetSelection | null>(null);
   private _hoveredEntity = signal<FleetSelection | null>(null);
@@ -43,6 +49,7 @@ export class WarRoomService {
   readonly networkThroughput = this._networkThroughput.asReadonly();
   readonly geopoliticalHeatmap = this._geopoliticalHeatmap.asReadonly();
   readonly satelliteStatuses = this._satelliteStatuses.asReadonly();
+  readonly logoAtlas = this._logoAtlas.asReadonly();
   readonly mapViewMode = this._mapViewMode.asReadonly();
   readonly selectedEntity = this._selectedEntity.asReadonly();
   readonly hoveredEntity = this._hoveredEntity.asReadonly();
@@ -85,7 +92,7 @@ export class WarRoomService {
   });
 
   constructor() {
-    void this.initializeData();
+    void this.initializeData().then(() => this.followDataChanges());
   }
 
   private logDebug(message: string, ...args: unknown[]): void {
@@ -136,7 +143,7 @@ export class WarRoomService {
     const emptyState = this.getEmptyState();
 
     try {
-      const response = await this.fetchWithTimeout('/assets/data/fluorescence-map-data.json', { cache: 'no-store' });
+      const response = await this.fetchWithTimeout(WAR_ROOM_DATA_URL, { cache: 'no-cache' });
       if (!response.ok) {
         this.logWarn('Failed to load war room data. Using empty state.');
         this.applyState(emptyState);
@@ -155,14 +162,49 @@ export class WarRoomService {
     }
   }
 
-  private applyState(data: WarRoomState): void {
+  /**
+   * Reload the map document whenever live_data_server.py reports it changed.
+   * Without that server the events endpoint doesn't exist, the EventSource
+   * fails once and closes, and the map keeps the data it loaded.
+   */
+  private followDataChanges(): void {
+    if (typeof EventSource === 'undefined') return;
+    const events = new EventSource(WAR_ROOM_EVENTS_URL);
+    events.addEventListener('patch', (event) => {
+      const patch = JSON.parse((event as MessageEvent<string>).data) as { file?: string };
+      if (patch.file === WAR_ROOM_DATA_URL.split('/').pop()) {
+        void this.reloadData();
+      }
+    });
+  }
+
+  private async reloadData(): Promise<void> {
+    try {
+      const response = await this.fetchWithTimeout(WAR_ROOM_DATA_URL, { cache: 'no-cache' });
+      if (!response.ok) return;
+      const data = await response.json();
+      if (this.isValidWarRoomState(data)) {
+        // Data only: the user's selection and view mode stay as they are
+        this.applyData(data);
+      }
+    } catch (error) {
+      this.logWarn('Failed to reload war room data.', error);
+    }
+  }
+
+  private applyData(data: WarRoomState): void {
     this._transitRoutes.set(data.transitRoutes || []);
     this._activityLogs.set(data.activityLogs || []);
     this._networkMetrics.set(data.networkMetrics || this.getEmptyState().networkMetrics);
     this._networkThroughput.set(data.networkThroughput || this.getEmptyState().networkThroughput);
     this._geopoliticalHeatmap.set(data.geopoliticalHeatmap || this.getEmptyState().geopoliticalHeatmap);
     this._satelliteStatuses.set(data.satelliteStatuses || []);
+    this._logoAtlas.set(data.logoAtlas ?? null);
     this._parentGroups.set(data.parentGroups || []);
+  }
+
+  private applyState(data: WarRoomState): void {
+    this.applyData(data);
     this._mapViewMode.set(data.mapViewMode || 'project');
 
     if (data.selectedEntity) {
@@ -279,6 +321,7 @@ export class WarRoomService {
       city: 'Global Operations',
       description: group.description || `${group.name} command overview.`,
       logo: group.logo,
+      logoSprite: group.logoSprite,
       country: '',
       coordinates,
       type: 'Center',
@@ -302,6 +345,7 @@ export class WarRoomService {
       city: subsidiary.location || fallbackCity,
       description: subsidiary.description || `${subsidiary.name} regional operations.`,
       logo: subsidiary.logo,
+      logoSprite: subsidiary.logoSprite,
       country: subsidiary.factories[0]?.country || '',
       coordinates,
       type: 'Hub',
@@ -326,6 +370,7 @@ export class WarRoomService {
       city: factory.city,
       description: factory.description,
       logo: factory.logo || subsidiary?.logo,
+      logoSprite: factory.logo ? factory.logoSprite : subsidiary?.logoSprite,
       country: factory.country,
       coordinates: factory.coordinates,
       type: 'Facility',
@@ -2,18 +2,23 @@ import json
 import re
 from pathlib import Path
 
+from activity_log_store import ActivityLogStore, embed_latest
+from assign_regions import update_regions
+from facet_index import write_facet_index
+from facility_store import FacilityStore
+from factory_id_registry import derive_slug, load_registry
+from heatmap_density import update_heatmap
+from logo_atlas import update_logo_atlas
+from map_deltas import DeltaFeed
+from search_index import write_search_index
+from validate_data import check
+
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / 'public' / 'assets' / 'data'
 
 factories_path = DATA_DIR / 'factories.json'
 war_room_data_path = DATA_DIR / 'fluorescence-map-data.json'
 
-with open(factories_path, 'r', encoding='utf-8') as f:
-    factories_data = json.load(f)
-
-with open(war_room_data_path, 'r', encoding='utf-8') as f:
-    war_room_data = json.load(f)
-
 # Comprehensive Coordinate Map (Researched for all 46 sites)
 coordinate_map = {
     # Canada
@@ -93,101 +98,192 @@ subsidiary_defaults = {
     "temsa": {"name": "TEMSA", "logo": "/assets/images/TEMSA_Logo_Black.svg", "description": "Global motorcoach and transit manufacturer."}
 }
 
-parent_group = next((g for g in war_room_data['parentGroups'] if g['id'] == 'namg'), None)
-if not parent_group: exit("Parent group 'namg' not found")
-
-subsidiaries_map = {s['id']: s for s in parent_group['subsidiaries']}
-
 def clean_key(text):
     if not text: return ""
     return re.sub(r'[^a-zA-Z0-9]', '', str(text).lower().strip())
 
-# Add/Update Subsidiaries
-for m_id, s_id in manufacturer_id_map.items():
-    if s_id not in subsidiaries_map:
-        defaults = subsidiary_defaults.get(s_id, {})
-        new_subsidiary = {
-            "id": s_id, "parentGroupId": "namg", "name": defaults.get("name", s_id.upper()),
-            "status": "ACTIVE", "metrics": {"assetCount": 0, "incidentCount": 0, "syncStability": 95.0},
-            "description": defaults.get("description", ""), "location": "", "logo": defaults.get("logo"),
-            "quantumChart": {"dataPoints": [50, 60, 55, 70, 65, 80], "highlightedIndex": 5},
-            "hubs": [], "factories": []
-        }
-        parent_group['subsidiaries'].append(new_subsidiary)
-        subsidiaries_map[s_id] = new_subsidiary
-
-# Sync Factories
-for f_data in factories_data['factories']:
-    m_id = f_data.get('manufacturer_id')
-    s_id = manufacturer_id_map.get(m_id)
-    if not s_id: continue
-    
-    subsidiary = subsidiaries_map[s_id]
-    wr_factories = subsidiary['factories']
-    
-    f_name = f_data['factory_location_name']
-    city = f_data.get('city', '')
-    
-    # Deduplication/Matching logic
-    # Match by cleaned name or city
-    match_key = clean_key(f_name)
-    city_key = clean_key(city)
-    
-    existing = None
-    for wf in wr_factories:
-        wf_name_key = clean_key(wf['name'])
-        wf_city_key = clean_key(wf.get('city'))
-        if wf_name_key == match_key or (wf_city_key == city_key and city_key):
-            existing = wf
-            break
-            
-    # Coordinate lookup
-    coords = coordinate_map.get(city.lower().strip(), {"latitude": 0, "longitude": 0})
+def ensure_subsidiaries(war_room_data):
+    parent_group = next((g for g in war_room_data['parentGroups'] if g['id'] == 'namg'), None)
+    if not parent_group:
+        raise ValueError("Parent group 'namg' not found")
+
+    subsidiaries_map = {s['id']: s for s in parent_group['subsidiaries']}
+
+    # Add/Update Subsidiaries
+    for m_id, s_id in manufacturer_id_map.items():
+        if s_id not in subsidiaries_map:
+            defaults = subsidiary_defaults.get(s_id, {})
+            new_subsidiary = {
+                "id": s_id, "parentGroupId": "namg", "name": defaults.get("name", s_id.upper()),
+                "status": "ACTIVE", "metrics": {"assetCount": 0, "incidentCount": 0, "syncStability": 95.0},
+                "description": defaults.get("description", ""), "location": "", "logo": defaults.get("logo"),
+                "quantumChart": {"dataPoints": [50, 60, 55, 70, 65, 80], "highlightedIndex": 5},
+                "hubs": [], "factories": []
+            }
+            parent_group['subsidiaries'].append(new_subsidiary)
+            subsidiaries_map[s_id] = new_subsidiary
+    return subsidiaries_map
+
+def lookup_coordinates(city, f_name):
+    coords = coordinate_map.get((city or '').lower().strip(), {"latitude": 0, "longitude": 0})
     if coords['latitude'] == 0:
         for c_key, c_val in coordinate_map.items():
             if c_key in f_name.lower():
                 coords = c_val
                 break
+    # Copy: coordinate_map entries must not end up shared between factories
+    return dict(coords)
+
+def sync_factories(factories_data, war_room_data, registry, factory_ids=None):
+    """Merge factories.json records into the war-room document in place.
+
+    `factory_ids` limits the merge to those records (used by watch mode);
+    by default every factory is synced.
+    """
+    subsidiaries_map = ensure_subsidiaries(war_room_data)
+
+    # Stable IDs: factory_id -> war-room slug comes from the persistent registry
+    factory_index = {
+        wf['id']: wf
+        for sub in subsidiaries_map.values()
+        for wf in sub['factories']
+    }
+
+    # Un-jittered position of every factory the sync knows the source record for
+    canonical = {}
+
+    # Sync Factories
+    for f_data in factories_data['factories']:
+        if factory_ids is not None and f_data['factory_id'] not in factory_ids: continue
+        m_id = f_data.get('manufacturer_id')
+        s_id = manufacturer_id_map.get(m_id)
+        if not s_id: continue
+
+        subsidiary = subsidiaries_map[s_id]
+        wr_factories = subsidiary['factories']
+
+        f_id = f_data['factory_id']
+        f_name = f_data['factory_location_name']
+        city = f_data.get('city', '')
+
+        existing = None
+        slug = registry.slug_for(f_id)
+        if slug:
+            candidate = factory_index.get(registry.resolve(slug))
+            if candidate is not None and candidate.get('subsidiaryId', s_id) == s_id:
+                existing = candidate
+            elif candidate is not None:
+                # Wrong seed mapping: drop it once so the name match below can re-register the factory
+                print(f"Registry maps factory {f_id} to '{slug}' outside '{s_id}'; re-matching by name")
+                registry.release(f_id)
+                slug = None
+
+        if existing is None and not slug:
+            # Unregistered factory: fall back to matching by cleaned name or city once,
+            # then remember the result so later runs go straight to the registry.
+            match_key = clean_key(f_name)
+            city_key = clean_key(city)
+            for wf in wr_factories:
+                wf_name_key = clean_key(wf['name'])
+                wf_city_key = clean_key(wf.get('city'))
+                if wf_name_key == match_key or (wf_city_key == city_key and city_key):
+                    existing = wf
+                    break
+            if existing is not None and f_id not in registry and registry.id_for(existing['id']) is None:
+                registry.assign(f_id, existing['id'])
+
+        # Coordinate lookup
+        coords = lookup_coordinates(city, f_name)
+
+        if existing:
+            factory_obj = existing
+        else:
+            new_f_id = slug or derive_slug(s_id, f_name)
+            if f_id not in registry and registry.id_for(new_f_id) is None:
+                registry.assign(f_id, new_f_id)
+            factory_obj = {
+                "id": new_f_id, "parentGroupId": "namg", "subsidiaryId": s_id,
+                "name": f_name, "city": city or "", "country": f_data.get('country', ''),
+                "status": "ACTIVE", "syncStability": 95.0, "assets": 10, "incidents": 0,
+                "description": f_data.get('facility_type', 'Manufacturing Facility'),
+                "logo": subsidiary.get('logo')
+            }
+            wr_factories.append(factory_obj)
+            factory_index[new_f_id] = factory_obj
+
+        # Update fields
+        factory_obj['fullAddress'] = f_data.get('full_address')
+        factory_obj['facilityType'] = f_data.get('facility_type')
+        factory_obj['notes'] = f_data.get('notes')
+        factory_obj['coordinates'] = coords if coords['latitude'] != 0 else factory_obj.get('coordinates', {"latitude": 0, "longitude": 0})
+        canonical[factory_obj['id']] = dict(factory_obj['coordinates'])
+
+    # Factories a subset sync didn't touch still carry last run's jitter; start them from their source position too
+    if factory_ids is not None:
+        for f_data in factories_data['factories']:
+            slug = registry.slug_for(f_data['factory_id'])
+            coords = lookup_coordinates(f_data.get('city', ''), f_data['factory_location_name'])
+            if slug and coords['latitude'] != 0:
+                canonical.setdefault(registry.resolve(slug), coords)
+
+    # Cleanup: Ensure no factory has invalid default coordinates if possible
+    # Also avoid exact identical coordinates for different factories in same city by adding tiny offset.
+    # Offsets come from the un-jittered positions in document order, so a subset sync lands where a full one would.
+    city_factory_counts = {}
+    for group in war_room_data['parentGroups']:
+        for sub in group['subsidiaries']:
+            for fac in sub['factories']:
+                c = canonical.get(fac['id'], fac['coordinates'])
+                key = (c['latitude'], c['longitude'])
+                if key == (0, 0): continue
 
-    if existing:
-        factory_obj = existing
-    else:
-        new_f_id = f"{s_id}-{re.sub(r'[^a-zA-Z0-9]', '-', f_name.lower())}"
-        factory_obj = {
-            "id": new_f_id, "parentGroupId": "namg", "subsidiaryId": s_id,
-            "name": f_name, "city": city or "", "country": f_data.get('country', ''),
-            "status": "ACTIVE", "syncStability": 95.0, "assets": 10, "incidents": 0,
-            "description": f_data.get('facility_type', 'Manufacturing Facility'),
-            "logo": subsidiary.get('logo')
-        }
-        wr_factories.append(factory_obj)
-        
-    # Update fields
-    factory_obj['fullAddress'] = f_data.get('full_address')
-    factory_obj['facilityType'] = f_data.get('facility_type')
-    factory_obj['notes'] = f_data.get('notes')
-    factory_obj['coordinates'] = coords if coords['latitude'] != 0 else factory_obj.get('coordinates', {"latitude": 0, "longitude": 0})
-
-# Cleanup: Ensure no factory has invalid default coordinates if possible
-# Also avoid exact identical coordinates for different factories in same city by adding tiny offset
-city_factory_counts = {}
-for group in war_room_data['parentGroups']:
-    for sub in group['subsidiaries']:
-        for fac in sub['factories']:
-            c = fac['coordinates']
-            key = (c['latitude'], c['longitude'])
-            if key == (0, 0): continue
-            
-            if key in city_factory_counts:
                 # Add tiny jitter
-                jitter = 0.005 * city_factory_counts[key]
-                fac['coordinates']['latitude'] += jitter
-                fac['coordinates']['longitude'] += jitter
-                city_factory_counts[key] += 1
-            else:
-                city_factory_counts[key] = 1
+                jitter = 0.005 * city_factory_counts.get(key, 0)
+                fac['coordinates'] = {"latitude": c['latitude'] + jitter, "longitude": c['longitude'] + jitter}
+                city_factory_counts[key] = city_factory_counts.get(key, 0) + 1
+    return war_room_data
+
+def write_outputs(war_room_data, registry):
+    # The full history lives in the segmented activity log; the map payload only carries the newest entries
+    embed_latest(war_room_data, ActivityLogStore())
+    # Re-bins only the sites that moved or changed weight since the last sync
+    update_heatmap(war_room_data, registry)
+    # Markers draw their logos from one sprite atlas instead of one request per logo
+    update_logo_atlas(war_room_data)
+    # Region tags and region-index.json, which the facet index below reads
+    update_regions(war_room_data)
+    # Refuse to publish a document the map can't render
+    check(war_room_data_path.name, war_room_data)
+    with open(war_room_data_path, 'w', encoding='utf-8') as f:
+        json.dump(war_room_data, f, indent=2, ensure_ascii=False)
+    # Clients holding the previous version fetch this patch instead of the whole document
+    DeltaFeed().publish(war_room_data)
+    write_facet_index(war_room_data, registry)
+    write_search_index(war_room_data, registry)
+
+    if registry.needs_compaction():
+        registry.compact()
+    registry.write_mapping()
+    # Slugs may have been assigned or renamed by this sync
+    FacilityStore().reindex_slugs(registry)
+
+def main():
+    with open(factories_path, 'r', encoding='utf-8') as f:
+        factories_data = json.load(f)
+
+    with open(war_room_data_path, 'r', encoding='utf-8') as f:
+        war_room_data = json.load(f)
+
+    registry = load_registry()
+    try:
+        check(factories_path.name, factories_data)
+        check(war_room_data_path.name, war_room_data)
+        sync_factories(factories_data, war_room_data, registry)
+        write_outputs(war_room_data, registry)
+    except ValueError as e:
+        exit(str(e))
 
-with open(war_room_data_path, 'w', encoding='utf-8') as f:
-    json.dump(war_room_data, f, indent=2, ensure_ascii=False)
+    print("Mapping refined. Coordinates updated and jitter added for overlapping sites.")
 
-print("Mapping refined. Coordinates updated and jitter added for overlapping sites.")
+if __name__ == "__main__":
+    main()
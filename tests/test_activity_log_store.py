@@ -0,0 +1,67 @@
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from activity_log_store import ActivityLogStore, embed_latest  # noqa: E402
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def entry(i, days_ago):
+    timestamp = (NOW - timedelta(days=days_ago)).isoformat().replace("+00:00", "Z")
+    return {"id": f"log-{i}", "timestamp": timestamp, "factoryId": "f1", "description": f"entry {i}"}
+
+
+class ActivityLogStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.dir.name) / "activity-log"
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def store(self):
+        return ActivityLogStore(self.root, segment_records=4, stride=2)
+
+    def test_compaction_then_sync_does_not_bring_entries_back(self):
+        old = [entry(i, 200 + i) for i in range(8)]
+        document = {"activityLogs": list(old)}
+        embed_latest(document, self.store())
+        store = self.store()
+        self.assertEqual(store.compact(now=NOW), 8)
+        self.assertEqual(len(store), 0)
+
+        # The document still embeds the expired copies from before the compaction
+        document["activityLogs"] = list(old)
+        embed_latest(document, self.store())
+        self.assertEqual(len(self.store()), 0)
+        self.assertEqual(document["activityLogs"], [])
+
+    def test_latest_orders_by_timestamp_not_append_order(self):
+        store = self.store()
+        store.append([entry(i, i) for i in range(6)])
+        # Imported late, but older than everything already stored
+        store.append([entry(99, 30)])
+        store.append([entry(100, -1)])
+        ids = [e["id"] for e in self.store().latest(3)]
+        self.assertEqual(ids, ["log-100", "log-0", "log-1"])
+        self.assertEqual([e["id"] for e in self.store().latest(20)][-1], "log-99")
+
+    def test_segment_numbers_continue_after_a_full_expiry(self):
+        store = self.store()
+        store.append([entry(i, 200) for i in range(6)])
+        self.assertEqual([s.number for s in store.segments], [1, 2])
+        store.compact(now=NOW)
+        self.assertEqual(self.store().segments, [])
+
+        store = self.store()
+        store.append([entry(10, 1)])
+        self.assertEqual([s.number for s in store.segments], [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from assign_regions import BoundaryIndex, assign_regions  # noqa: E402
+
+
+class AssignRegionsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.index = BoundaryIndex.load()
+
+    def test_singapore_is_not_filed_under_malaysia(self):
+        war_room_data = {"parentGroups": [{"id": "g", "subsidiaries": [{"id": "s", "hubs": [], "factories": [
+            {"id": "singapore", "coordinates": {"latitude": 1.3521, "longitude": 103.8198}},
+            {"id": "johor-bahru", "coordinates": {"latitude": 1.4927, "longitude": 103.7414}},
+        ]}]}]}
+        assign_regions(war_room_data, [], self.index)
+        singapore, johor_bahru = war_room_data["parentGroups"][0]["subsidiaries"][0]["factories"]
+        self.assertEqual(singapore["countryCode"], "SGP")
+        self.assertEqual(singapore["region"], "Asia Pacific")
+        self.assertEqual(johor_bahru["countryCode"], "MYS")
+
+    def test_client_records_are_tagged(self):
+        clients = [{"clientId": "ttc", "latitude": 43.65, "longitude": -79.38},
+                   {"clientId": "nowhere", "latitude": 0.0, "longitude": -30.0}]
+        region_index = assign_regions({"parentGroups": []}, clients, self.index)
+        self.assertEqual((clients[0]["region"], clients[0]["countryCode"]), ("North America", "CAN"))
+        self.assertEqual((clients[1]["region"], clients[1]["countryCode"]), (None, None))
+        self.assertEqual(region_index["clients"]["ttc"], {"region": "North America", "countryCode": "CAN"})
+
+
+if __name__ == "__main__":
+    unittest.main()
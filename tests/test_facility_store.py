@@ -0,0 +1,82 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from facility_store import FacilityStore  # noqa: E402
+from factory_id_registry import FactoryIdRegistry  # noqa: E402
+
+
+def factories_data():
+    return {
+        "manufacturers": [{"manufacturer_id": 2, "manufacturer_name": "New Flyer"}],
+        "factories": [
+            {"factory_id": 7, "manufacturer_id": 2, "factory_location_name": "St. Cloud", "city": "St. Cloud",
+             "notes": None},
+            {"factory_id": 3, "manufacturer_id": 2, "factory_location_name": "Winnipeg", "city": "Winnipeg",
+             "notes": "Main plant — ÉV line"},
+            {"factory_id": 5, "manufacturer_id": 2, "factory_location_name": "Anniston", "city": "Anniston",
+             "notes": "Parts"},
+        ],
+    }
+
+
+class FacilityStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.dir.name)
+        registry = FactoryIdRegistry(self.root / "registry.jsonl")
+        for factory_id, slug in ((3, "new-flyer-winnipeg"), (5, "new-flyer-anniston"), (7, "new-flyer-st-cloud")):
+            registry.assign(factory_id, slug)
+        self.store = FacilityStore(self.root / "store")
+        self.store.build(factories_data(), registry)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def expected_export(self, data):
+        data["factories"].sort(key=lambda r: r["factory_id"])
+        return json.dumps(data, indent=2).encode("utf-8")
+
+    def exported(self):
+        path = self.root / "factories.json"
+        self.store.export(path)
+        return path.read_bytes()
+
+    def test_export_is_byte_identical_to_json_dump(self):
+        self.assertEqual(self.exported(), self.expected_export(factories_data()))
+        empty = FacilityStore(self.root / "empty")
+        empty.build({"manufacturers": [], "factories": []})
+        empty.export(self.root / "empty.json")
+        self.assertEqual((self.root / "empty.json").read_bytes(), json.dumps(
+            {"manufacturers": [], "factories": []}, indent=2).encode("utf-8"))
+
+    def test_patch_in_place_and_appended(self):
+        size = self.store.records_path.stat().st_size
+        self.assertEqual(self.store.patch(5, {"notes": "P"}), "in place")
+        self.assertEqual(self.store.records_path.stat().st_size, size)
+        self.assertEqual(self.store.patch(3, {"notes": "Main plant, now with a much longer note"}), "appended")
+        self.assertGreater(self.store.records_path.stat().st_size, size)
+
+        expected = factories_data()
+        by_id = {r["factory_id"]: r for r in expected["factories"]}
+        by_id[5]["notes"] = "P"
+        by_id[3]["notes"] = "Main plant, now with a much longer note"
+        reopened = FacilityStore(self.store.root)
+        self.assertEqual(reopened.get(3), by_id[3])
+        self.assertEqual(reopened.get_by_slug("new-flyer-anniston"), by_id[5])
+        self.assertEqual(list(reopened), sorted(expected["factories"], key=lambda r: r["factory_id"]))
+        self.assertEqual(self.exported(), self.expected_export(expected))
+
+    def test_unknown_factories_need_a_rebuild(self):
+        self.assertIsNone(self.store.get(4))
+        self.assertIsNone(self.store.get_by_slug("arboc-middlebury"))
+        with self.assertRaises(KeyError):
+            self.store.patch(4, {"notes": "x"})
+
+
+if __name__ == "__main__":
+    unittest.main()
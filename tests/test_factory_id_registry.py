@@ -0,0 +1,44 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from factory_id_registry import FactoryIdRegistry  # noqa: E402
+
+
+class ReleaseTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.dir.name) / "registry.jsonl"
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_release_frees_the_id_without_aliasing_the_slug(self):
+        registry = FactoryIdRegistry(self.path)
+        registry.assign(4, "new-flyer-anniston")
+        registry.release(4)
+        registry.assign(4, "arboc-middlebury")
+
+        self.assertEqual(registry.slug_for(4), "arboc-middlebury")
+        # The released slug still names its own map entry instead of redirecting
+        self.assertEqual(registry.resolve("new-flyer-anniston"), "new-flyer-anniston")
+        self.assertIsNone(registry.id_for("new-flyer-anniston"))
+        registry.assign(8, "new-flyer-anniston")
+
+    def test_release_survives_a_reload_and_compaction(self):
+        registry = FactoryIdRegistry(self.path)
+        registry.assign(4, "new-flyer-anniston")
+        registry.release(4)
+        registry.release(4)
+
+        reloaded = FactoryIdRegistry(self.path)
+        self.assertNotIn(4, reloaded)
+        reloaded.compact()
+        self.assertNotIn(4, FactoryIdRegistry(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import aiohttp  # noqa: E402
+
+import gtfs_rt_ingest as ingest  # noqa: E402
+
+GOOD = ingest.build_feed([("bus-1", 43.88, -79.44, "98"), ("bus-2", 43.85, -79.32, "99")], timestamp=1_700_000_000)
+CORRUPT = b"\x0a\xff\xff\xff\xff\x0f not a feed"
+
+
+class CorruptFeedTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.feed = ingest.StandInFeed()
+        self.feed.set_payload("/good", GOOD)
+        self.feed.set_payload("/bad", CORRUPT)
+        self.runner, self.base_url = await self.feed.start()
+        self.out_dir = tempfile.TemporaryDirectory()
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+        self.out_dir.cleanup()
+
+    async def test_corrupt_body_is_contained_and_retried(self):
+        publisher = ingest.SnapshotPublisher(self.out_dir.name)
+        good = ingest.FeedState("good", f"{self.base_url}/good")
+        bad = ingest.FeedState("bad", f"{self.base_url}/bad")
+        stop = asyncio.Event()
+        async with aiohttp.ClientSession() as session:
+            tasks = [asyncio.create_task(ingest.poll_forever(session, s, publisher, 0.05, stop)) for s in (good, bad)]
+            for _ in range(100):
+                await asyncio.sleep(0.05)
+                if good.version and bad.failures:
+                    break
+            # The bad feed recovers on its next poll instead of getting a 304
+            self.feed.set_payload("/bad", GOOD)
+            for _ in range(200):
+                await asyncio.sleep(0.05)
+                if bad.version:
+                    break
+            stop.set()
+            await asyncio.gather(*tasks)
+
+        self.assertEqual(good.version, 1)
+        self.assertTrue((Path(self.out_dir.name) / "good.json").exists())
+        self.assertEqual(bad.version, 1)
+        self.assertEqual(bad.failures, 0)
+
+    async def test_etag_kept_only_after_successful_decode(self):
+        state = ingest.FeedState("bad", f"{self.base_url}/bad")
+        async with aiohttp.ClientSession() as session:
+            with self.assertRaises(ingest.DecodeError):
+                await ingest.poll_once(session, state)
+        self.assertIsNone(state.etag)
+        self.assertIsNone(state.last_modified)
+
+    async def test_run_once_survives_a_corrupt_feed(self):
+        feeds = {"good": f"{self.base_url}/good", "bad": f"{self.base_url}/bad"}
+        states = await ingest.run(feeds, out_dir=self.out_dir.name, iterations=1)
+        by_name = {s.name: s for s in states}
+        self.assertEqual(by_name["good"].version, 1)
+        self.assertEqual(by_name["bad"].failures, 1)
+
+    async def test_publish_failure_is_logged_and_retried(self):
+        class FlakyPublisher(ingest.SnapshotPublisher):
+            failures_left = 2
+
+            def publish(self, state, delta):
+                if self.failures_left:
+                    self.failures_left -= 1
+                    raise OSError(28, "No space left on device")
+                super().publish(state, delta)
+
+        publisher = FlakyPublisher(self.out_dir.name)
+        state = ingest.FeedState("good", f"{self.base_url}/good")
+        stop = asyncio.Event()
+        async with aiohttp.ClientSession() as session:
+            task = asyncio.create_task(ingest.poll_forever(session, state, publisher, 0.01, stop))
+            for _ in range(200):
+                await asyncio.sleep(0.05)
+                if (Path(self.out_dir.name) / "good.json").exists():
+                    break
+            stop.set()
+            await task
+
+        # The feed answers 304 after the first poll; the snapshot still gets written
+        self.assertTrue((Path(self.out_dir.name) / "good.json").exists())
+        self.assertIsNone(state.unpublished)
+        self.assertEqual(state.failures, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from heatmap_density import LAYERS, HeatmapDensity  # noqa: E402
+
+
+class IncrementalUpdateTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.rng = rng
+        self.ids = np.array([f"site-{i}" for i in range(500)])
+        self.coords = np.column_stack([rng.uniform(-60, 70, 500), rng.uniform(-180, 180, 500)])
+        self.weights = rng.integers(0, 5, (500, len(LAYERS)))
+
+    def assertMatchesRebuild(self, density, ids, coords, weights):
+        fresh = HeatmapDensity(path=None)
+        fresh.rebuild(ids, coords, weights)
+        for name in fresh.cells:
+            for got, expected in zip(density.cells[name], fresh.cells[name]):
+                np.testing.assert_array_equal(got, expected, err_msg=name)
+        self.assertEqual(density.document(), fresh.document())
+        self.assertEqual(density.legacy_grid(), fresh.legacy_grid())
+
+    def test_update_equals_rebuild(self):
+        density = HeatmapDensity(path=None)
+        density.rebuild(self.ids, self.coords, self.weights)
+
+        coords, weights = self.coords.copy(), self.weights.copy()
+        coords[:40] += self.rng.normal(0, 3, (40, 2))
+        weights[40:60] = 0
+        weights[60:70] += 2
+        # Drop some sites, add new ones and shuffle the order
+        keep = np.r_[np.arange(0, 450), np.arange(480, 500)]
+        ids = np.concatenate([self.ids[keep], ["new-1", "new-2"]])
+        coords = np.concatenate([coords[keep], [[1.35, 103.8], [89.99, 179.99]]])
+        weights = np.concatenate([weights[keep], [[1, 0, 0], [1, 4, 2]]])
+        order = self.rng.permutation(len(ids))
+        ids, coords, weights = ids[order], coords[order], weights[order]
+
+        self.assertGreater(density.update(ids, coords, weights), 0)
+        self.assertMatchesRebuild(density, ids, coords, weights)
+        self.assertEqual(density.update(ids, coords, weights), 0)
+
+    def test_update_survives_a_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "density-state.npz"
+            density = HeatmapDensity(path=path)
+            density.update(self.ids, self.coords, self.weights)
+            density.save()
+
+            coords = self.coords.copy()
+            coords[::7, 1] = -coords[::7, 1]
+            reloaded = HeatmapDensity(path=path)
+            reloaded.update(self.ids, coords, self.weights)
+            self.assertMatchesRebuild(reloaded, self.ids, coords, self.weights)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import copy
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from map_deltas import DeltaFeed, apply_patch, diff  # noqa: E402
+
+
+def document():
+    factory = {"id": "new-flyer-winnipeg", "name": "Winnipeg", "coordinates": {"latitude": 49.9, "longitude": -97.1},
+               "incidents": 0, "tags": ["bus", "ev"]}
+    return {"parentGroups": [{"id": "nfi", "subsidiaries": [
+        {"id": "new-flyer", "factories": [factory, dict(factory, id="new-flyer-st-cloud", name="St. Cloud")]},
+        {"id": "mci", "factories": []},
+    ]}], "mapViewMode": "project", "a/b~c": 1}
+
+
+class DiffTest(unittest.TestCase):
+    def assertRoundTrips(self, old, new):
+        ops = diff(old, new)
+        self.assertEqual(apply_patch(old, ops), new)
+        return ops
+
+    def test_patch_roundtrip(self):
+        old = document()
+        new = copy.deepcopy(old)
+        factories = new["parentGroups"][0]["subsidiaries"][0]["factories"]
+        factories[0]["coordinates"]["latitude"] = 49.95
+        factories[1]["tags"].append("coach")
+        factories.insert(0, dict(factories[0], id="new-flyer-anniston", name="Anniston"))
+        factories.reverse()
+        new["parentGroups"][0]["subsidiaries"][1]["factories"] = [{"id": "mci-pembina", "incidents": 2}]
+        del new["mapViewMode"]
+        new["a/b~c"] = 1.0
+        new["selectedEntity"] = None
+        self.assertRoundTrips(old, new)
+        self.assertEqual(diff(new, new), [])
+
+    def test_edits_to_id_keyed_lists_stay_small(self):
+        old = document()
+        new = copy.deepcopy(old)
+        new["parentGroups"][0]["subsidiaries"][0]["factories"][1]["incidents"] = 3
+        ops = self.assertRoundTrips(old, new)
+        self.assertEqual(ops, [{"op": "replace", "value": 3,
+                                "path": "/parentGroups/0/subsidiaries/0/factories/1/incidents"}])
+
+    def test_patch_does_not_modify_its_input(self):
+        old = document()
+        snapshot = copy.deepcopy(old)
+        apply_patch(old, diff(old, {"parentGroups": []}))
+        self.assertEqual(old, snapshot)
+
+
+class DeltaFeedTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.feed = DeltaFeed(root=Path(self.dir.name) / "deltas", source=Path(self.dir.name) / "map.json")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_replay_brings_an_old_version_up_to_date(self):
+        versions = [document()]
+        self.assertIsNone(self.feed.publish(versions[0]))
+        for incidents in (1, 2, 3):
+            doc = copy.deepcopy(versions[-1])
+            doc["parentGroups"][0]["subsidiaries"][0]["factories"][0]["incidents"] = incidents
+            versions.append(doc)
+            self.assertEqual(self.feed.publish(doc)["version"], len(versions))
+
+        self.assertIsNone(self.feed.publish(copy.deepcopy(versions[-1])))
+        for version, doc in enumerate(versions, start=1):
+            self.assertEqual(self.feed.replay(json.loads(json.dumps(doc)), version), versions[-1])
+        with self.assertRaises(ValueError):
+            self.feed.replay(versions[0], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
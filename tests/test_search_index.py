@@ -0,0 +1,37 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from search_index import SearchIndex, _document, build_search_index, fold  # noqa: E402
+
+
+def index(*documents):
+    return SearchIndex(build_search_index(list(documents)))
+
+
+class SearchIndexTest(unittest.TestCase):
+    def test_fold_maps_dotless_i(self):
+        self.assertEqual(fold("Işık"), "isik")
+        self.assertEqual(fold("İstanbul"), "istanbul")
+
+    def test_name_matches_rank_before_other_fields(self):
+        search = index(
+            _document("parent", "nova-group", "Nova Group", "Bursa, Turkey", ["Nova Group"], ["Bursa"], True),
+            _document("factory", "karsan-bursa", "Bursa Assembly Campus", "Karsan · Bursa, Turkey",
+                      ["Bursa Assembly Campus"], ["Bursa"], True),
+        )
+        # The parent outranks the factory by kind, but only the factory is named Bursa
+        self.assertEqual([d[1] for d in search.search("bursa")], ["karsan-bursa", "nova-group"])
+
+    def test_fuzzy_hits_come_most_shared_trigrams_first(self):
+        search = index(
+            _document("parent", "winston", "Winston", "", ["Winston"], [], True),
+            _document("factory", "winnipeg", "Winnipeg", "", ["Winnipeg"], [], True),
+        )
+        self.assertEqual([d[1] for d in search.search("winipeg")][0], "winnipeg")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from spatial_index import EARTH_RADIUS_KM, SphereIndex  # noqa: E402
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class SphereIndexTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.lat = np.degrees(np.arcsin(rng.uniform(-1, 1, 2000)))
+        self.lon = rng.uniform(-180, 180, 2000)
+        # Small leaves so queries cross many nodes
+        self.index = SphereIndex(self.lat, self.lon, leaf_size=8)
+        # Include the antimeridian and the poles
+        self.queries = [(43.7, -79.4), (0.0, 179.9), (-12.5, -179.95), (89.9, 10.0), (-89.9, -170.0), (1.35, 103.8)]
+
+    def test_knn_matches_brute_force(self):
+        for lat, lon in self.queries:
+            distances = haversine_km(lat, lon, self.lat, self.lon)
+            expected = np.argsort(distances)[:10]
+            result = self.index.query(lat, lon, k=10)
+            self.assertEqual([i for i, _ in result], expected.tolist(), (lat, lon))
+            np.testing.assert_allclose([km for _, km in result], distances[expected], rtol=1e-9, atol=1e-6)
+
+    def test_radius_matches_brute_force(self):
+        for lat, lon in self.queries:
+            distances = haversine_km(lat, lon, self.lat, self.lon)
+            expected = np.flatnonzero(distances <= 750)
+            result = self.index.query_radius(lat, lon, 750)
+            self.assertEqual(sorted(i for i, _ in result), expected.tolist(), (lat, lon))
+            self.assertEqual([km for _, km in result], sorted(km for _, km in result))
+
+    def test_k_larger_than_the_index(self):
+        index = SphereIndex([10.0, 20.0], [30.0, 40.0])
+        self.assertEqual([i for i, _ in index.query(10.0, 30.0, k=5)], [0, 1])
+        self.assertEqual(SphereIndex([], []).query(0.0, 0.0, k=3), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
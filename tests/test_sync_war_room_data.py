@@ -0,0 +1,49 @@
+import copy
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from factory_id_registry import FactoryIdRegistry  # noqa: E402
+from sync_war_room_data import sync_factories  # noqa: E402
+
+
+def record(factory_id, name):
+    # No city, so the three plants aren't matched to each other by city; the name places them in Winnipeg
+    return {"factory_id": factory_id, "manufacturer_id": 2, "factory_location_name": name, "city": ""}
+
+
+class SubsetSyncJitterTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.registry = FactoryIdRegistry(Path(self.dir.name) / "registry.jsonl")
+        self.factories_data = {"factories": [record(1, "Winnipeg Plant A"), record(2, "Winnipeg Plant B"),
+                                               record(3, "Winnipeg Plant C")]}
+        self.war_room_data = {"parentGroups": [{"id": "namg", "subsidiaries": []}]}
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def positions(self):
+        sub = next(s for s in self.war_room_data["parentGroups"][0]["subsidiaries"] if s["id"] == "new-flyer")
+        return {f["name"]: (f["coordinates"]["latitude"], f["coordinates"]["longitude"]) for f in sub["factories"]}
+
+    def test_subset_sync_of_a_co_located_factory_matches_a_full_sync(self):
+        sync_factories(self.factories_data, self.war_room_data, self.registry)
+        full = self.positions()
+        self.assertEqual(len(set(full.values())), 3)
+
+        self.factories_data["factories"][2]["notes"] = "edited"
+        sync_factories(self.factories_data, self.war_room_data, self.registry, factory_ids={3})
+        self.assertEqual(self.positions(), full)
+
+        # Repeated full syncs don't drift either
+        expected = copy.deepcopy(full)
+        sync_factories(self.factories_data, self.war_room_data, self.registry)
+        self.assertEqual(self.positions(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
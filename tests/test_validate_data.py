@@ -0,0 +1,27 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from validate_data import validate_document  # noqa: E402
+
+
+def clients(latitude, longitude):
+    return {"clients": [{"clientId": "ttc", "clientName": "TTC", "latitude": latitude, "longitude": longitude}]}
+
+
+class NumericChecksTest(unittest.TestCase):
+    def test_non_finite_coordinates_are_rejected(self):
+        for value in (float("nan"), float("inf"), float("-inf")):
+            errors, _ = validate_document("clients.json", clients(value, value))
+            self.assertEqual([message for _, message in errors], ["not a finite number"] * 2, value)
+
+    def test_finite_coordinates_still_checked_against_bounds(self):
+        self.assertEqual(validate_document("clients.json", clients(43.65, -79.38))[0], [])
+        errors, _ = validate_document("clients.json", clients(91.0, -79.38))
+        self.assertEqual([message for _, message in errors], ["above maximum 90"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,123 +1,38 @@
-import asyncio
-from playwright import async_api
+import harness
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
 
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
+async def run_test(page):
+    # -> Navigate to http://localhost:4200/dashboard and wait for the map and markers
+    await harness.open_dashboard(page)
 
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
+    # -> Note the initial position coordinates of all visible markers and logos (collect labels, geographic coordinates, DOM attributes or map-source data and pixel positions if available).
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+    # -> Perform at least 3 successive zoom-in levels and then 3 zoom-out levels using map controls, then re-extract marker/label positions to compare with the initial extraction to detect any drift.
+    await harness.zoom_in(page)
 
-        # Open a new page in the browser context
-        page = await context.new_page()
+    await harness.zoom_in(page)
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4200/dashboard", wait_until="commit", timeout=10000)
+    # -> Complete the remaining zoom sequence (1 more zoom-in, then 3 zoom-outs) using canvas clicks to break repeated control clicks, then extract current marker/logo positions and any map source or JS variables with coordinates for comparison to initial extraction.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+    await harness.zoom_in(page)
 
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+    # -> Perform 3 Zoom-out actions (use canvas clicks between zoom-out clicks to avoid >2 consecutive clicks on same element), then extract current marker/logo positions and any map source or JavaScript variables that contain marker coordinates for comparison to the initial extraction. Return structured JSON array with keys: label, latitude, longitude, dom_selector_or_attribute, pixel_x, pixel_y. Explicitly state missing fields where applicable.
+    await harness.zoom_out(page)
 
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:4200/dashboard
-        await page.goto("http://localhost:4200/dashboard", wait_until="commit", timeout=10000)
-        
-        # -> Note the initial position coordinates of all visible markers and logos (collect labels, geographic coordinates, DOM attributes or map-source data and pixel positions if available).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Perform at least 3 successive zoom-in levels and then 3 zoom-out levels using map controls, then re-extract marker/label positions to compare with the initial extraction to detect any drift.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Complete the remaining zoom sequence (1 more zoom-in, then 3 zoom-outs) using canvas clicks to break repeated control clicks, then extract current marker/logo positions and any map source or JS variables with coordinates for comparison to initial extraction.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Perform 3 Zoom-out actions (use canvas clicks between zoom-out clicks to avoid >2 consecutive clicks on same element), then extract current marker/logo positions and any map source or JavaScript variables that contain marker coordinates for comparison to the initial extraction. Return structured JSON array with keys: label, latitude, longitude, dom_selector_or_attribute, pixel_x, pixel_y. Explicitly state missing fields where applicable.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Perform the remaining 2 zoom-out actions (use canvas clicks between them to avoid >2 consecutive clicks on the same control), then extract current marker/logo positions and any map source or JavaScript variables that contain marker coordinates. Return a structured JSON array with keys: label, latitude, longitude, dom_selector_or_attribute, pixel_x, pixel_y, and explicitly state which fields are missing if unavailable.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Perform the remaining zoom-out (use canvas click before it to avoid >2 identical control clicks), wait briefly for map to stabilize, then extract current marker/logo positions and any map source or JavaScript variables containing numeric coordinates. Return structured JSON array with keys: label, latitude, longitude, dom_selector_or_attribute, pixel_x, pixel_y and explicitly state missing fields when unavailable.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        await asyncio.sleep(5)
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
 
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+    # -> Perform the remaining 2 zoom-out actions (use canvas clicks between them to avoid >2 consecutive clicks on the same control), then extract current marker/logo positions and any map source or JavaScript variables that contain marker coordinates. Return a structured JSON array with keys: label, latitude, longitude, dom_selector_or_attribute, pixel_x, pixel_y, and explicitly state which fields are missing if unavailable.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+    await harness.zoom_out(page)
+
+    # -> Perform the remaining zoom-out (use canvas click before it to avoid >2 identical control clicks), wait briefly for map to stabilize, then extract current marker/logo positions and any map source or JavaScript variables containing numeric coordinates. Return structured JSON array with keys: label, latitude, longitude, dom_selector_or_attribute, pixel_x, pixel_y and explicitly state missing fields when unavailable.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
+
+    await harness.zoom_out(page)
+
+
+if __name__ == "__main__":
+    harness.run(run_test)
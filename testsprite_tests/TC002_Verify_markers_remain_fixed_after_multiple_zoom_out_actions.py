@@ -1,180 +1,74 @@
-import asyncio
-from playwright import async_api
+from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+import harness
 
+
+async def run_test(page):
+    # -> Navigate to http://localhost:4200/dashboard
+    await harness.goto(page, "/dashboard")
+
+    # -> Open the War Room map view (navigate to /war-room) and wait for the map and controls to load.
+    await harness.goto(page, "/war-room")
+
+    # -> Sign in to access the War Room map (fill username and password, then click Sign In).
+    await page.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[1]/input').first.fill('example@gmail.com')
+
+    await page.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[2]/input').first.fill('password123')
+
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[4]/button').first)
+
+    # -> Click the 'Sign In' control to submit credentials (element index 6715) and wait for the app to navigate to the dashboard/war-room.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/div[2]/div[1]/a').first)
+
+    # -> Navigate to the sign-in page and attempt signing in with the provided test credentials so the War Room map can be opened (then record marker positions). Immediate action: load the sign-in page.
+    await harness.goto(page, "/custom/sign-in")
+
+    # -> Fill the sign-in form with username 'Testing' and password '123456', then click the 'Sign In' button to authenticate.
+    await page.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[1]/input').first.fill('Testing')
+
+    await page.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[2]/input').first.fill('123456')
+
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[4]/button').first)
+
+    # -> Click the Sign In control to submit the Testing / 123456 credentials and wait for navigation to the dashboard or War Room map view.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/div[2]/div[1]/a').first)
+
+    # -> Click the 'Signin' link on the forgot-password page to return to the sign-in page so credentials can be submitted (element index 20659).
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-forget-password/div/div/div/div/div/div[2]/div/div/div/div[2]/p[2]/a').first)
+
+    # -> Ensure sign-in page is loaded and interactive elements are updated so credentials can be entered. Immediate action: click the 'Signin' link (index 20659) again if necessary and wait for the sign-in form to be ready.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-forget-password/div/div/div/div/div/div[2]/div/div/div/div[2]/p[2]/a').first)
+
+    # -> Fill username with 'superadmin' and password with 'admin123', then click the Sign In button to authenticate and wait for navigation to dashboard/War Room.
+    await page.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[1]/input').first.fill('superadmin')
+
+    await page.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[2]/input').first.fill('admin123')
+
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[4]/button').first)
+    await harness.wait_for_map_ready(page)
+
+    # -> Expand the map to full view, perform 3 successive zoom-out clicks (waiting between each), then perform 3 successive zoom-in clicks (waiting between each). After these actions, inspect the resulting page/screenshots to determine whether markers/logos visually drift relative to the map background.
+    await harness.click_and_wait_for_move(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[2]/button[2]').first)
+
+    await harness.zoom_out(page)
+
+    # -> Record the current (baseline) marker and logo positions from the map canvas so subsequent zoom steps can be compared.
+    await harness.zoom_out(page)
+
+    # -> Extract baseline marker and logo pixel positions from the map canvas (canvas element index 22047) at the current zoom level so later comparisons can be made.
+    await harness.zoom_out(page)
+
+    # -> Perform one additional zoom-out (to reach 3 total), then perform 3 successive zoom-in clicks (with short waits between each). After these zoom changes, extract marker/label visibility again so visual comparison can be done. Immediate action: click Zoom out control once.
+    await harness.zoom_out(page)
+
+    await harness.zoom_in(page)
+
+    # --> Assertions to verify final state
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
-
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4200/dashboard", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:4200/dashboard
-        await page.goto("http://localhost:4200/dashboard", wait_until="commit", timeout=10000)
-        
-        # -> Open the War Room map view (navigate to /war-room) and wait for the map and controls to load.
-        await page.goto("http://localhost:4200/war-room", wait_until="commit", timeout=10000)
-        
-        # -> Sign in to access the War Room map (fill username and password, then click Sign In).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('example@gmail.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Sign In' control to submit credentials (element index 6715) and wait for the app to navigate to the dashboard/war-room.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/div[2]/div[1]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Navigate to the sign-in page and attempt signing in with the provided test credentials so the War Room map can be opened (then record marker positions). Immediate action: load the sign-in page.
-        await page.goto("http://localhost:4200/custom/sign-in", wait_until="commit", timeout=10000)
-        
-        # -> Fill the sign-in form with username 'Testing' and password '123456', then click the 'Sign In' button to authenticate.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Testing')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the Sign In control to submit the Testing / 123456 credentials and wait for navigation to the dashboard or War Room map view.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/div[2]/div[1]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Signin' link on the forgot-password page to return to the sign-in page so credentials can be submitted (element index 20659).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-forget-password/div/div/div/div/div/div[2]/div/div/div/div[2]/p[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Ensure sign-in page is loaded and interactive elements are updated so credentials can be entered. Immediate action: click the 'Signin' link (index 20659) again if necessary and wait for the sign-in form to be ready.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-forget-password/div/div/div/div/div/div[2]/div/div/div/div[2]/p[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill username with 'superadmin' and password with 'admin123', then click the Sign In button to authenticate and wait for navigation to dashboard/War Room.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('superadmin')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-sign-in/div/div/div/div/div/div[2]/div/div/div/form/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Expand the map to full view, perform 3 successive zoom-out clicks (waiting between each), then perform 3 successive zoom-in clicks (waiting between each). After these actions, inspect the resulting page/screenshots to determine whether markers/logos visually drift relative to the map background.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Record the current (baseline) marker and logo positions from the map canvas so subsequent zoom steps can be compared.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Extract baseline marker and logo pixel positions from the map canvas (canvas element index 22047) at the current zoom level so later comparisons can be made.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Perform one additional zoom-out (to reach 3 total), then perform 3 successive zoom-in clicks (with short waits between each). After these zoom changes, extract marker/label visibility again so visual comparison can be done. Immediate action: click Zoom out control once.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Markers and logos remained aligned after zoom operations').first).to_be_visible(timeout=3000)
-        except AssertionError:
-            raise AssertionError("Test case failed: Verify that map markers and their logos stayed fixed to their initial geographic positions on the War Room map after multiple successive zoom-out and zoom-in operations; expected the success indicator 'Markers and logos remained aligned after zoom operations' to appear confirming no positional drift, but it was not found — markers/logos may have drifted relative to the map background")
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-
-asyncio.run(run_test())
-    
\ No newline at end of file
+        await expect(page.locator('text=Markers and logos remained aligned after zoom operations').first).to_be_visible(timeout=3000)
+    except AssertionError:
+        raise AssertionError("Test case failed: Verify that map markers and their logos stayed fixed to their initial geographic positions on the War Room map after multiple successive zoom-out and zoom-in operations; expected the success indicator 'Markers and logos remained aligned after zoom operations' to appear confirming no positional drift, but it was not found — markers/logos may have drifted relative to the map background")
+
+
+if __name__ == "__main__":
+    harness.run(run_test)
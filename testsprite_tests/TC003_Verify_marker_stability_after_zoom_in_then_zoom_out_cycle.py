@@ -1,208 +1,80 @@
-import asyncio
-from playwright import async_api
+from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+import harness
 
+
+async def run_test(page):
+    # -> Navigate to http://localhost:4200/dashboard and wait for the map and markers
+    await harness.open_dashboard(page)
+
+    # -> Click the map canvas to focus and capture initial visual state; then perform three zoom-in operations and then three zoom-out operations (ensuring not to click the same element more than twice in a row).
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
+
+    await harness.zoom_in(page)
+
+    await harness.zoom_in(page)
+
+    # -> Click the map canvas to focus, perform the final (3rd) zoom-in, then perform three zoom-outs (interleaving canvas clicks between zoom-out clicks to avoid clicking the same element more than twice consecutively).
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
+
+    await harness.zoom_in(page)
+
+    await harness.zoom_out(page)
+
+    # -> Click the map canvas to focus, then perform the remaining two zoom-out clicks (interleaving canvas clicks between zoom-out clicks to avoid clicking the same element more than twice consecutively). After that, capture/record marker/logo positions (if a UI mechanism appears) or report inability to read exact geographic coordinates.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
+
+    await harness.zoom_out(page)
+
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
+
+    # -> Perform the remaining two zoom-out clicks (interleaving a canvas click between them to avoid clicking the same element more than twice in a row). After zooming back to initial level, try to extract any DOM/JS data (variables, attributes, elements) that expose marker geographic coordinates or identifiers. If coordinates are not accessible (e.g., markers rendered solely in canvas), report inability to read exact coordinates.
+    await harness.zoom_out(page)
+
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
+
+    await harness.zoom_out(page)
+
+    # -> Click the 'Download CSV' export (index 4027) to record baseline marker/logo positions, then perform a 3x zoom-in and 3x zoom-out sequence (interleaving canvas clicks) and download CSV again for comparison.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[2]/div[1]/div[3]/div[1]/div/div[2]/div/shared-project-budget-chart/spk-apex-charts/apx-chart/div/div/div[4]/div[2]/div[3]').first)
+
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
+
+    # -> Perform another 3-level zoom-in and 3-level zoom-out sequence (interleaving canvas clicks between zoom buttons to avoid repeated-element clicks), then click Download CSV (index 4027) to capture final marker/logo positions for comparison.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
+
+    await harness.zoom_in(page)
+
+    # -> Complete the remaining 2 zoom-in clicks and 3 zoom-out clicks (interleaving canvas clicks between zoom buttons), then click 'Download CSV' (index 4027) to capture the final positions.
+    await harness.zoom_in(page)
+
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
+
+    await harness.zoom_in(page)
+
+    # -> Perform the remaining 3 zoom-out clicks (interleaving a canvas focus click between each zoom-out) to return to the original zoom level, then click 'Download CSV' (index 4027) to capture final marker/logo positions for comparison.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
+
+    await harness.zoom_out(page)
+
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
+
+    # -> Perform the remaining two zoom-out clicks (interleaving canvas focus clicks between zoom-outs) to return to the original zoom level, then click 'Download CSV' (index 4027) to capture the final marker/logo positions for comparison.
+    await harness.zoom_out(page)
+
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
+
+    await harness.zoom_out(page)
+
+    # -> Click 'Download CSV' (index 4027) to capture the final marker/logo positions, then report status. Because downloaded files are not accessible in this agent environment, request the user to provide the two CSVs (baseline and final) or enable access so the agent can compare coordinates and confirm/no-drift.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[2]/div[1]/div[3]/div[1]/div/div[2]/div/shared-project-budget-chart/spk-apex-charts/apx-chart/div/div/div[4]/div[2]/div[3]').first)
+
+    # --> Assertions to verify final state
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-
-        # Open a new page in the browser context
-        page = await context.new_page()
-
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4200/dashboard", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:4200/dashboard
-        await page.goto("http://localhost:4200/dashboard", wait_until="commit", timeout=10000)
-        
-        # -> Click the map canvas to focus and capture initial visual state; then perform three zoom-in operations and then three zoom-out operations (ensuring not to click the same element more than twice in a row).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the map canvas to focus, perform the final (3rd) zoom-in, then perform three zoom-outs (interleaving canvas clicks between zoom-out clicks to avoid clicking the same element more than twice consecutively).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the map canvas to focus, then perform the remaining two zoom-out clicks (interleaving canvas clicks between zoom-out clicks to avoid clicking the same element more than twice consecutively). After that, capture/record marker/logo positions (if a UI mechanism appears) or report inability to read exact geographic coordinates.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Perform the remaining two zoom-out clicks (interleaving a canvas click between them to avoid clicking the same element more than twice in a row). After zooming back to initial level, try to extract any DOM/JS data (variables, attributes, elements) that expose marker geographic coordinates or identifiers. If coordinates are not accessible (e.g., markers rendered solely in canvas), report inability to read exact coordinates.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Download CSV' export (index 4027) to record baseline marker/logo positions, then perform a 3x zoom-in and 3x zoom-out sequence (interleaving canvas clicks) and download CSV again for comparison.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[2]/div[1]/div[3]/div[1]/div/div[2]/div/shared-project-budget-chart/spk-apex-charts/apx-chart/div/div/div[4]/div[2]/div[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Perform another 3-level zoom-in and 3-level zoom-out sequence (interleaving canvas clicks between zoom buttons to avoid repeated-element clicks), then click Download CSV (index 4027) to capture final marker/logo positions for comparison.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Complete the remaining 2 zoom-in clicks and 3 zoom-out clicks (interleaving canvas clicks between zoom buttons), then click 'Download CSV' (index 4027) to capture the final positions.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Perform the remaining 3 zoom-out clicks (interleaving a canvas focus click between each zoom-out) to return to the original zoom level, then click 'Download CSV' (index 4027) to capture final marker/logo positions for comparison.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Perform the remaining two zoom-out clicks (interleaving canvas focus clicks between zoom-outs) to return to the original zoom level, then click 'Download CSV' (index 4027) to capture the final marker/logo positions for comparison.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/app-war-room-map-controls/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click 'Download CSV' (index 4027) to capture the final marker/logo positions, then report status. Because downloaded files are not accessible in this agent environment, request the user to provide the two CSVs (baseline and final) or enable access so the agent can compare coordinates and confirm/no-drift.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[2]/div[1]/div[3]/div[1]/div/div[2]/div/shared-project-budget-chart/spk-apex-charts/apx-chart/div/div/div[4]/div[2]/div[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Markers and logos restored to original coordinates').first).to_be_visible(timeout=3000)
-        except AssertionError:
-            raise AssertionError("Test case failed: The test attempted to verify that after zooming in three levels and then zooming back out to the original level all map markers and logos returned exactly to their initial geographic coordinates with no cumulative drift. The expected confirmation text 'Markers and logos restored to original coordinates' was not found, indicating markers/logos may have drifted or the application failed to report successful restoration.")
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-
-asyncio.run(run_test())
-    
\ No newline at end of file
+        await expect(page.locator('text=Markers and logos restored to original coordinates').first).to_be_visible(timeout=3000)
+    except AssertionError:
+        raise AssertionError("Test case failed: The test attempted to verify that after zooming in three levels and then zooming back out to the original level all map markers and logos returned exactly to their initial geographic coordinates with no cumulative drift. The expected confirmation text 'Markers and logos restored to original coordinates' was not found, indicating markers/logos may have drifted or the application failed to report successful restoration.")
+
+
+if __name__ == "__main__":
+    harness.run(run_test)
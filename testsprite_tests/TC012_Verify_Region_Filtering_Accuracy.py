@@ -1,85 +1,26 @@
-import asyncio
-from playwright import async_api
+from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+import harness
 
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+async def run_test(page):
+    # -> Navigate to http://localhost:4200/dashboard and wait for the map and markers
+    await harness.open_dashboard(page)
 
-        # Open a new page in the browser context
-        page = await context.new_page()
+    # -> Open the filters panel by clicking the 'Filter' button so region options become visible.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[1]/button').first)
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4200/dashboard", wait_until="commit", timeout=10000)
+    # -> Select the 'North America' region checkbox, click 'Close Filters', wait for map update, then extract page content to verify presence of Canada/USA/Mexico and absence of Turkey/Germany.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[3]/div[2]/div[3]/div/div[1]/input').first)
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[3]/div[2]/div[4]/button[1]').first)
 
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:4200/dashboard
-        await page.goto("http://localhost:4200/dashboard", wait_until="commit", timeout=10000)
-        
-        # -> Open the filters panel by clicking the 'Filter' button so region options become visible.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Select the 'North America' region checkbox, click 'Close Filters', wait for map update, then extract page content to verify presence of Canada/USA/Mexico and absence of Turkey/Germany.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[3]/div[2]/div[3]/div/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[3]/div[2]/div[4]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Canada').first).to_be_visible(timeout=3000)
-        except AssertionError:
-            raise AssertionError("Test case failed: Filtering by 'North America' was expected to display nodes for Canada, USA, and Mexico and hide non-North America nodes (e.g., Turkey, Germany), but the Canada marker was not visible after applying the filter — the region filter did not update the map as expected.")
-        await asyncio.sleep(5)
+    # --> Assertions to verify final state
+    try:
+        await expect(page.locator('text=Canada').first).to_be_visible(timeout=3000)
+    except AssertionError:
+        raise AssertionError("Test case failed: Filtering by 'North America' was expected to display nodes for Canada, USA, and Mexico and hide non-North America nodes (e.g., Turkey, Germany), but the Canada marker was not visible after applying the filter — the region filter did not update the map as expected.")
 
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    harness.run(run_test)
@@ -1,122 +1,40 @@
-import asyncio
-from playwright import async_api
+import harness
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
 
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
+async def run_test(page):
+    # -> Navigate to http://localhost:4200/dashboard and wait for the map and markers
+    await harness.open_dashboard(page)
 
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
+    # -> Open the filters panel by clicking the 'Filter' button so the Status (Active/Inactive) pills become available.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[1]/button').first)
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+    # -> Click the 'Active' status pill so the map updates to show only active markers (verify instantaneous filtering next).
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[3]/div[2]/div[2]/div/button[2]').first)
 
-        # Open a new page in the browser context
-        page = await context.new_page()
+    # -> Click the 'Inactive' status pill so the map updates to show only inactive markers (then verify the UI updates instantly).
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[3]').first)
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4200/dashboard", wait_until="commit", timeout=10000)
+    # -> Click the 'Active' status pill now to verify the map updates instantly to show only active markers (confirm by checking the active-filters indicator and that map markers update).
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[2]').first)
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+    # -> Verify that 'Active' filtering is applied (confirm button [788] pressed=true, 'Active Only' text present, and map canvas [1195] shows markers), then click 'Inactive' (button [790]) and verify 'Inactive' filtering (button [790] pressed=true, 'Inactive' text present, and map canvas [1195] updates).
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[3]').first)
 
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+    # -> Click the 'Active' status pill (index 788), verify the UI shows 'Active Only' and the map canvas is present and active-only markers are visible; then click the 'Inactive' status pill (index 790) and verify 'Inactive Only' and map updates to show inactive markers.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[2]').first)
 
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:4200/dashboard
-        await page.goto("http://localhost:4200/dashboard", wait_until="commit", timeout=10000)
-        
-        # -> Open the filters panel by clicking the 'Filter' button so the Status (Active/Inactive) pills become available.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Active' status pill so the map updates to show only active markers (verify instantaneous filtering next).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[3]/div[2]/div[2]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Inactive' status pill so the map updates to show only inactive markers (then verify the UI updates instantly).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Active' status pill now to verify the map updates instantly to show only active markers (confirm by checking the active-filters indicator and that map markers update).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Verify that 'Active' filtering is applied (confirm button [788] pressed=true, 'Active Only' text present, and map canvas [1195] shows markers), then click 'Inactive' (button [790]) and verify 'Inactive' filtering (button [790] pressed=true, 'Inactive' text present, and map canvas [1195] updates).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Active' status pill (index 788), verify the UI shows 'Active Only' and the map canvas is present and active-only markers are visible; then click the 'Inactive' status pill (index 790) and verify 'Inactive Only' and map updates to show inactive markers.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> 1) Extract page content now to verify Active-only filter (pressed state evidence, exact 'Active Only' filter text, presence of map canvas, and list any visible 'ACTIVE'/'INACTIVE'/'Offline' snippets). 2) Click the 'Inactive' status pill (index 790). 3) Wait 1s for UI to update. 4) Extract page content again to verify Inactive-only filter (pressed state evidence, exact 'Inactive Only' filter text, map presence, and list any 'ACTIVE'/'INACTIVE'/'Offline' snippets).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> 1) Click the 'Active' status pill (index 788) and verify Active-only filtering via page text and map canvas content extraction. 2) Click the 'Inactive' status pill (index 790) and verify Inactive-only filtering via extraction.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Extract page content (without changing page) to verify Active-only filter state (pressed evidence for button index 788, exact 'Active Only' filter text, presence of map canvas index 1195 and its aria-label/title, and list any snippets containing keywords ACTIVE/INACTIVE/Inactive/Offline). Then click the 'Inactive' status pill (index 790), wait 1s and extract page content again to verify Inactive-only filter state (pressed evidence for index 790, exact 'Inactive Only' filter text, map canvas presence, and keyword snippets).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Active' status pill (index 788), wait 1s, extract page content to verify Active-only filter (pressed evidence, 'Active Only' text, map canvas presence, and any keyword snippets). Then click the 'Inactive' pill (index 790), wait 1s, and extract page content to verify Inactive-only filter similarly.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        await asyncio.sleep(5)
+    # -> 1) Extract page content now to verify Active-only filter (pressed state evidence, exact 'Active Only' filter text, presence of map canvas, and list any visible 'ACTIVE'/'INACTIVE'/'Offline' snippets). 2) Click the 'Inactive' status pill (index 790). 3) Wait 1s for UI to update. 4) Extract page content again to verify Inactive-only filter (pressed state evidence, exact 'Inactive Only' filter text, map presence, and list any 'ACTIVE'/'INACTIVE'/'Offline' snippets).
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[3]').first)
 
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+    # -> 1) Click the 'Active' status pill (index 788) and verify Active-only filtering via page text and map canvas content extraction. 2) Click the 'Inactive' status pill (index 790) and verify Inactive-only filtering via extraction.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[2]').first)
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+    # -> Extract page content (without changing page) to verify Active-only filter state (pressed evidence for button index 788, exact 'Active Only' filter text, presence of map canvas index 1195 and its aria-label/title, and list any snippets containing keywords ACTIVE/INACTIVE/Inactive/Offline). Then click the 'Inactive' status pill (index 790), wait 1s and extract page content again to verify Inactive-only filter state (pressed evidence for index 790, exact 'Inactive Only' filter text, map canvas presence, and keyword snippets).
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[3]').first)
+
+    # -> Click the 'Active' status pill (index 788), wait 1s, extract page content to verify Active-only filter (pressed evidence, 'Active Only' text, map canvas presence, and any keyword snippets). Then click the 'Inactive' pill (index 790), wait 1s, and extract page content to verify Inactive-only filter similarly.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[4]/div[2]/div[2]/div/button[2]').first)
+
+
+if __name__ == "__main__":
+    harness.run(run_test)
@@ -1,90 +1,28 @@
-import asyncio
-from playwright import async_api
+from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+import harness
 
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+async def run_test(page):
+    # -> Navigate to http://localhost:4200/dashboard and wait for the map and markers
+    await harness.open_dashboard(page)
 
-        # Open a new page in the browser context
-        page = await context.new_page()
+    # -> Click the 'Filter' button to open the filters panel so the company checkbox can be selected.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[1]/button').first)
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4200/dashboard", wait_until="commit", timeout=10000)
+    # -> Select the 'Marcopolo' company checkbox (index 2381), click 'Close Filters' (index 784), then interact with the map (index 1175) and extract visible marker labels to verify all markers belong to Marcopolo.
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[3]/div[2]/div[1]/div/div[6]/input').first)
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[3]/div[2]/div[4]/button[1]').first)
 
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+    await harness.click(page, page.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').first)
 
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:4200/dashboard
-        await page.goto("http://localhost:4200/dashboard", wait_until="commit", timeout=10000)
-        
-        # -> Click the 'Filter' button to open the filters panel so the company checkbox can be selected.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Select the 'Marcopolo' company checkbox (index 2381), click 'Close Filters' (index 784), then interact with the map (index 1175) and extract visible marker labels to verify all markers belong to Marcopolo.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[3]/div[2]/div[1]/div/div[6]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/div[3]/div[2]/div[4]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/app-root/app-full-layout/div/div/div/app-dashboard/div[1]/app-war-room/div/main/div/app-war-room-map/div/div[2]/div/div[1]/canvas').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Marcopolo').first).to_be_visible(timeout=3000)
-        except AssertionError:
-            raise AssertionError("Test case failed: Verifying that selecting the 'Marcopolo' company filter limits map markers to Marcopolo's factories — expected to find a visible 'Marcopolo' marker or label on the map, but none was found, indicating the company filter did not apply or map markers were not updated correctly.")
-        await asyncio.sleep(5)
+    # --> Assertions to verify final state
+    try:
+        await expect(page.locator('text=Marcopolo').first).to_be_visible(timeout=3000)
+    except AssertionError:
+        raise AssertionError("Test case failed: Verifying that selecting the 'Marcopolo' company filter limits map markers to Marcopolo's factories — expected to find a visible 'Marcopolo' marker or label on the map, but none was found, indicating the company filter did not apply or map markers were not updated correctly.")
 
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    harness.run(run_test)
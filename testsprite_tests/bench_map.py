@@ -0,0 +1,264 @@
+"""Browser performance benchmark for the war-room map at increasing facility counts.
+
+Serves a synthetic fluorescence-map-data.json (built from the real document with
+its factories replaced) at each scale through Playwright routing. It then drives
+zoom, pan and filter interactions on app-war-room-map and collects:
+
+* time to first marker (init-script MutationObserver, from navigation start);
+* long tasks (PerformanceObserver ``longtask``) during load and interactions;
+* frame timings from a requestAnimationFrame loop around the interactions;
+* JS heap after a forced GC (CDP ``HeapProfiler`` + ``Performance.getMetrics``).
+
+Results are compared against a stored baseline; a metric that regresses by more
+than --tolerance fails the run.
+
+    python testsprite_tests/bench_map.py --scales 100 1000 --runs 3
+    python testsprite_tests/bench_map.py --update-baseline
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import harness
+
+TESTS_DIR = Path(__file__).resolve().parent
+MAP_DATA_PATH = TESTS_DIR.parent / "public" / "assets" / "data" / "fluorescence-map-data.json"
+BASELINE_PATH = TESTS_DIR / "bench_baseline.json"
+RESULTS_PATH = TESTS_DIR / "tmp" / "bench-results.json"
+
+SCALES = [100, 1000, 10000]
+DEFAULT_TOLERANCE = 0.2
+FRAME_BUDGET_MS = 1000 / 60
+# Metrics where lower is better; these are the ones compared against the baseline
+COMPARED = ["timeToFirstMarkerMs", "longTaskTotalMs", "frameP95Ms", "droppedFrames", "heapUsedMb",
+            "zoomMs", "panMs", "filterMs"]
+
+FILTER_BUTTON = ".map-filter-btn"
+STATUS_PILLS = "[aria-labelledby=status-filter-label] button"
+
+_INSTRUMENT_JS = """(() => {
+    const bench = window.__bench = { firstMarkerMs: null, longTasks: [], frames: [], recording: false };
+    try {
+        new PerformanceObserver(list => {
+            for (const entry of list.getEntries()) bench.longTasks.push([entry.startTime, entry.duration]);
+        }).observe({ type: 'longtask', buffered: true });
+    } catch (e) {}
+    const watchMarkers = () => {
+        const observer = new MutationObserver(() => {
+            if (document.querySelector('.markers-overlay .marker-container')) {
+                bench.firstMarkerMs = performance.now();
+                observer.disconnect();
+            }
+        });
+        observer.observe(document.documentElement, { childList: true, subtree: true });
+    };
+    if (document.documentElement) watchMarkers();
+    else document.addEventListener('readystatechange', watchMarkers, { once: true });
+    bench.startFrames = () => {
+        bench.frames = [];
+        bench.recording = true;
+        let last = performance.now();
+        const tick = now => {
+            if (!bench.recording) return;
+            bench.frames.push(now - last);
+            last = now;
+            requestAnimationFrame(tick);
+        };
+        requestAnimationFrame(tick);
+    };
+    bench.stopFrames = () => { bench.recording = false; return bench.frames; };
+})();"""
+
+
+def synthetic_map_data(count, seed=7):
+    """The real map document with its factories replaced by ``count`` generated ones."""
+    with open(MAP_DATA_PATH, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    rng = random.Random(seed)
+    subsidiaries = [s for g in doc["parentGroups"] for s in g["subsidiaries"]]
+    templates = [f for s in subsidiaries for f in s["factories"]]
+    for sub in subsidiaries:
+        sub["factories"] = []
+    statuses = ["ONLINE", "ONLINE", "ONLINE", "OFFLINE", "DEGRADED"]
+    for i in range(count):
+        sub = subsidiaries[i % len(subsidiaries)]
+        template = templates[i % len(templates)]
+        factory = dict(template)
+        factory.update({
+            "id": f"{sub['id']}-bench-{i}",
+            "parentGroupId": sub["parentGroupId"],
+            "subsidiaryId": sub["id"],
+            "name": f"{template['name']} {i}",
+            # Populated latitudes only, so markers land where real plants would
+            "coordinates": {"latitude": round(rng.uniform(-45, 65), 4), "longitude": round(rng.uniform(-170, 175), 4)},
+            "status": rng.choice(statuses),
+            "logo": sub.get("logo"),
+        })
+        sub["factories"].append(factory)
+    return json.dumps(doc, separators=(",", ":"))
+
+
+async def _heap_used_mb(cdp):
+    await cdp.send("HeapProfiler.collectGarbage")
+    metrics = await cdp.send("Performance.getMetrics")
+    used = next(m["value"] for m in metrics["metrics"] if m["name"] == "JSHeapUsedSize")
+    return round(used / (1024 * 1024), 2)
+
+
+async def _timed(coro):
+    started = time.perf_counter()
+    await coro
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+async def _zoom_cycle(page):
+    for _ in range(3):
+        await harness.zoom_in(page)
+    for _ in range(3):
+        await harness.zoom_out(page)
+
+
+async def _pan(page):
+    box = await page.locator(harness.MAP).bounding_box()
+    x, y = box["x"] + box["width"] / 2, box["y"] + box["height"] / 2
+    before = await harness.map_moves(page)
+    await page.mouse.move(x, y)
+    await page.mouse.down()
+    for step in range(1, 11):
+        await page.mouse.move(x - step * 25, y - step * 10)
+    await page.mouse.up()
+    await page.wait_for_function(
+        "n => { const m = document.querySelector('#war-room-map'); return Number(m.dataset.mapMoves) > n && m.dataset.mapState === 'idle'; }",
+        arg=before, timeout=harness.MAP_MOVE_TIMEOUT)
+    await harness.wait_for_dom_quiet(page, ".markers-overlay")
+
+
+async def _filter(page):
+    await harness.click(page, page.locator(FILTER_BUTTON).first)
+    pills = page.locator(STATUS_PILLS)
+    await harness.click(page, pills.nth(1))   # Active
+    await harness.click(page, pills.nth(2))   # Inactive
+    await harness.click(page, pills.nth(0))   # All
+
+
+async def measure(browser, count, body):
+    async with harness.page_session(browser) as page:
+        await page.route("**/assets/data/fluorescence-map-data.json",
+                         lambda route: route.fulfill(status=200, content_type="application/json", body=body))
+        await page.add_init_script(_INSTRUMENT_JS)
+        cdp = await page.context.new_cdp_session(page)
+        await cdp.send("Performance.enable")
+
+        await harness.open_dashboard(page)
+        result = {"markers": count}
+        first_marker = await page.evaluate("() => window.__bench.firstMarkerMs")
+        result["timeToFirstMarkerMs"] = round(first_marker, 1) if first_marker is not None else None
+        result["renderedMarkers"] = await page.locator(harness.MARKERS).count()
+
+        await page.evaluate("() => window.__bench.startFrames()")
+        result["zoomMs"] = await _timed(_zoom_cycle(page))
+        result["panMs"] = await _timed(_pan(page))
+        result["filterMs"] = await _timed(_filter(page))
+        frames = await page.evaluate("() => window.__bench.stopFrames()")
+
+        long_tasks = await page.evaluate("() => window.__bench.longTasks")
+        result["longTaskCount"] = len(long_tasks)
+        result["longTaskTotalMs"] = round(sum(d for _, d in long_tasks), 1)
+        result["longTaskMaxMs"] = round(max((d for _, d in long_tasks), default=0), 1)
+        frames = sorted(frames[1:]) or [0]
+        result["frameCount"] = len(frames)
+        result["frameP50Ms"] = round(statistics.median(frames), 1)
+        result["frameP95Ms"] = round(frames[min(len(frames) - 1, int(len(frames) * 0.95))], 1)
+        result["droppedFrames"] = sum(1 for f in frames if f > FRAME_BUDGET_MS * 1.5)
+        result["heapUsedMb"] = await _heap_used_mb(cdp)
+        return result
+
+
+def _median_run(runs):
+    merged = dict(runs[0])
+    for key in merged:
+        values = [r[key] for r in runs if isinstance(r.get(key), (int, float))]
+        if values:
+            merged[key] = round(statistics.median(values), 1)
+    return merged
+
+
+async def run_bench(scales, runs):
+    results = {}
+    async with harness.browser_session() as browser:
+        for count in scales:
+            body = synthetic_map_data(count)
+            samples = []
+            for i in range(runs):
+                sample = await measure(browser, count, body)
+                print(f"{count:>6} markers run {i + 1}: first marker {sample['timeToFirstMarkerMs']} ms, "
+                      f"long tasks {sample['longTaskTotalMs']} ms, p95 frame {sample['frameP95Ms']} ms, "
+                      f"heap {sample['heapUsedMb']} MB", flush=True)
+                samples.append(sample)
+            results[str(count)] = _median_run(samples)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of human-readable regressions against the baseline."""
+    regressions = []
+    for scale, metrics in results.items():
+        base = baseline.get(scale)
+        if not base:
+            print(f"{scale}: no baseline, skipping comparison")
+            continue
+        for key in COMPARED:
+            old, new = base.get(key), metrics.get(key)
+            if old is None or new is None:
+                continue
+            # Small absolute values (a couple of dropped frames) are noise, not regressions
+            if new > old * (1 + tolerance) and new - old > 1:
+                regressions.append(f"{scale} markers: {key} {old} -> {new} (+{(new / old - 1) * 100 if old else 100:.0f}%)")
+    return regressions
+
+
+def write_baseline(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the war-room map at several marker counts")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES)
+    parser.add_argument("--runs", type=int, default=3, help="runs per scale; the median is reported")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run_bench(args.scales, max(1, args.runs)))
+    RESULTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(RESULTS_PATH, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+        baseline.update(results)
+        write_baseline(baseline_path, baseline)
+        print(f"Baseline updated: {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --update-baseline to record one")
+        return 0
+    regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+    return 1 if regressions else 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""Shared browser fixtures and event-driven waits for the testsprite Playwright cases.
+
+Each TC module defines ``async def run_test(page)`` and hands it to :func:`run`.
+Waits key off what the page is doing rather than fixed sleeps:
+
+* navigation waits for ``networkidle`` (bounded, the app keeps a few pollers open);
+* the map container mirrors MapLibre's ``movestart``/``moveend``/``idle`` events as
+  ``data-map-state``/``data-map-moves`` (fluorescence-map-map.component.ts), so zoom
+  steps wait for the move to finish and tiles to settle;
+* filter and panel clicks wait for the marker overlay's DOM to go quiet.
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+from playwright import async_api
+
+import netfixtures
+
+BASE_URL = os.environ.get("TESTSPRITE_BASE_URL", "http://localhost:4200")
+
+LAUNCH_ARGS = [
+    "--window-size=1280,720",         # Set the browser window size
+    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+    "--ipc=host",                     # Use host-level IPC for better stability
+]
+
+DEFAULT_TIMEOUT = 5000
+NAVIGATION_TIMEOUT = 15000
+MAP_READY_TIMEOUT = 20000
+# Long enough for a fly/ease animation (MapLibre defaults to ~500 ms) plus tile loads
+MAP_MOVE_TIMEOUT = 10000
+NETWORK_IDLE_TIMEOUT = 3000
+# A click that doesn't start a move within this window (e.g. zoom already at its bound) is a no-op
+MOVE_START_GRACE_MS = 750
+DOM_QUIET_MS = 150
+
+MAP = "#war-room-map"
+MARKERS = ".markers-overlay .marker-container"
+
+_MAP_READY_JS = """() => {
+    if (document.querySelector('.map-error-overlay')) return 'error';
+    const map = document.querySelector('#war-room-map');
+    if (!map || map.dataset.mapState !== 'idle' || document.querySelector('.map-loading-overlay')) return false;
+    return document.querySelectorAll('.markers-overlay .marker-container').length > 0;
+}"""
+
+_MAP_MOVE_JS = """([before, graceMs]) => {
+    const map = document.querySelector('#war-room-map');
+    if (!map) return false;
+    const moves = Number(map.dataset.mapMoves || 0);
+    const idle = map.dataset.mapState === 'idle';
+    if (moves > before) return idle;
+    window.__harnessMoveWaitStart = window.__harnessMoveWaitStart || performance.now();
+    return idle && performance.now() - window.__harnessMoveWaitStart > graceMs;
+}"""
+
+_DOM_QUIET_JS = """([selector, quietMs, maxMs]) => new Promise(resolve => {
+    const root = document.querySelector(selector) || document.body;
+    let timer = null;
+    const cap = setTimeout(() => finish(), maxMs);
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(() => finish(), quietMs);
+    });
+    function finish() {
+        observer.disconnect();
+        clearTimeout(timer);
+        clearTimeout(cap);
+        // Let the frame that applied the last change paint
+        requestAnimationFrame(() => requestAnimationFrame(() => resolve(true)));
+    }
+    observer.observe(root, { subtree: true, childList: true, attributes: true, characterData: true });
+    timer = setTimeout(() => finish(), quietMs);
+})"""
+
+
+@asynccontextmanager
+async def browser_session(headless=True):
+    """One Playwright driver and Chromium for as many contexts as the caller opens."""
+    pw = await async_api.async_playwright().start()
+    browser = None
+    try:
+        browser = await pw.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+        yield browser
+    finally:
+        if browser:
+            await browser.close()
+        await pw.stop()
+
+
+@asynccontextmanager
+async def page_session(browser):
+    """A fresh context (cookies, storage, cache) and page on an existing browser.
+
+    Third-party traffic is recorded or replayed when TESTSPRITE_NETWORK is set
+    (see netfixtures.py).
+    """
+    context = await browser.new_context(viewport={"width": 1280, "height": 720})
+    context.set_default_timeout(DEFAULT_TIMEOUT)
+    context.set_default_navigation_timeout(NAVIGATION_TIMEOUT)
+    network = netfixtures.from_env(BASE_URL)
+    try:
+        if network:
+            await network.attach(context)
+        yield await context.new_page()
+    finally:
+        await context.close()
+        if network:
+            network.close()
+
+
+async def wait_for_network_idle(page, timeout=NETWORK_IDLE_TIMEOUT):
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+    except async_api.TimeoutError:
+        # Long-lived requests (live data, tiles at the edge) keep the network busy; the map waits cover the rest
+        pass
+
+
+async def goto(page, path):
+    await page.goto(BASE_URL + path, wait_until="domcontentloaded")
+    await wait_for_network_idle(page)
+
+
+async def wait_for_map_ready(page, timeout=MAP_READY_TIMEOUT):
+    """Block until MapLibre reports idle and the marker layer has rendered."""
+    handle = await page.wait_for_function(_MAP_READY_JS, timeout=timeout)
+    if await handle.json_value() == 'error':
+        message = await page.locator('.map-error-message').first.text_content()
+        raise AssertionError(f"Map failed to load: {message}")
+
+
+async def open_dashboard(page):
+    await goto(page, "/dashboard")
+    await wait_for_map_ready(page)
+
+
+async def wait_for_dom_quiet(page, selector=MAP, quiet_ms=DOM_QUIET_MS, max_ms=DEFAULT_TIMEOUT):
+    await page.evaluate(_DOM_QUIET_JS, [selector, quiet_ms, max_ms])
+
+
+async def click(page, locator, settle_selector=MAP):
+    """Click, then wait until the re-render it caused has finished."""
+    await locator.click()
+    await wait_for_dom_quiet(page, settle_selector)
+
+
+async def map_moves(page):
+    return int(await page.locator(MAP).get_attribute("data-map-moves") or 0)
+
+
+async def click_and_wait_for_move(page, locator, timeout=MAP_MOVE_TIMEOUT):
+    """Click a control that moves the map (zoom, fullscreen) and wait for moveend + idle."""
+    before = await map_moves(page)
+    await page.evaluate("() => { window.__harnessMoveWaitStart = 0; }")
+    await locator.click()
+    await page.wait_for_function(_MAP_MOVE_JS, arg=[before, MOVE_START_GRACE_MS], timeout=timeout)
+    # Marker overlay positions are applied on the next animation frame after moveend
+    await wait_for_dom_quiet(page, ".markers-overlay")
+
+
+async def zoom_in(page):
+    await click_and_wait_for_move(page, page.locator("app-war-room-map-controls .zoom-in-btn").first)
+
+
+async def zoom_out(page):
+    await click_and_wait_for_move(page, page.locator("app-war-room-map-controls .zoom-out-btn").first)
+
+
+async def run_with_page(test, browser=None):
+    """Run ``test(page)`` in its own context, launching a browser if none is shared."""
+    if browser is not None:
+        async with page_session(browser) as page:
+            return await test(page)
+    async with browser_session() as own_browser:
+        async with page_session(own_browser) as page:
+            return await test(page)
+
+
+def run(test):
+    """Entry point for running a single TC module as a script."""
+    asyncio.run(run_with_page(test))
@@ -0,0 +1,181 @@
+"""Record/replay of third-party network traffic for the Playwright cases.
+
+In ``record`` mode every request that leaves the app origin (Open-Meteo
+geocoding, map style, tiles, glyphs, sprites, logos on CDNs) is fetched once.
+Its body is stored under its sha256 in ``fixtures/network/blobs`` and the
+request is indexed in ``index.json``. In ``replay`` mode those requests are
+answered from disk and nothing goes to the network. A request with no
+fixture, or one that fails while recording, is aborted and listed in
+``tmp/unmatched-requests.json``. Requests
+to the app under test (``harness.BASE_URL``) always pass through.
+
+The mode comes from ``TESTSPRITE_NETWORK`` (``record``, ``replay``, or unset
+for live traffic), so the TC scripts, run_suite.py and bench_map.py all pick
+it up through harness.page_session.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TESTS_DIR = Path(__file__).resolve().parent
+STORE_DIR = TESTS_DIR / "fixtures" / "network"
+UNMATCHED_PATH = TESTS_DIR / "tmp" / "unmatched-requests.json"
+
+MODES = ("record", "replay")
+# Cache busters would make every recording unique
+IGNORED_QUERY_PARAMS = {"_", "cb", "cachebust", "timestamp"}
+# Playwright hands us decoded bodies, so length/encoding headers no longer describe them
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+
+def normalize_url(url):
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if k not in IGNORED_QUERY_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ""))
+
+
+def request_key(method, url, body=None):
+    digest = hashlib.sha256(f"{method.upper()} {normalize_url(url)}\n".encode("utf-8"))
+    if body:
+        digest.update(body)
+    return digest.hexdigest()
+
+
+def _atomic_write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class FixtureStore:
+    """Content-addressed bodies plus a request-key -> response metadata index."""
+
+    def __init__(self, root=STORE_DIR):
+        self.root = Path(root)
+        self.index_path = self.root / "index.json"
+        self.index = self._read_index()
+        self._dirty = {}
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _blob_path(self, digest):
+        return self.root / "blobs" / digest[:2] / digest
+
+    def get(self, key):
+        entry = self.index.get(key)
+        if entry is None:
+            return None, None
+        return entry, self._blob_path(entry["blob"]).read_bytes()
+
+    def put(self, key, method, url, status, headers, body):
+        digest = hashlib.sha256(body).hexdigest()
+        blob = self._blob_path(digest)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp = blob.with_suffix(".tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, blob)
+        entry = {
+            "method": method,
+            "url": normalize_url(url),
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS},
+            "blob": digest,
+        }
+        self.index[key] = self._dirty[key] = entry
+
+    def save(self):
+        if not self._dirty:
+            return
+        # Other contexts/processes may have recorded meanwhile: merge rather than overwrite
+        merged = self._read_index()
+        merged.update(self._dirty)
+        _atomic_write_json(self.index_path, merged)
+        self.index = merged
+        self._dirty = {}
+
+
+class NetworkFixtures:
+    def __init__(self, mode, store=None, passthrough_origins=()):
+        if mode not in MODES:
+            raise ValueError(f"Unknown network fixture mode {mode!r}; expected one of {MODES}")
+        self.mode = mode
+        self.store = store or FixtureStore()
+        self.passthrough = {urlsplit(o).netloc.lower() for o in passthrough_origins}
+        self.unmatched = []
+        self.served = 0
+
+    async def attach(self, context):
+        await context.route("**/*", self._handle)
+
+    async def _handle(self, route):
+        request = route.request
+        netloc = urlsplit(request.url).netloc.lower()
+        if netloc in self.passthrough or request.url.startswith(("data:", "blob:")):
+            await route.continue_()
+            return
+        body = request.post_data_buffer
+        key = request_key(request.method, request.url, body)
+
+        if self.mode == "record":
+            try:
+                response = await route.fetch()
+                payload = await response.body()
+            except Exception as e:  # playwright.Error: DNS, refused, reset; nothing to record
+                self.unmatched.append({"method": request.method, "url": request.url,
+                                       "resourceType": request.resource_type, "error": str(e)})
+                await route.abort("failed")
+                return
+            self.store.put(key, request.method, request.url, response.status, response.headers, payload)
+            await route.fulfill(response=response, body=payload)
+            return
+
+        entry, payload = self.store.get(key)
+        if entry is None:
+            self.unmatched.append({"method": request.method, "url": request.url,
+                                   "resourceType": request.resource_type})
+            await route.abort("internetdisconnected")
+            return
+        self.served += 1
+        await route.fulfill(status=entry["status"], headers=entry["headers"], body=payload)
+
+    def close(self):
+        if self.mode == "record":
+            self.store.save()
+        if self.unmatched:
+            self.report_unmatched()
+
+    def report_unmatched(self, path=UNMATCHED_PATH):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                known = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            known = []
+        seen = {(r["method"], r["url"]) for r in known}
+        known.extend(r for r in self.unmatched if (r["method"], r["url"]) not in seen)
+        _atomic_write_json(Path(path), known)
+        for r in self.unmatched:
+            reason = f" ({r['error']})" if "error" in r else ""
+            print(f"unmatched {r['resourceType']} request: {r['method']} {r['url']}{reason}")
+
+
+def from_env(base_url):
+    mode = os.environ.get("TESTSPRITE_NETWORK", "").strip().lower()
+    if not mode or mode == "live":
+        return None
+    return NetworkFixtures(mode, passthrough_origins=[base_url])
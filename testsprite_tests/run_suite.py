@@ -0,0 +1,153 @@
+"""Run the testsprite TC modules concurrently on shared browsers.
+
+Every worker process launches one Chromium; each test gets its own browser
+context (cookies, storage and cache are not shared) and at most
+``--concurrency`` tests run at once per worker. Results are written as JSON
+and JUnit XML so CI can pick up per-test timings.
+
+    python testsprite_tests/run_suite.py --concurrency 4
+    python testsprite_tests/run_suite.py --workers 2 --concurrency 3 -k Filtering
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from xml.etree.ElementTree import Element, SubElement, ElementTree
+
+import harness
+import netfixtures
+
+TESTS_DIR = Path(__file__).resolve().parent
+REPORT_DIR = TESTS_DIR / "tmp"
+DEFAULT_TEST_TIMEOUT = 120
+
+
+def discover(pattern=None):
+    names = sorted(p.stem for p in TESTS_DIR.glob("TC[0-9]*.py"))
+    if pattern:
+        names = [n for n in names if pattern.lower() in n.lower()]
+    return names
+
+
+async def _run_one(browser, name, semaphore, timeout):
+    async with semaphore:
+        started = time.perf_counter()
+        result = {"name": name, "status": "passed", "message": None, "detail": None}
+        try:
+            module = importlib.import_module(name)
+            await asyncio.wait_for(harness.run_with_page(module.run_test, browser), timeout)
+        except AssertionError as e:
+            result.update(status="failed", message=str(e), detail=traceback.format_exc())
+        except asyncio.TimeoutError:
+            result.update(status="error", message=f"timed out after {timeout}s")
+        except Exception as e:  # a broken test must not take the rest of the shard down
+            result.update(status="error", message=f"{type(e).__name__}: {e}", detail=traceback.format_exc())
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        print(f"{result['status'].upper():6} {name} ({result['seconds']:.1f}s)", flush=True)
+        return result
+
+
+async def run_shard(names, concurrency, timeout, headless=True):
+    semaphore = asyncio.Semaphore(concurrency)
+    async with harness.browser_session(headless=headless) as browser:
+        return await asyncio.gather(*(_run_one(browser, n, semaphore, timeout) for n in names))
+
+
+def _worker(names, concurrency, timeout, headless):
+    # Child processes import the TC modules by name, so they need this directory on the path
+    if str(TESTS_DIR) not in sys.path:
+        sys.path.insert(0, str(TESTS_DIR))
+    return asyncio.run(run_shard(names, concurrency, timeout, headless))
+
+
+def run_suite(names, workers=1, concurrency=4, timeout=DEFAULT_TEST_TIMEOUT, headless=True):
+    if workers <= 1 or len(names) <= 1:
+        return _worker(names, concurrency, timeout, headless)
+    # Round-robin so the slow zoom cases (TC001-TC003) land on different workers
+    shards = [names[i::workers] for i in range(workers) if names[i::workers]]
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        futures = [pool.submit(_worker, shard, concurrency, timeout, headless) for shard in shards]
+        results = [r for f in futures for r in f.result()]
+    return sorted(results, key=lambda r: r["name"])
+
+
+def write_json_report(results, wall_seconds, path):
+    summary = {s: sum(1 for r in results if r["status"] == s) for s in ("passed", "failed", "error")}
+    report = {
+        "baseUrl": harness.BASE_URL,
+        "wallSeconds": round(wall_seconds, 3),
+        "testSeconds": round(sum(r["seconds"] for r in results), 3),
+        "summary": summary,
+        "tests": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def write_junit_report(results, wall_seconds, path):
+    suite = Element("testsuite", {
+        "name": "testsprite",
+        "tests": str(len(results)),
+        "failures": str(sum(1 for r in results if r["status"] == "failed")),
+        "errors": str(sum(1 for r in results if r["status"] == "error")),
+        "time": f"{wall_seconds:.3f}",
+    })
+    for r in results:
+        case = SubElement(suite, "testcase", {"classname": "testsprite_tests", "name": r["name"],
+                                               "time": f"{r['seconds']:.3f}"})
+        if r["status"] != "passed":
+            node = SubElement(case, "failure" if r["status"] == "failed" else "error",
+                              {"message": r["message"] or ""})
+            node.text = r["detail"] or r["message"]
+    ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the testsprite Playwright cases in parallel")
+    parser.add_argument("-k", dest="pattern", help="only run tests whose module name contains this")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes, one browser each")
+    parser.add_argument("--concurrency", type=int, default=min(4, os.cpu_count() or 1),
+                        help="concurrent contexts per browser")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TEST_TIMEOUT, help="per-test timeout in seconds")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--json", default=str(REPORT_DIR / "suite-report.json"))
+    parser.add_argument("--junit", default=str(REPORT_DIR / "suite-report.xml"))
+    args = parser.parse_args(argv)
+
+    names = discover(args.pattern)
+    if not names:
+        print("No tests matched", file=sys.stderr)
+        return 2
+    print(f"Running {len(names)} tests against {harness.BASE_URL} "
+          f"({args.workers} worker(s) x {args.concurrency} contexts)")
+
+    network_mode = os.environ.get("TESTSPRITE_NETWORK", "").strip().lower()
+    if network_mode in netfixtures.MODES:
+        netfixtures.UNMATCHED_PATH.unlink(missing_ok=True)
+
+    started = time.perf_counter()
+    results = run_suite(names, args.workers, max(1, args.concurrency), args.timeout, not args.headed)
+    wall = time.perf_counter() - started
+
+    for report in (args.json, args.junit):
+        Path(report).parent.mkdir(parents=True, exist_ok=True)
+    write_json_report(results, wall, args.json)
+    write_junit_report(results, wall, args.junit)
+    passed = sum(1 for r in results if r["status"] == "passed")
+    print(f"{passed}/{len(results)} passed in {wall:.1f}s "
+          f"(sum of test times {sum(r['seconds'] for r in results):.1f}s)")
+    print(f"Reports: {args.json}, {args.junit}")
+    if network_mode in netfixtures.MODES and netfixtures.UNMATCHED_PATH.exists():
+        failed = "failed to record" if network_mode == "record" else "with no recorded fixture"
+        print(f"Requests {failed}: {netfixtures.UNMATCHED_PATH}")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
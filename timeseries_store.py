@@ -0,0 +1,270 @@
+import argparse
+import json
+import re
+import struct
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from factory_id_registry import atomic_write_json
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+STATE_DIR = BASE_DIR / "data" / "state"
+
+store_dir = STATE_DIR / "timeseries"
+war_room_data_path = DATA_DIR / "fluorescence-map-data.json"
+series_output_path = DATA_DIR / "timeseries.json"
+
+# One week of 1-minute samples per series; older samples are overwritten in place
+DEFAULT_CAPACITY = 7 * 24 * 60
+# Chart windows and the point budget each is downsampled to
+WINDOWS = {"1h": (3600, 60), "24h": (86400, 120), "7d": (7 * 86400, 168)}
+# The map widgets draw fixed-size arrays (QuantumChartData / NetworkThroughput in fluorescence-map.interface.ts)
+QUANTUM_WINDOW, QUANTUM_POINTS = 86400, 6
+THROUGHPUT_WINDOW, THROUGHPUT_BARS = 3600, 7
+
+THROUGHPUT_SERIES = "network:throughput"
+
+_HEADER = struct.Struct("<8sQQQ")       # magic, capacity, head, count
+_MAGIC = b"TSRING01"
+_RECORD = np.dtype([("t", "<f8"), ("v", "<f4")])
+
+
+def quantum_series(subsidiary_id):
+    return f"subsidiary:{subsidiary_id}:quantum"
+
+
+def _file_name(series):
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", series) + ".ring"
+
+
+class RingSeries:
+    """Fixed-capacity (timestamp, value) ring buffer backed by a memory-mapped file.
+
+    The file is a 32-byte header followed by ``capacity`` packed records, so
+    appending a sample rewrites one record and the header and nothing else.
+    Timestamps are epoch seconds and must be non-decreasing per series.
+    """
+
+    def __init__(self, path, capacity=DEFAULT_CAPACITY):
+        self.path = Path(path)
+        if not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, capacity, 0, 0))
+                f.truncate(_HEADER.size + capacity * _RECORD.itemsize)
+        with open(self.path, "rb") as f:
+            magic, self.capacity, self.head, self.count = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path} is not a time-series ring file")
+        self._records = np.memmap(self.path, dtype=_RECORD, mode="r+", offset=_HEADER.size,
+                                  shape=(self.capacity,))
+        self._header = np.memmap(self.path, dtype=np.uint8, mode="r+", shape=(_HEADER.size,))
+
+    def _write_header(self):
+        self._header[:] = np.frombuffer(_HEADER.pack(_MAGIC, self.capacity, self.head, self.count), dtype=np.uint8)
+
+    def last_timestamp(self):
+        return float(self._records[(self.head - 1) % self.capacity]["t"]) if self.count else None
+
+    def extend(self, timestamps, values):
+        t = np.asarray(timestamps, dtype=np.float64)
+        v = np.asarray(values, dtype=np.float32)
+        last = self.last_timestamp()
+        keep = np.ones(len(t), dtype=bool)
+        if len(t):
+            # Drop out-of-order samples rather than corrupting the sorted order LTTB relies on
+            running = np.maximum.accumulate(np.concatenate([[last if last is not None else -np.inf], t]))[:-1]
+            keep = t >= running
+        t, v = t[keep], v[keep]
+        if len(t) > self.capacity:
+            t, v = t[-self.capacity:], v[-self.capacity:]
+        slots = (self.head + np.arange(len(t))) % self.capacity
+        self._records["t"][slots] = t
+        self._records["v"][slots] = v
+        self.head = int((self.head + len(t)) % self.capacity)
+        self.count = int(min(self.capacity, self.count + len(t)))
+        self._write_header()
+        return int(len(t))
+
+    def append(self, timestamp, value):
+        return self.extend([timestamp], [value])
+
+    def window(self, start=None, end=None):
+        """Samples in [start, end] in time order, as (timestamps, values) arrays."""
+        first = (self.head - self.count) % self.capacity
+        order = (first + np.arange(self.count)) % self.capacity
+        records = self._records[order]
+        t, v = records["t"], records["v"].astype(np.float64)
+        lo = 0 if start is None else int(np.searchsorted(t, start, side="left"))
+        hi = len(t) if end is None else int(np.searchsorted(t, end, side="right"))
+        return t[lo:hi], v[lo:hi]
+
+    def flush(self):
+        self._records.flush()
+        self._header.flush()
+
+
+class TimeSeriesStore:
+    def __init__(self, root=store_dir, capacity=DEFAULT_CAPACITY):
+        self.root = Path(root)
+        self.capacity = capacity
+        self._open = {}
+
+    def series(self, name, create=True):
+        ring = self._open.get(name)
+        if ring is None:
+            path = self.root / _file_name(name)
+            if not create and not path.exists():
+                return None
+            ring = self._open[name] = RingSeries(path, self.capacity)
+        return ring
+
+    def names(self):
+        # File names are sanitized, so the series name is kept in an index alongside them
+        index = self.root / "series.json"
+        return json.loads(index.read_text()) if index.exists() else []
+
+    def ingest(self, samples):
+        """Append an iterable of {"series", "t", "value"} samples; returns the count stored."""
+        batches = {}
+        for sample in samples:
+            t = sample["t"]
+            if isinstance(t, str):
+                t = datetime.fromisoformat(t.replace("Z", "+00:00")).timestamp()
+            batches.setdefault(sample["series"], ([], []))
+            batches[sample["series"]][0].append(float(t))
+            batches[sample["series"]][1].append(float(sample["value"]))
+        stored = 0
+        for name, (t, v) in batches.items():
+            order = np.argsort(t, kind="stable")
+            stored += self.series(name).extend(np.asarray(t)[order], np.asarray(v)[order])
+        known = set(self.names())
+        if set(batches) - known:
+            self.root.mkdir(parents=True, exist_ok=True)
+            atomic_write_json(self.root / "series.json", sorted(known | set(batches)), indent=2)
+        self.flush()
+        return stored
+
+    def flush(self):
+        for ring in self._open.values():
+            ring.flush()
+
+
+def lttb(t, v, threshold):
+    """Largest-Triangle-Three-Buckets downsampling; returns the indices to keep."""
+    n = len(t)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        return np.linspace(0, n - 1, max(threshold, 0)).astype(np.intp)
+    every = (n - 2) / (threshold - 2)
+    keep = np.empty(threshold, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        # The third vertex is the average of the next bucket (the last point for the final one)
+        nhi = min(int((i + 2) * every) + 1, n)
+        avg_t, avg_v = t[hi:nhi].mean(), v[hi:nhi].mean()
+        bt, bv = t[lo:hi], v[lo:hi]
+        area = np.abs((t[a] - avg_t) * (bv - v[a]) - (t[a] - bt) * (avg_v - v[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def downsample(t, v, budget):
+    idx = lttb(t, v, budget)
+    return t[idx], v[idx]
+
+
+def chart_series(store, now=None, windows=WINDOWS):
+    """{series: {window: {"t": [...], "v": [...]}}} with each window LTTB-reduced to its budget."""
+    now = now if now is not None else datetime.now(timezone.utc).timestamp()
+    out = {}
+    for name in store.names():
+        ring = store.series(name, create=False)
+        if ring is None:
+            continue
+        out[name] = {}
+        for label, (span, budget) in windows.items():
+            t, v = downsample(*ring.window(now - span, now), budget)
+            out[name][label] = {"t": [int(x) for x in t], "v": [round(float(x), 2) for x in v]}
+    return out
+
+
+def _fixed_points(ring, now, span, points):
+    t, v = ring.window(now - span, now)
+    if len(t) < points:
+        return None
+    _, v = downsample(t, v, points)
+    return [int(round(float(x))) for x in np.clip(v, 0, 100)]
+
+
+def apply_to_map(war_room_data, store, now=None):
+    """Replace the seeded chart arrays in the map document with downsampled history."""
+    now = now if now is not None else datetime.now(timezone.utc).timestamp()
+    updated = []
+    for group in war_room_data["parentGroups"]:
+        for sub in group["subsidiaries"]:
+            ring = store.series(quantum_series(sub["id"]), create=False)
+            points = _fixed_points(ring, now, QUANTUM_WINDOW, QUANTUM_POINTS) if ring else None
+            if points:
+                sub["quantumChart"] = {"dataPoints": points, "highlightedIndex": len(points) - 1}
+                updated.append(sub["id"])
+    ring = store.series(THROUGHPUT_SERIES, create=False)
+    bars = _fixed_points(ring, now, THROUGHPUT_WINDOW, THROUGHPUT_BARS) if ring else None
+    if bars:
+        throughput = war_room_data.setdefault("networkThroughput", {})
+        throughput["bars"] = bars
+        updated.append(THROUGHPUT_SERIES)
+    return updated
+
+
+def _read_samples(path):
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ring-buffer metric history with LTTB chart output")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("ingest", help='append NDJSON samples: {"series": ..., "t": epoch|ISO, "value": ...}')
+    p.add_argument("input", nargs="?", default="-")
+    sub.add_parser("emit", help="write timeseries.json and refresh the map document's chart arrays")
+    sub.add_parser("stats")
+    args = parser.parse_args(argv)
+
+    store = TimeSeriesStore()
+    if args.command == "ingest":
+        print(f"Stored {store.ingest(_read_samples(args.input))} samples")
+    elif args.command == "emit":
+        atomic_write_json(series_output_path, chart_series(store), separators=(",", ":"))
+        with open(war_room_data_path, "r", encoding="utf-8") as f:
+            war_room_data = json.load(f)
+        updated = apply_to_map(war_room_data, store)
+        if updated:
+            atomic_write_json(war_room_data_path, war_room_data, indent=2, ensure_ascii=False)
+        print(f"Wrote {series_output_path}; refreshed {len(updated)} map series")
+    else:
+        for name in store.names():
+            ring = store.series(name)
+            t, _ = ring.window()
+            span = f"{datetime.fromtimestamp(t[0], timezone.utc):%Y-%m-%d %H:%M} .. " \
+                   f"{datetime.fromtimestamp(t[-1], timezone.utc):%Y-%m-%d %H:%M}" if len(t) else "empty"
+            print(f"{name}: {ring.count}/{ring.capacity} samples ({span})")
+
+
+if __name__ == "__main__":
+    main()
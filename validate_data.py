@@ -0,0 +1,731 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "public" / "assets" / "data"
+
+# Records per parallel validation task
+CHUNK_RECORDS = 50_000
+# Messages kept per file; the total count is always reported
+MAX_REPORTED = 50
+
+# -- schemas -----------------------------------------------------------------
+#
+# A JSON Schema subset: type, enum, required, properties, additionalProperties,
+# items, minItems/maxItems, minLength, pattern, minimum/maximum and local
+# "$ref": "#/definitions/<name>", plus "uniqueItemsBy": <key> for arrays of
+# objects that must not repeat an id.
+
+_NULLABLE_STRING = {"type": ["string", "null"]}
+
+DEFINITIONS = {
+    "coordinates": {
+        "type": "object",
+        "required": ["latitude", "longitude"],
+        "properties": {
+            "latitude": {"type": "number", "minimum": -90, "maximum": 90},
+            "longitude": {"type": "number", "minimum": -180, "maximum": 180},
+        },
+    },
+    "metrics": {
+        "type": "object",
+        "required": ["assetCount", "incidentCount", "syncStability"],
+        "properties": {
+            "assetCount": {"type": "integer", "minimum": 0},
+            "incidentCount": {"type": "integer", "minimum": 0},
+            "syncStability": {"type": "number", "minimum": 0, "maximum": 100},
+        },
+    },
+    # The map treats ONLINE/OFFLINE as ACTIVE/INACTIVE; PAUSED and MAINTENANCE occur in the seed data
+    "operationalStatus": {"enum": ["ACTIVE", "INACTIVE", "ONLINE", "OFFLINE", "PAUSED", "MAINTENANCE"]},
+    "factory": {
+        "type": "object",
+        "required": ["id", "parentGroupId", "subsidiaryId", "name", "coordinates", "status"],
+        "properties": {
+            "id": {"type": "string", "minLength": 1},
+            "parentGroupId": {"type": "string"},
+            "subsidiaryId": {"type": "string"},
+            "name": {"type": "string"},
+            "city": {"type": "string"},
+            "country": {"type": "string"},
+            "coordinates": {"$ref": "#/definitions/coordinates"},
+            "status": {"$ref": "#/definitions/operationalStatus"},
+            "syncStability": {"type": "number", "minimum": 0, "maximum": 100},
+            "assets": {"type": "integer", "minimum": 0},
+            "incidents": {"type": "integer", "minimum": 0},
+            "fullAddress": _NULLABLE_STRING,
+            "facilityType": _NULLABLE_STRING,
+            "notes": _NULLABLE_STRING,
+        },
+    },
+    "hub": {
+        "type": "object",
+        "required": ["id", "code", "companyId", "status"],
+        "properties": {
+            "id": {"type": "string", "minLength": 1},
+            "code": {"type": "string"},
+            "companyId": {"type": "string"},
+            "companyName": {"type": "string"},
+            "status": {"type": "string"},
+            "capacity": {"type": "string"},
+            "capacityPercentage": {"type": "number", "minimum": 0, "maximum": 100},
+        },
+    },
+    "subsidiary": {
+        "type": "object",
+        "required": ["id", "parentGroupId", "name", "status", "metrics", "factories", "hubs", "quantumChart"],
+        "properties": {
+            "id": {"type": "string", "minLength": 1},
+            "parentGroupId": {"type": "string"},
+            "name": {"type": "string"},
+            "status": {"$ref": "#/definitions/operationalStatus"},
+            "metrics": {"$ref": "#/definitions/metrics"},
+            "factories": {"type": "array", "uniqueItemsBy": "id", "items": {"$ref": "#/definitions/factory"}},
+            "hubs": {"type": "array", "uniqueItemsBy": "id", "items": {"$ref": "#/definitions/hub"}},
+            "quantumChart": {
+                "type": "object",
+                "required": ["dataPoints"],
+                "properties": {
+                    "dataPoints": {"type": "array", "items": {"type": "number", "minimum": 0, "maximum": 100}},
+                    "highlightedIndex": {"type": "integer", "minimum": 0},
+                },
+            },
+        },
+    },
+    "parentGroup": {
+        "type": "object",
+        "required": ["id", "name", "status", "metrics", "subsidiaries"],
+        "properties": {
+            "id": {"type": "string", "minLength": 1},
+            "name": {"type": "string"},
+            "status": {"$ref": "#/definitions/operationalStatus"},
+            "metrics": {"$ref": "#/definitions/metrics"},
+            "subsidiaries": {"type": "array", "uniqueItemsBy": "id",
+                             "items": {"$ref": "#/definitions/subsidiary"}},
+        },
+    },
+    "activityLog": {
+        "type": "object",
+        "required": ["id", "timestamp", "status", "title", "description"],
+        "properties": {
+            "id": {"type": "string"},
+            "timestamp": {"type": "string", "pattern": r"^\d{4}-\d{2}-\d{2}T"},
+            "status": {"enum": ["ACTIVE", "INFO", "WARNING", "ERROR"]},
+            "title": {"type": "string"},
+            "description": {"type": "string"},
+            "parentGroupId": {"type": "string"},
+            "subsidiaryId": {"type": "string"},
+            "factoryId": {"type": "string"},
+        },
+    },
+    "transitRoute": {
+        "type": "object",
+        "required": ["id", "from", "to", "fromCoordinates", "toCoordinates"],
+        "properties": {
+            "id": {"type": "string"},
+            "from": {"type": "string"},
+            "to": {"type": "string"},
+            "fromCoordinates": {"$ref": "#/definitions/coordinates"},
+            "toCoordinates": {"$ref": "#/definitions/coordinates"},
+            "projectIds": {"type": "array", "items": {"type": "integer"}},
+            "polylines": {"type": "object"},
+        },
+    },
+}
+
+FACTORIES_SCHEMA = {
+    "type": "object",
+    "required": ["manufacturers", "factories"],
+    "properties": {
+        "manufacturers": {
+            "type": "array",
+            "uniqueItemsBy": "manufacturer_id",
+            "items": {
+                "type": "object",
+                "required": ["manufacturer_id", "manufacturer_name"],
+                "properties": {
+                    "manufacturer_id": {"type": "integer", "minimum": 1},
+                    "manufacturer_name": {"type": "string", "minLength": 1},
+                },
+            },
+        },
+        "factories": {
+            "type": "array",
+            "uniqueItemsBy": "factory_id",
+            "items": {
+                "type": "object",
+                "required": ["factory_id", "manufacturer_id", "factory_location_name"],
+                "properties": {
+                    "factory_id": {"type": "integer", "minimum": 1},
+                    "manufacturer_id": {"type": "integer", "minimum": 1},
+                    "factory_location_name": {"type": "string", "minLength": 1},
+                    "city": _NULLABLE_STRING,
+                    "state_province": _NULLABLE_STRING,
+                    "country": _NULLABLE_STRING,
+                    "full_address": _NULLABLE_STRING,
+                    "facility_type": _NULLABLE_STRING,
+                    "notes": _NULLABLE_STRING,
+                },
+            },
+        },
+    },
+}
+
+MANUFACTURER_FACILITIES_SCHEMA = {
+    "type": "array",
+    "uniqueItemsBy": "factory_id",
+    "items": {
+        "type": "object",
+        "required": ["factory_id", "manufacturer_id", "Company"],
+        "properties": {
+            "factory_id": {"type": "integer", "minimum": 1},
+            "manufacturer_id": {"type": "integer", "minimum": 1},
+            "Company": {"type": "string", "minLength": 1},
+            "Facility Type": _NULLABLE_STRING,
+            "Full Address": _NULLABLE_STRING,
+            "City": _NULLABLE_STRING,
+            "State/Province": _NULLABLE_STRING,
+            "Country": _NULLABLE_STRING,
+            "Notes": _NULLABLE_STRING,
+        },
+    },
+}
+
+CLIENTS_SCHEMA = {
+    "type": "object",
+    "required": ["clients"],
+    "properties": {
+        "clients": {
+            "type": "array",
+            "uniqueItemsBy": "clientId",
+            "items": {
+                "type": "object",
+                "required": ["clientId", "clientName", "latitude", "longitude"],
+                "properties": {
+                    "clientId": {"type": "string", "minLength": 1},
+                    "clientName": {"type": "string", "minLength": 1},
+                    "latitude": {"type": "number", "minimum": -90, "maximum": 90},
+                    "longitude": {"type": "number", "minimum": -180, "maximum": 180},
+                    # Written by assign_regions.py
+                    "region": _NULLABLE_STRING,
+                    "countryCode": _NULLABLE_STRING,
+                    "locations": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["locationName"],
+                            "properties": {
+                                "locationName": {"type": "string"},
+                                "address": {"type": "string"},
+                                "type": {"type": "string"},
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+PROJECTS_SCHEMA = {
+    "type": "object",
+    "required": ["projects"],
+    "properties": {
+        "projects": {
+            "type": "array",
+            "uniqueItemsBy": "project_id",
+            "items": {
+                "type": "object",
+                "required": ["project_id", "factory_id", "client", "status"],
+                "properties": {
+                    "project_id": {"type": "integer", "minimum": 1},
+                    "project_name": {"type": "string"},
+                    "manufacturer_id": {"type": "integer", "minimum": 1},
+                    "factory_id": {"type": "integer", "minimum": 1},
+                    "client": {"type": "string", "minLength": 1},
+                    "assessment_type": {"type": "string"},
+                    "status": {"type": "string", "minLength": 1},
+                    "location": {"type": "string"},
+                    "manufacturer": {"type": "string"},
+                },
+            },
+        },
+    },
+}
+
+# The same top-level shape FluorescenceMapService.isValidWarRoomState accepts
+WAR_ROOM_SCHEMA = {
+    "type": "object",
+    "required": ["parentGroups", "nodes", "activityLogs", "transitRoutes", "networkMetrics",
+                 "networkThroughput", "geopoliticalHeatmap", "mapViewMode"],
+    "properties": {
+        "parentGroups": {"type": "array", "uniqueItemsBy": "id", "items": {"$ref": "#/definitions/parentGroup"}},
+        "nodes": {"type": "array"},
+        "activityLogs": {"type": "array", "items": {"$ref": "#/definitions/activityLog"}},
+        "transitRoutes": {"type": "array", "uniqueItemsBy": "id", "items": {"$ref": "#/definitions/transitRoute"}},
+        "networkMetrics": {"type": "object"},
+        "networkThroughput": {
+            "type": "object",
+            "properties": {"bars": {"type": "array", "items": {"type": "number", "minimum": 0, "maximum": 100}}},
+        },
+        "geopoliticalHeatmap": {
+            "type": "object",
+            "required": ["grid", "rows", "cols"],
+            "properties": {
+                "grid": {"type": "array", "items": {"type": "array", "items": {"type": "number"}}},
+                "rows": {"type": "integer", "minimum": 0},
+                "cols": {"type": "integer", "minimum": 0},
+            },
+        },
+        "satelliteStatuses": {"type": "array"},
+        "mapViewMode": {"enum": ["parent", "subsidiary", "factory", "project", "client"]},
+    },
+}
+
+# file name -> (schema, key of the record array that is split across workers; "" for a top-level array)
+ARTIFACTS = {
+    "factories.json": (FACTORIES_SCHEMA, "factories"),
+    "manufacturer-facilities.json": (MANUFACTURER_FACILITIES_SCHEMA, ""),
+    "clients.json": (CLIENTS_SCHEMA, "clients"),
+    "projects.json": (PROJECTS_SCHEMA, "projects"),
+    "fluorescence-map-data.json": (WAR_ROOM_SCHEMA, None),
+}
+
+
+# -- compiler ----------------------------------------------------------------
+
+_TYPE_CHECKS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "integer": "(isinstance({v}, int) and not isinstance({v}, bool))",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+}
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class _Missing:
+    __slots__ = ()
+
+
+class SchemaCompiler:
+    """Turns a schema into Python source for one validator function per definition.
+
+    Generated code checks a value in place and only builds an error path
+    string when a check fails, so valid records cost a handful of isinstance
+    calls and dict lookups each. ``validate(value, path, errors)`` appends
+    ``(path, message)`` tuples to ``errors``.
+    """
+
+    def __init__(self, definitions=DEFINITIONS):
+        self.definitions = definitions
+        # JSON values that can go in a set; lists and objects can't
+        self.namespace = {"_MISSING": _Missing(), "_SCALAR": (str, int, float, bool, type(None)),
+                          "_isfinite": math.isfinite}
+        self.functions = {}
+        self.sources = []
+        self._counter = 0
+
+    def _name(self, prefix):
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def _const(self, value):
+        name = self._name("C")
+        self.namespace[name] = value
+        return name
+
+    def _ref(self, ref):
+        name = ref.rsplit("/", 1)[-1]
+        if name not in self.definitions:
+            raise KeyError(f"Unknown schema reference {ref!r}")
+        fn = f"def_{re.sub(r'[^A-Za-z0-9_]', '_', name)}"
+        if name not in self.functions:
+            self.functions[name] = fn
+            self._function(fn, self.definitions[name])
+        return fn
+
+    def _function(self, fn, schema):
+        body = []
+        self._node(schema, "value", "path", "    ", body)
+        self.sources.append("\n".join([f"def {fn}(value, path, errors):", *(body or ["    pass"])]))
+
+    def _error(self, ind, path, message, out):
+        out.append(f"{ind}errors.append(({path}, {message}))")
+
+    def _node(self, schema, v, p, ind, out):
+        if "$ref" in schema:
+            out.append(f"{ind}{self._ref(schema['$ref'])}({v}, {p}, errors)")
+            return
+        types = schema.get("type")
+        if types is None:
+            self._keywords(schema, v, p, ind, out, None)
+            return
+        types = [types] if isinstance(types, str) else list(types)
+        check = " or ".join(_TYPE_CHECKS[t].format(v=v) for t in types)
+        out.append(f"{ind}if not ({check}):")
+        self._error(ind + "    ", p, f"'expected {' or '.join(types)}, got ' + type({v}).__name__", out)
+        start = len(out)
+        out.append(f"{ind}else:")
+        self._keywords(schema, v, p, ind + "    ", out, types)
+        if len(out) == start + 1:
+            del out[start:]
+
+    def _guard(self, kind, v, ind, out, types):
+        """Emit an isinstance guard unless the type check already implies it; returns the inner indent."""
+        if types == [kind] or (kind == "number" and types == ["integer"]):
+            return ind
+        out.append(f"{ind}if {_TYPE_CHECKS[kind].format(v=v)}:")
+        return ind + "    "
+
+    def _keywords(self, schema, v, p, ind, out, types):
+        if "enum" in schema:
+            values = schema["enum"]
+            try:
+                allowed = self._const(frozenset(values))
+                out.append(f"{ind}if not isinstance({v}, _SCALAR) or {v} not in {allowed}:")
+            except TypeError:
+                allowed = self._const(tuple(values))
+                out.append(f"{ind}if {v} not in {allowed}:")
+            self._error(ind + "    ", p, repr(f"must be one of {', '.join(map(str, values))}") + f" + ', got ' + repr({v})", out)
+
+        if types is None or "string" in types:
+            checks = []
+            if "minLength" in schema:
+                checks.append((f"len({v}) < {int(schema['minLength'])}", f"shorter than {schema['minLength']} characters"))
+            if "pattern" in schema:
+                regex = self._const(re.compile(schema["pattern"]))
+                checks.append((f"not {regex}.search({v})", f"does not match {schema['pattern']}"))
+            if checks:
+                inner = self._guard("string", v, ind, out, types)
+                for condition, message in checks:
+                    out.append(f"{inner}if {condition}:")
+                    self._error(inner + "    ", p, repr(message), out)
+
+        if types is None or "number" in types or "integer" in types:
+            checks = []
+            if "minimum" in schema:
+                checks.append((f"{v} < {schema['minimum']!r}", f"below minimum {schema['minimum']}"))
+            if "maximum" in schema:
+                checks.append((f"{v} > {schema['maximum']!r}", f"above maximum {schema['maximum']}"))
+            # NaN compares false with any bound, so it would pass them; JSON has no NaN or Infinity anyway
+            finite = "number" in types if types is not None else bool(checks)
+            if finite or checks:
+                inner = self._guard("number", v, ind, out, types)
+                if finite:
+                    out.append(f"{inner}if not _isfinite({v}):")
+                    self._error(inner + "    ", p, repr("not a finite number"), out)
+                    if checks:
+                        out.append(f"{inner}else:")
+                        inner += "    "
+                for condition, message in checks:
+                    out.append(f"{inner}if {condition}:")
+                    self._error(inner + "    ", p, repr(message), out)
+
+        if (types is None or "object" in types) and any(
+                k in schema for k in ("properties", "required", "additionalProperties")):
+            inner = self._guard("object", v, ind, out, types)
+            properties = schema.get("properties", {})
+            required = schema.get("required", [])
+            for key in required:
+                if key not in properties:
+                    out.append(f"{inner}if {key!r} not in {v}:")
+                    self._error(inner + "    ", p, repr(f"missing required property {key!r}"), out)
+            for key, subschema in properties.items():
+                item = self._name("x")
+                suffix = f".{key}" if _IDENTIFIER.match(key) else f"[{json.dumps(key)}]"
+                sub_path = f"{p} + {suffix!r}"
+                out.append(f"{inner}{item} = {v}.get({key!r}, _MISSING)")
+                if key in required:
+                    out.append(f"{inner}if {item} is _MISSING:")
+                    self._error(inner + "    ", p, repr(f"missing required property {key!r}"), out)
+                    out.append(f"{inner}else:")
+                else:
+                    out.append(f"{inner}if {item} is not _MISSING:")
+                start = len(out)
+                self._node(subschema, item, sub_path, inner + "    ", out)
+                if len(out) == start:
+                    out.append(f"{inner}    pass")
+            if schema.get("additionalProperties") is False:
+                allowed, key = self._const(frozenset(properties)), self._name("k")
+                out.append(f"{inner}for {key} in {v}:")
+                out.append(f"{inner}    if {key} not in {allowed}:")
+                self._error(inner + "        ", p, f"'unexpected property ' + repr({key})", out)
+
+        if (types is None or "array" in types) and any(
+                k in schema for k in ("items", "minItems", "maxItems", "uniqueItemsBy")):
+            inner = self._guard("array", v, ind, out, types)
+            if "minItems" in schema:
+                out.append(f"{inner}if len({v}) < {int(schema['minItems'])}:")
+                self._error(inner + "    ", p, repr(f"fewer than {schema['minItems']} items"), out)
+            if "maxItems" in schema:
+                out.append(f"{inner}if len({v}) > {int(schema['maxItems'])}:")
+                self._error(inner + "    ", p, repr(f"more than {schema['maxItems']} items"), out)
+            if "items" in schema:
+                index, item = self._name("i"), self._name("x")
+                body = []
+                self._node(schema["items"], item, f"{p} + '[' + str({index}) + ']'", inner + "    ", body)
+                if body:
+                    out.append(f"{inner}for {index}, {item} in enumerate({v}):")
+                    out.extend(body)
+            if "uniqueItemsBy" in schema:
+                self._unique(schema["uniqueItemsBy"], v, p, inner, out)
+
+    def _unique(self, key, v, p, ind, out):
+        seen, index, item, value = self._name("seen"), self._name("i"), self._name("x"), self._name("u")
+        out.append(f"{ind}{seen} = set()")
+        out.append(f"{ind}for {index}, {item} in enumerate({v}):")
+        out.append(f"{ind}    {value} = {item}.get({key!r}) if isinstance({item}, dict) else None")
+        out.append(f"{ind}    if {value} is None:")
+        out.append(f"{ind}        continue")
+        out.append(f"{ind}    if not isinstance({value}, _SCALAR):")
+        self._error(ind + "        ", f"{p} + '[' + str({index}) + ']'",
+                    repr(f"{key} must be a string or number, got ") + f" + type({value}).__name__", out)
+        out.append(f"{ind}        continue")
+        out.append(f"{ind}    if {value} in {seen}:")
+        self._error(ind + "        ", f"{p} + '[' + str({index}) + ']'", repr(f"duplicate {key} ") + f" + repr({value})", out)
+        out.append(f"{ind}    {seen}.add({value})")
+
+    def compile(self, schema):
+        fn = self._name("validate_")
+        self._function(fn, schema)
+        exec(compile("\n\n".join(self.sources), "<schema>", "exec"), self.namespace)
+        return self.namespace[fn]
+
+
+def compile_schema(schema, definitions=DEFINITIONS):
+    return SchemaCompiler(definitions).compile(schema)
+
+
+def _split(schema, records_key):
+    """(envelope schema without the record array's items, record schema) for chunked validation."""
+    if records_key == "":
+        record = schema["items"]
+        envelope = {k: v for k, v in schema.items() if k != "items"}
+    else:
+        array = schema["properties"][records_key]
+        record = array["items"]
+        envelope = dict(schema, properties=dict(schema["properties"],
+                                                **{records_key: {k: v for k, v in array.items() if k != "items"}}))
+    return envelope, record
+
+
+_compiled = {}
+
+
+def validators(name):
+    """(whole-document validator, envelope validator, record validator) for an artifact, compiled once per process."""
+    if name not in _compiled:
+        schema, records_key = ARTIFACTS[name]
+        whole = compile_schema(schema)
+        if records_key is None:
+            _compiled[name] = (whole, None, None)
+        else:
+            envelope, record = _split(schema, records_key)
+            _compiled[name] = (whole, compile_schema(envelope), compile_schema(record))
+    return _compiled[name]
+
+
+# -- running -------------------------------------------------------------------
+
+class ValidationError(ValueError):
+    def __init__(self, name, errors, total):
+        self.name, self.errors, self.total = name, errors, total
+        lines = [f"{name}: {total} schema error{'s' if total != 1 else ''}"]
+        lines += [f"  {path}: {message}" for path, message in errors]
+        if total > len(errors):
+            lines.append(f"  ... and {total - len(errors)} more")
+        super().__init__("\n".join(lines))
+
+
+def _records(doc, records_key):
+    if records_key == "":
+        return doc if isinstance(doc, list) else None
+    value = doc.get(records_key) if isinstance(doc, dict) else None
+    return value if isinstance(value, list) else None
+
+
+# Documents loaded by the parent; fork-started workers read them from here instead of unpickling chunks
+_documents = {}
+
+
+def _check_chunk(name, start, stop, records=None, limit=MAX_REPORTED):
+    _, _, record_validator = validators(name)
+    records_key = ARTIFACTS[name][1]
+    if records is None:
+        records = _records(_documents[name], records_key)[start:stop]
+    prefix = "$" if records_key == "" else f"$.{records_key}"
+    errors = []
+    for i, record in enumerate(records, start):
+        record_validator(record, f"{prefix}[{i}]", errors)
+    return errors[:limit], len(errors)
+
+
+def validate_document(name, doc, limit=MAX_REPORTED):
+    """Validate one in-memory document; returns (errors[:limit], total)."""
+    whole, _, _ = validators(name)
+    errors = []
+    whole(doc, "$", errors)
+    return errors[:limit], len(errors)
+
+
+def check(name, doc):
+    """Raise ValidationError if ``doc`` does not match the schema for artifact ``name``."""
+    errors, total = validate_document(name, doc)
+    if total:
+        raise ValidationError(name, errors, total)
+
+
+def _tasks(documents, chunk_records):
+    """(name, start, stop) record slices; small documents are validated whole."""
+    tasks = []
+    for name, doc in documents.items():
+        records_key = ARTIFACTS[name][1]
+        records = _records(doc, records_key) if records_key is not None else None
+        if records is None or len(records) <= chunk_records:
+            tasks.append((name, None, None))
+            continue
+        tasks.append((name, "envelope", None))
+        for start in range(0, len(records), chunk_records):
+            tasks.append((name, start, min(start + chunk_records, len(records))))
+    return tasks
+
+
+def _run_task(name, start, stop, records=None):
+    if start is None:
+        return validate_document(name, _documents[name] if records is None else records)
+    if start == "envelope":
+        _, envelope, _ = validators(name)
+        doc = _documents[name] if records is None else records
+        errors = []
+        envelope(doc, "$", errors)
+        return errors[:MAX_REPORTED], len(errors)
+    return _check_chunk(name, start, stop, records)
+
+
+def validate_all(documents, workers=None, chunk_records=CHUNK_RECORDS):
+    """Validate {file name: document} across files and record chunks in parallel.
+
+    Returns {file name: (errors[:MAX_REPORTED], total)}. Where the platform can
+    fork, workers inherit the parsed documents and each task is just a slice
+    range; elsewhere each task ships its chunk to the worker.
+    """
+    tasks = _tasks(documents, chunk_records)
+    results = {name: ([], 0) for name in documents}
+
+    def merge(name, outcome):
+        errors, total = outcome
+        kept, count = results[name]
+        results[name] = ((kept + errors)[:MAX_REPORTED], count + total)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        _documents.update(documents)
+        for name, start, stop in tasks:
+            merge(name, _run_task(name, start, stop))
+        return results
+
+    fork = "fork" in multiprocessing.get_all_start_methods()
+    if fork:
+        # Compile before forking so every worker starts with the validators ready
+        for name in documents:
+            validators(name)
+        _documents.update(documents)
+        context = multiprocessing.get_context("fork")
+    else:
+        context = None
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=context) as pool:
+        futures = []
+        for name, start, stop in tasks:
+            payload = None
+            if not fork:
+                doc = documents[name]
+                if isinstance(start, int):
+                    payload = _records(doc, ARTIFACTS[name][1])[start:stop]
+                else:
+                    payload = doc
+            futures.append((name, pool.submit(_run_task, name, start, stop, payload)))
+        for name, future in futures:
+            merge(name, future.result())
+    return results
+
+
+def load_documents(names, data_dir=DATA_DIR):
+    documents, problems = {}, {}
+    for name in names:
+        path = Path(data_dir) / name
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                documents[name] = json.load(f)
+        except FileNotFoundError:
+            problems[name] = ([("$", "file not found")], 1)
+        except json.JSONDecodeError as e:
+            problems[name] = ([("$", f"invalid JSON: {e}")], 1)
+    return documents, problems
+
+
+def _synthetic(name, doc, count):
+    """``doc`` with its record array repeated up to ``count`` records, ids kept unique."""
+    records_key = ARTIFACTS[name][1]
+    records = _records(doc, records_key) or []
+    if not records:
+        return doc
+    schema = ARTIFACTS[name][0]
+    id_field = (schema if records_key == "" else schema["properties"][records_key]).get("uniqueItemsBy")
+    grown = []
+    for i in range(count):
+        record = dict(records[i % len(records)])
+        if id_field:
+            record[id_field] = i + 1 if isinstance(record[id_field], int) else f"{record[id_field]}-{i}"
+        grown.append(record)
+    return grown if records_key == "" else dict(doc, **{records_key: grown})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate the data artifacts against their schemas")
+    parser.add_argument("files", nargs="*", help=f"artifact names (default: {', '.join(ARTIFACTS)})")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--bench", type=int, metavar="N",
+                        help="validate N synthetic records per artifact instead of the files' own")
+    args = parser.parse_args(argv)
+
+    names = args.files or list(ARTIFACTS)
+    unknown = [n for n in names if n not in ARTIFACTS]
+    if unknown:
+        parser.error(f"no schema for {', '.join(unknown)}")
+
+    documents, results = load_documents(names)
+    if args.bench:
+        documents = {name: _synthetic(name, doc, args.bench) for name, doc in documents.items()}
+    started = time.perf_counter()
+    results.update(validate_all(documents, args.workers))
+    elapsed = time.perf_counter() - started
+
+    failed = 0
+    for name in names:
+        errors, total = results[name]
+        records_key = ARTIFACTS[name][1]
+        records = _records(documents[name], records_key) if name in documents and records_key is not None else None
+        size = f" ({len(records)} records)" if records is not None else ""
+        if total:
+            failed += 1
+            print(ValidationError(name, errors, total), file=sys.stderr)
+        else:
+            print(f"{name}: ok{size}")
+    print(f"Validated {len(names)} files in {elapsed:.2f} s")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
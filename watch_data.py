@@ -0,0 +1,249 @@
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from consolidate_data import consolidate_records, factories_path, mf_path
+from facility_store import refresh_store
+from factory_id_registry import load_registry
+from sync_war_room_data import sync_factories, war_room_data_path, write_outputs
+
+DATA_DIR = factories_path.parent
+
+# Editors save in bursts (truncate, write, rename); wait for this much quiet
+DEBOUNCE_SECONDS = 0.3
+POLL_INTERVAL = 0.5
+
+WATCHED = {factories_path.name, mf_path.name, war_room_data_path.name}
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Directory watch via the kernel inotify API (Linux only, no dependencies)."""
+
+    def __init__(self, directory, names):
+        libc_name = ctypes.util.find_library('c')
+        if sys.platform != 'linux' or not libc_name:
+            raise OSError("inotify is not available on this platform")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.names = names
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watch the directory, not the files: atomic saves replace the inode
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO)
+        if wd < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout=None):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            _, _, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += name_len
+            if name in self.names:
+                changed.add(name)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback that compares (mtime, size) of the watched files."""
+
+    def __init__(self, directory, names, interval=POLL_INTERVAL):
+        self.directory = Path(directory)
+        self.names = names
+        self.interval = interval
+        self._stats = {name: self._stat(name) for name in names}
+
+    def _stat(self, name):
+        try:
+            st = (self.directory / name).stat()
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for name in self.names:
+                stat = self._stat(name)
+                if stat != self._stats[name]:
+                    self._stats[name] = stat
+                    changed.add(name)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+            remaining = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            time.sleep(max(remaining, 0))
+
+    def close(self):
+        pass
+
+
+def make_watcher(directory, names, force_polling=False):
+    if not force_polling:
+        try:
+            return InotifyWatcher(directory, names)
+        except OSError as e:
+            print(f"inotify unavailable ({e}); falling back to polling", file=sys.stderr)
+    return PollingWatcher(directory, names)
+
+
+def _fingerprint(record):
+    return hashlib.sha1(json.dumps(record, sort_keys=True, default=str).encode('utf-8')).digest()
+
+
+def _fingerprints(records):
+    return {r['factory_id']: _fingerprint(r) for r in records if 'factory_id' in r}
+
+
+def _changed_ids(old, new):
+    return {f_id for f_id, fp in new.items() if old.get(f_id) != fp}
+
+
+class WarmPipeline:
+    """Keeps parsed inputs in memory and re-runs only the stages a change affects."""
+
+    def __init__(self):
+        self.registry = load_registry()
+        self.factories_data = self._read(factories_path)
+        self.mf_list = self._read(mf_path)
+        self.war_room_data = self._read(war_room_data_path)
+        self.factory_fps = _fingerprints(self.factories_data['factories'])
+        self.mf_fps = _fingerprints(self.mf_list)
+        # Hash of what we last wrote, so our own writes don't retrigger a run
+        self.own_writes = {}
+
+    @staticmethod
+    def _read(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _load_changed(self, path):
+        raw = path.read_bytes()
+        if self.own_writes.get(path.name) == hashlib.sha1(raw).digest():
+            return None
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            # Half-written file; the writer's close will trigger another event
+            return None
+
+    def _remember_write(self, path):
+        self.own_writes[path.name] = hashlib.sha1(path.read_bytes()).digest()
+
+    def reload(self, names):
+        """Re-read the named inputs that changed on disk; returns the factory ids they touch."""
+        consolidate_ids = set()
+
+        if mf_path.name in names:
+            mf_list = self._load_changed(mf_path)
+            if mf_list is not None:
+                new_fps = _fingerprints(mf_list)
+                consolidate_ids |= _changed_ids(self.mf_fps, new_fps)
+                self.mf_list, self.mf_fps = mf_list, new_fps
+
+        if factories_path.name in names:
+            factories_data = self._load_changed(factories_path)
+            if factories_data is not None:
+                self.factories_data = factories_data
+                consolidate_ids |= _changed_ids(self.factory_fps, _fingerprints(factories_data['factories']))
+
+        if war_room_data_path.name in names:
+            war_room_data = self._load_changed(war_room_data_path)
+            if war_room_data is not None:
+                # Hand edits to the map document become the new base for the next sync
+                self.war_room_data = war_room_data
+        return consolidate_ids
+
+    def write_factories(self):
+        with open(factories_path, 'w') as f:
+            json.dump(self.factories_data, f, indent=2)
+        self._remember_write(factories_path)
+
+    def consolidate(self, factory_ids=None):
+        """Consolidate `factory_ids` (default: all) and write factories.json; returns the ids whose record changed."""
+        self.factories_data = consolidate_records(self.factories_data, self.mf_list, factory_ids)
+        new_fps = _fingerprints(self.factories_data['factories'])
+        changed = _changed_ids(self.factory_fps, new_fps)
+        self.factory_fps = new_fps
+        if changed:
+            self.write_factories()
+            # Point-patch just these records in the NDJSON store
+            refresh_store(self.factories_data, self.registry, changed)
+        return changed
+
+    def sync(self, factory_ids=None):
+        sync_factories(self.factories_data, self.war_room_data, self.registry, factory_ids)
+        write_outputs(self.war_room_data, self.registry)
+        self._remember_write(war_room_data_path)
+
+    def process(self, names):
+        started = time.perf_counter()
+        consolidate_ids = self.reload(names)
+        if not consolidate_ids:
+            return
+
+        # Stage 1: consolidate only the touched records
+        sync_ids = self.consolidate(consolidate_ids)
+        if not sync_ids:
+            return
+
+        # Stage 2: sync those records into the war-room document
+        self.sync(sync_ids)
+
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"Re-synced {len(sync_ids)} factories ({', '.join(map(str, sorted(sync_ids)))}) in {elapsed:.1f} ms")
+
+
+def watch(force_polling=False):
+    pipeline = WarmPipeline()
+    watcher = make_watcher(DATA_DIR, WATCHED, force_polling)
+    print(f"Watching {', '.join(sorted(WATCHED))} in {DATA_DIR} ({type(watcher).__name__})")
+    pending = set()
+    try:
+        while True:
+            changed = watcher.wait(DEBOUNCE_SECONDS if pending else None)
+            if changed:
+                pending |= changed
+                continue
+            if pending:
+                try:
+                    pipeline.process(pending)
+                except (KeyError, ValueError, OSError) as e:
+                    print(f"Sync failed, waiting for the next change: {e}", file=sys.stderr)
+                pending.clear()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+if __name__ == "__main__":
+    watch(force_polling='--poll' in sys.argv[1:])
@@ -0,0 +1,471 @@
+import argparse
+import json
+import math
+import re
+import sys
+import tempfile
+import zipfile
+from datetime import date, datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+# Rows are buffered and flushed to the zip stream in batches of this size
+FLUSH_ROWS = 1000
+XLSX_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Cell style ids, matching the cellXfs order in STYLES_XML
+STYLE_DEFAULT = 0
+STYLE_TITLE_LARGE = 1
+STYLE_TITLE = 2
+STYLE_HEADER = 3
+STYLE_DATA_CENTERED = 4
+STYLE_DATA = 5
+
+# Same fonts, fill and borders as the ExcelJS exports in the report components
+STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="4">'
+    '<font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="14"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font>'
+    '<font><sz val="10"/><name val="Calibri"/></font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFB8CCE4"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="2">'
+    '<border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border>'
+    '<left style="thin"><color rgb="FFD0D0D0"/></left>'
+    '<right style="thin"><color rgb="FFD0D0D0"/></right>'
+    '<top style="thin"><color rgb="FFD0D0D0"/></top>'
+    '<bottom style="thin"><color rgb="FFD0D0D0"/></bottom>'
+    '<diagonal/></border>'
+    '</borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="6">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="1" xfId="0" applyFont="1" applyBorder="1"/>'
+    '<xf numFmtId="0" fontId="2" fillId="0" borderId="1" xfId="0" applyFont="1" applyBorder="1"/>'
+    '<xf numFmtId="0" fontId="2" fillId="2" borderId="1" xfId="0" applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center" wrapText="1"/></xf>'
+    '<xf numFmtId="0" fontId="3" fillId="0" borderId="1" xfId="0" applyFont="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="1" xfId="0" applyBorder="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# Control characters that are not allowed anywhere in SpreadsheetML
+_ILLEGAL_XML = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Export station labels from vehicle-station-tracker.component.ts (exportStationColumns)
+EXPORT_STATION_COLUMNS = [
+    ('station01', '01 - Bus Structure Receiving - Nova'),
+    ('station02', '02 - Air Sys components, Steering Column, Flooring, Engine Insulation - Nova'),
+    ('station03', '03 - Air Line Routing, HVAC Piping, Front Ramp'),
+    ('station04', '04 - Elec Harness, Artic Joint'),
+    ('station05', '05 - Rear Shell, Side Panels, Air Test, Eng Comp Electrical'),
+    ('station06', '06 - Fuel Tank, Heat Convectors, Batt Compartment'),
+    ('station07', '07 - Rear Roof, Ext Access Doors, Radiator Piping, Aux Heating'),
+    ('station08', '08 - Front Roof, Trim & Moldings- Nova'),
+    ('station09', '09 - Front Shell, Dash, Engine, Tunnel, Ceiling'),
+    ('station10', '10 - HVAC Roof Units, Axles, Dest Sign - Nova'),
+    ('station11', '11 - Electrical completion & pre-test, Radiator, Roof Gutters'),
+    ('station12', '12 - Handrails, Ext Decals, Baselights, Door Accessories, Coupling of Artic'),
+    ('station13', '13 - Elec & Mech Run-up, Dialysis, Front Door'),
+    ('station14', '14 - Eng Door, Steering Lock, Alignment - Nova'),
+    ('station15', '15 - Windows, Modesty Panels - Nova'),
+    ('station16', '16 - Seats, Rear Doors, Drivers Area - Nova'),
+    ('station17', '17 - Stanchions - Nova'),
+    ('station18', '18 - Under coating, Ext Sign Frames - Nova'),
+    ('station19', '19 - Electrical Clousure - Nova'),
+    ('station20', '20 - Closing Zones - Nova'),
+    ('station21', '21 - Recuperation - Nova'),
+    ('station22', '22 - Nova Bus Finishing Area - Nova'),
+    ('station23', '23 - Nova Bus Coach Tester Inspection - Nova'),
+    ('station24', '24 - Nova Bus Coach Tester Road Test, Inspection & Painting'),
+    ('station25', '25 - Nova Bus Coach Tester Water Test, Repairs after Road Test'),
+    ('station26', '26 - Cleaning & Washing Before Presenting'),
+    ('station27', '27 - Customer Validation - Nova'),
+    ('station28', '28 - Repairs after Customer Inspection - Nova'),
+    ('station29', '29 - Customer Pre-Delivery Sign Off - Nova'),
+]
+
+
+def column_letter(index):
+    # 0 -> "A", 27 -> "AB"
+    letters = ''
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def us_date(d):
+    # toLocaleDateString('en-US') -> "1/15/2026"
+    return f"{d.month}/{d.day}/{d.year}"
+
+
+def us_datetime(value):
+    # new Date(value).toLocaleString('en-US') -> "1/15/2026, 3:04:05 PM"
+    if not value:
+        return ''
+    try:
+        dt = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return str(value)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone()
+    hour = dt.hour % 12 or 12
+    return f"{us_date(dt)}, {hour}:{dt.minute:02d}:{dt.second:02d} {'AM' if dt.hour < 12 else 'PM'}"
+
+
+@lru_cache(maxsize=8192)
+def _escape_text(text):
+    # Report columns repeat heavily (client, project, status), so memoize
+    return escape(_ILLEGAL_XML.sub('', text))
+
+
+def _cell_xml(ref, value, style):
+    if value is None or value == '':
+        return f'<c r="{ref}" s="{style}"/>'
+    if isinstance(value, bool):
+        value = 'Yes' if value else 'No'
+    if isinstance(value, float) and not math.isfinite(value):
+        # <v>nan</v> or <v>inf</v> makes Excel reject the whole file: a blank
+        # for a missing number, #NUM! for an overflow
+        if math.isnan(value):
+            return f'<c r="{ref}" s="{style}"/>'
+        return f'<c r="{ref}" s="{style}" t="e"><v>#NUM!</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}" s="{style}"><v>{value}</v></c>'
+    text = _escape_text(str(value))
+    # Inline strings keep memory flat: no shared-string table to accumulate
+    return f'<c r="{ref}" s="{style}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _row_xml(row_index, values, style, height=None, letters=None):
+    ht = f' ht="{height}" customHeight="1"' if height else ''
+    cells = ''.join(
+        _cell_xml(f"{letters[i] if letters else column_letter(i)}{row_index}", v, style)
+        for i, v in enumerate(values)
+    )
+    return f'<row r="{row_index}"{ht}>{cells}</row>'
+
+
+class ReportLayout:
+    """Title block, header row, column widths and row mapping for one report."""
+
+    def __init__(self, sheet_name, headers, widths, header_row, map_row,
+                 title_rows, data_style=STYLE_DATA, freeze_columns=0, filename_prefix='Report'):
+        self.sheet_name = sheet_name
+        self.headers = headers
+        self.widths = widths
+        self.header_row = header_row
+        self.map_row = map_row
+        self.title_rows = title_rows
+        self.data_style = data_style
+        self.freeze_columns = freeze_columns
+        self.filename_prefix = filename_prefix
+
+    def filename(self, today=None):
+        today = today or date.today()
+        return f"{self.filename_prefix}_{us_date(today).replace('/', '_')}.xlsx"
+
+
+def _ticket_title_rows(options, first_record):
+    project = options.get('project') or 'all'
+    vehicle = options.get('vehicle') or 'all'
+    client = options.get('client') or (first_record or {}).get('clientName') or 'N/A'
+    return [
+        ('Vehicle Ticket Report', STYLE_TITLE_LARGE),
+        (f"Client: {client}", STYLE_TITLE),
+        (f"Project: {'All Projects' if project == 'all' else project}", STYLE_TITLE),
+        (f"Vehicle: {'All Vehicles' if vehicle == 'all' else vehicle}", STYLE_TITLE),
+    ]
+
+
+def _ticket_row(t):
+    return [
+        t.get('ticketNumber'), t.get('vehicleNumber'), t.get('vehicleVIN'), t.get('clientName'),
+        t.get('projectName'), t.get('description'), t.get('defectType'), t.get('defectLocation'),
+        'Yes' if t.get('safetyCritical') else 'No',
+        t.get('assignedByName'), t.get('assignedToName'), t.get('stationName') or '', t.get('status'),
+        us_datetime(t.get('createdDate')), us_datetime(t.get('resolvedDate')),
+    ]
+
+
+def _tracker_title_rows(options, first_record):
+    project = options.get('project') or 'N/A'
+    client = options.get('client') or project
+    return [
+        ('Vehicle Station Tracker Report', STYLE_TITLE),
+        (f"Date: {us_date(date.today())}", STYLE_TITLE),
+        (f"Client: {client}", STYLE_TITLE),
+        (f"Project: {project}", STYLE_TITLE),
+    ]
+
+
+def _tracker_row(item):
+    row = ['', item.get('fleetNumber') or '', item.get('vin') or '', item.get('frameNumber') or '',
+           item.get('inspector') or '']
+    row.extend(item.get(key) or '' for key, _ in EXPORT_STATION_COLUMNS)
+    return row
+
+
+LAYOUTS = {
+    'tickets': ReportLayout(
+        sheet_name='Vehicle Ticket Report',
+        headers=['Ticket #', 'Vehicle #', 'VIN', 'Client', 'Project',
+                 'Description', 'Defect Type', 'Defect Location', 'Safety Critical',
+                 'Assigned By', 'Assigned To', 'Station', 'Status',
+                 'Created Date', 'Resolved Date'],
+        widths=[12, 12, 20, 14, 16, 40, 16, 18, 14, 16, 16, 16, 12, 18, 18],
+        header_row=7,
+        map_row=_ticket_row,
+        title_rows=_ticket_title_rows,
+        filename_prefix='VehicleTicketReport',
+    ),
+    'station-tracker': ReportLayout(
+        sheet_name='Vehicle Station Tracker',
+        headers=['', 'Fleet Number', 'VIN', 'Frame #', 'Inspector'] + [label for _, label in EXPORT_STATION_COLUMNS],
+        widths=[2, 14, 20, 12, 14] + [20] * len(EXPORT_STATION_COLUMNS),
+        header_row=8,
+        map_row=_tracker_row,
+        title_rows=_tracker_title_rows,
+        data_style=STYLE_DATA_CENTERED,
+        freeze_columns=1,
+        filename_prefix='VehicleStationTrackerReport',
+    ),
+}
+
+
+def write_report(layout, records, out, options=None):
+    """Stream `records` (any iterable of dicts) into an xlsx written to `out`.
+
+    `out` is a path or a binary file object. Memory stays flat regardless of the
+    number of rows: each row is serialized and handed to the deflate stream in
+    batches, and strings are written inline instead of via a shared table.
+    """
+    options = options or {}
+    records = iter(records)
+    first = next(records, None)
+    letters = [column_letter(i) for i in range(len(layout.headers))]
+
+    with zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        zf.writestr('[Content_Types].xml', CONTENT_TYPES_XML)
+        zf.writestr('_rels/.rels', ROOT_RELS_XML)
+        zf.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS_XML)
+        zf.writestr('xl/styles.xml', STYLES_XML)
+        zf.writestr('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{escape(layout.sheet_name[:31])}" sheetId="1" r:id="rId1"/></sheets>'
+            '</workbook>'
+        ))
+
+        with zf.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as raw:
+            def write(text):
+                raw.write(text.encode('utf-8'))
+
+            split_col = column_letter(layout.freeze_columns)
+            top_left = f"{split_col}{layout.header_row + 1}"
+            x_split = f' xSplit="{layout.freeze_columns}"' if layout.freeze_columns else ''
+            write(
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+                '<sheetViews><sheetView workbookViewId="0">'
+                f'<pane{x_split} ySplit="{layout.header_row}" topLeftCell="{top_left}" '
+                'activePane="bottomRight" state="frozen"/>'
+                '</sheetView></sheetViews>'
+                '<sheetFormatPr defaultRowHeight="15"/>'
+                '<cols>'
+                + ''.join(f'<col min="{i + 1}" max="{i + 1}" width="{w}" customWidth="1"/>'
+                          for i, w in enumerate(layout.widths))
+                + '</cols><sheetData>'
+            )
+
+            for i, (text, style) in enumerate(layout.title_rows(options, first)):
+                write(_row_xml(i + 1, [text], style, letters=letters))
+            write(_row_xml(layout.header_row, layout.headers, STYLE_HEADER, height=20, letters=letters))
+
+            row_index = layout.header_row
+            batch = []
+            record = first
+            while record is not None:
+                row_index += 1
+                batch.append(_row_xml(row_index, layout.map_row(record), layout.data_style, letters=letters))
+                if len(batch) >= FLUSH_ROWS:
+                    write(''.join(batch))
+                    batch.clear()
+                record = next(records, None)
+            if batch:
+                write(''.join(batch))
+
+            write('</sheetData></worksheet>')
+
+    return row_index - layout.header_row
+
+
+def iter_records(stream):
+    """Yield dicts from NDJSON (one per line) or, failing that, a JSON array."""
+    first_line = stream.readline()
+    while first_line and not first_line.strip():
+        first_line = stream.readline()
+    if not first_line:
+        return
+    if first_line.lstrip().startswith(b'[' if isinstance(first_line, bytes) else '['):
+        # JSON arrays can't be streamed with the stdlib; load them in one go
+        rest = stream.read()
+        yield from json.loads(first_line + rest)
+        return
+    yield json.loads(first_line)
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+class ExportHandler(BaseHTTPRequestHandler):
+    # POST /export/<tickets|station-tracker>?client=..&project=..&vehicle=..
+    # with an NDJSON (or JSON array) body; responds with the workbook.
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        parts = url.path.strip('/').split('/')
+        layout = LAYOUTS.get(parts[1]) if len(parts) == 2 and parts[0] == 'export' else None
+        if layout is None:
+            self.send_error(404, f"Unknown report; expected one of: {', '.join(LAYOUTS)}")
+            return
+        options = {k: v[0] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        body = _LimitedReader(self.rfile, length)
+
+        # Spool to disk past a few MB so large exports don't sit in memory
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+            try:
+                rows = write_report(layout, iter_records(body), spool, options)
+            except (json.JSONDecodeError, AttributeError) as e:
+                self.send_error(400, f"Invalid request body: {e}")
+                return
+            size = spool.tell()
+            spool.seek(0)
+            self.send_response(200)
+            self.send_header('Content-Type', XLSX_MIME)
+            self.send_header('Content-Length', str(size))
+            self.send_header('Content-Disposition', f'attachment; filename="{layout.filename()}"')
+            self.send_header('X-Row-Count', str(rows))
+            self.end_headers()
+            while True:
+                chunk = spool.read(64 * 1024)
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+
+
+class _LimitedReader:
+    # Line-oriented reader that stops at Content-Length on a keep-alive socket
+    def __init__(self, raw, remaining):
+        self.raw = raw
+        self.remaining = remaining
+
+    def readline(self):
+        if self.remaining <= 0:
+            return b''
+        line = self.raw.readline(self.remaining)
+        self.remaining -= len(line)
+        return line
+
+    def read(self):
+        data = self.raw.read(self.remaining) if self.remaining > 0 else b''
+        self.remaining = 0
+        return data
+
+    def __iter__(self):
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
+
+
+def serve(host, port):
+    server = ThreadingHTTPServer((host, port), ExportHandler)
+    print(f"Export endpoint listening on http://{host}:{port}/export/<{'|'.join(LAYOUTS)}>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming XLSX export for vehicle reports")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    export = sub.add_parser('export', help="write a report from NDJSON / JSON records")
+    export.add_argument('report', choices=sorted(LAYOUTS))
+    export.add_argument('input', help="records file, or - for stdin")
+    export.add_argument('-o', '--output', help="xlsx path (defaults to the browser export filename)")
+    export.add_argument('--client')
+    export.add_argument('--project')
+    export.add_argument('--vehicle')
+
+    server = sub.add_parser('serve', help="run the local HTTP export endpoint")
+    server.add_argument('--host', default='127.0.0.1')
+    server.add_argument('--port', type=int, default=8765)
+
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        serve(args.host, args.port)
+        return
+
+    layout = LAYOUTS[args.report]
+    options = {'client': args.client, 'project': args.project, 'vehicle': args.vehicle}
+    out_path = args.output or layout.filename()
+    if args.input == '-':
+        rows = write_report(layout, iter_records(sys.stdin.buffer), out_path, options)
+    else:
+        with open(args.input, 'rb') as f:
+            rows = write_report(layout, iter_records(f), out_path, options)
+    print(f"Wrote {rows} rows to {out_path}")
+
+
+if __name__ == "__main__":
+    main()